@@ -0,0 +1,139 @@
+"""
+Benchmark: throughput of concurrent requests over HTTP/1.1 and HTTP/2.
+
+Starts a local stand-in for the REST API speaking HTTP/2 (h2c, prior knowledge) and HTTP/1.1,
+both answering every request after a fixed delay that plays the role of the network round trip
+and exchange latency, then compares:
+
+    HTTP/1.1 serial       one request after the other on a single connection
+    HTTP/1.1 pooled       OkxClient.gather on worker threads over a pool of connections
+    HTTP/2 serial         one request after the other on a single connection
+    HTTP/2 multiplexed    AsyncOkxClient.gather, every request a concurrent stream of a single connection
+
+Usage:
+    python -m benchmarks.http2_multiplex [requests] [delay ms] [HTTP/1.1 connections]
+"""
+import asyncio
+import functools
+import sys
+import threading
+import time
+
+import httpx
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import RequestReceived, ConnectionTerminated
+
+from okx.MarketData import MarketAPI, AsyncMarketAPI
+
+BODY = (b'{"code":"0","msg":"","data":[{"instType":"SPOT","instId":"BTC-USDT","last":"65000.1","lastSz":"0.1",'
+        b'"askPx":"65000.2","askSz":"1","bidPx":"65000.1","bidSz":"2","ts":"1700000000000"}]}')
+
+
+class H2Protocol(asyncio.Protocol):
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.conn = H2Connection(config=H2Configuration(client_side=False))
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self.conn.receive_data(data):
+            if isinstance(event, RequestReceived):
+                asyncio.get_event_loop().call_later(self.delay, self.respond, event.stream_id)
+            elif isinstance(event, ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    def respond(self, stream_id):
+        if self.transport.is_closing():
+            return
+        self.conn.send_headers(stream_id, [(':status', '200'), ('content-type', 'application/json'),
+                                           ('content-length', str(len(BODY)))])
+        self.conn.send_data(stream_id, BODY, end_stream=True)
+        self.transport.write(self.conn.data_to_send())
+
+
+class Http1Protocol(asyncio.Protocol):
+
+    RESPONSE = (b'HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: %d\r\n\r\n'
+                % len(BODY)) + BODY
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.buffer = b''
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while b'\r\n\r\n' in self.buffer:
+            _, self.buffer = self.buffer.split(b'\r\n\r\n', 1)
+            asyncio.get_event_loop().call_later(self.delay, self.respond)
+
+    def respond(self):
+        if not self.transport.is_closing():
+            self.transport.write(self.RESPONSE)
+
+
+def start_servers(delay):
+    """Serve both protocols from a background event loop, return (h2 url, http/1.1 url)."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    urls = []
+
+    async def serve():
+        for protocol in (H2Protocol, Http1Protocol):
+            server = await loop.create_server(functools.partial(protocol, delay), '127.0.0.1', 0)
+            urls.append('http://127.0.0.1:%d' % server.sockets[0].getsockname()[1])
+        ready.set()
+
+    threading.Thread(target=lambda: (loop.run_until_complete(serve()), loop.run_forever()), daemon=True).start()
+    ready.wait()
+    return urls
+
+
+def run(name, count, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print('%-22s %10.1f req/s %10.3f s' % (name, count / elapsed, elapsed))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    connections = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+    h2_url, h1_url = start_servers(delay)
+    instIds = ['INST-%d' % i for i in range(count)]
+    print('%d requests, %.0f ms simulated latency, %d HTTP/1.1 connections' % (count, delay * 1000, connections))
+
+    h1 = MarketAPI(domain=h1_url, transport=httpx.HTTPTransport(
+        http1=True, http2=False, limits=httpx.Limits(max_connections=connections)))
+    run('HTTP/1.1 serial', count, lambda: [h1.get_ticker(i) for i in instIds])
+    run('HTTP/1.1 pooled', count, lambda: h1.gather([functools.partial(h1.get_ticker, i) for i in instIds]))
+    h1.close()
+
+    single = httpx.Limits(max_connections=1)
+    h2 = MarketAPI(domain=h2_url, transport=httpx.HTTPTransport(http1=False, http2=True, limits=single))
+    run('HTTP/2 serial', count, lambda: [h2.get_ticker(i) for i in instIds])
+    h2.close()
+
+    async def multiplexed():
+        api = AsyncMarketAPI(domain=h2_url, transport=httpx.AsyncHTTPTransport(http1=False, http2=True,
+                                                                                limits=single))
+        await api.gather([api.get_ticker(i) for i in instIds])
+        await api.aclose()
+
+    run('HTTP/2 multiplexed', count, lambda: asyncio.new_event_loop().run_until_complete(multiplexed()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: order book updates per second.
+
+Replays a synthetic books channel feed (400 level snapshot, then updates changing a few levels
+near the top of the book, as busy instruments do) through:
+
+    dict + sort            levels in dicts, sorted for every checksum (the straightforward approach)
+    OrderBook              sorted level arrays, no checksum verification
+    OrderBook + checksum   sorted level arrays, checksum verified on every update
+    OrderBooks frames      raw JSON frames: decode, apply and verify, as fed by WsPublicAsync
+
+Usage:
+    python -m benchmarks.orderbook_updates [updates]
+"""
+import json
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+from okx import codec
+from okx.websocket.OrderBook import OrderBook, OrderBooks, checksum
+
+TICK = 0.1
+MID = 65000.0
+
+
+def px(value):
+    return '%.1f' % value
+
+
+def make_feed(updates, levels=400, seed=7):
+    rng = random.Random(seed)
+    snapshot = {
+        'bids': [[px(MID - TICK * (i + 1)), str(rng.randint(1, 500)), '0', '1'] for i in range(levels)],
+        'asks': [[px(MID + TICK * i), str(rng.randint(1, 500)), '0', '1'] for i in range(levels)],
+        'ts': '1700000000000', 'seqId': 1, 'prevSeqId': -1,
+    }
+    reference = OrderBook('BTC-USDT', verifyChecksum=False)
+    reference.apply(snapshot)
+    snapshot['checksum'] = reference.checksum()
+    items = []
+    for seqId in range(2, updates + 2):
+        item = {'bids': [], 'asks': [], 'ts': '1700000000000', 'seqId': seqId, 'prevSeqId': seqId - 1}
+        for _ in range(rng.randint(1, 4)):
+            side = rng.choice(('bids', 'asks'))
+            offset = int(rng.expovariate(0.2))
+            price = MID - TICK * (offset + 1) if side == 'bids' else MID + TICK * offset
+            size = '0' if rng.random() < 0.3 else str(rng.randint(1, 500))
+            item[side].append([px(price), size, '0', '1'])
+        reference.apply(item, 'update')
+        item['checksum'] = reference.checksum()
+        items.append(item)
+    return snapshot, items
+
+
+def naive(snapshot, items):
+    bids = {level[0]: level[1] for level in snapshot['bids']}
+    asks = {level[0]: level[1] for level in snapshot['asks']}
+    for item in items:
+        for side, levels in (('bids', bids), ('asks', asks)):
+            for level in item[side]:
+                if level[1] == '0':
+                    levels.pop(level[0], None)
+                else:
+                    levels[level[0]] = level[1]
+        top_bids = sorted(bids.items(), key=lambda level: -float(level[0]))[:25]
+        top_asks = sorted(asks.items(), key=lambda level: float(level[0]))[:25]
+        if checksum(top_bids, top_asks) != item['checksum']:
+            raise AssertionError('checksum mismatch')
+
+
+def engine(snapshot, items, verify):
+    book = OrderBook('BTC-USDT', verifyChecksum=verify)
+    book.apply(snapshot)
+    for item in items:
+        book.apply(item, 'update')
+
+
+def frames(snapshot, items):
+    ws = MagicMock()
+    ws.jsonCodec = codec.get_codec()
+    books = OrderBooks(ws)
+    books.books[('books', 'BTC-USDT')] = OrderBook('BTC-USDT')
+    arg = {'channel': 'books', 'instId': 'BTC-USDT'}
+    messages = [json.dumps({'arg': arg, 'action': 'snapshot', 'data': [snapshot]})]
+    messages += [json.dumps({'arg': arg, 'action': 'update', 'data': [item]}) for item in items]
+    started = time.perf_counter()
+    for message in messages:
+        books.handleMessage(message)
+    elapsed = time.perf_counter() - started
+    if books.resyncs:
+        raise AssertionError('unexpected resync')
+    return elapsed
+
+
+def run(name, count, fn):
+    started = time.perf_counter()
+    elapsed = fn()
+    if elapsed is None:
+        elapsed = time.perf_counter() - started
+    print('%-22s %12.0f updates/s %8.2f us/update' % (name, count / elapsed, elapsed / count * 1e6))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    snapshot, items = make_feed(count)
+    print('%d updates on a 400 level book, codec %s' % (count, codec.get_codec().name))
+    run('dict + sort', count, lambda: naive(snapshot, items))
+    run('OrderBook', count, lambda: engine(snapshot, items, False))
+    run('OrderBook + checksum', count, lambda: engine(snapshot, items, True))
+    run('OrderBooks frames', count, lambda: frames(snapshot, items))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,12 @@
 from .consts import *
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 
 
 class AccountAPI(OkxClient):
 
     def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',
-                 domain='https://www.okx.com', debug=False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+                 domain='https://www.okx.com', debug=False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # Get Positions
     def get_position_risk(self, instType=''):
@@ -337,3 +337,6 @@ class AccountAPI(OkxClient):
         if earnType is not None:
             params['earnType'] = earnType
         return self._request_with_params(POST, SET_AUTO_EARN, params)
+
+
+AsyncAccountAPI = make_async_api(AccountAPI)
@@ -1,10 +1,10 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class BlockTradingAPI(OkxClient):
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     def counterparties(self):
         params = {}
@@ -77,3 +77,6 @@ class BlockTradingAPI(OkxClient):
     #Get Quote products
     def get_quote_products(self):
         return self._request_without_params(GET, MARKER_INSTRUMENT_SETTING)
+
+
+AsyncBlockTradingAPI = make_async_api(BlockTradingAPI)
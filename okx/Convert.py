@@ -1,10 +1,10 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class ConvertAPI(OkxClient):
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False,proxy = None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False,proxy = None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     def get_currencies(self):
         params = {}
@@ -25,3 +25,6 @@ class ConvertAPI(OkxClient):
     def get_convert_history(self, after = '', before = '', limit = '',tag=''):
         params = {'after': after, 'before': before, 'limit':limit,'tag':tag}
         return self._request_with_params(GET, CONVERT_HISTORY, params)
+
+
+AsyncConvertAPI = make_async_api(ConvertAPI)
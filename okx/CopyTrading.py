@@ -1,12 +1,12 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class CopyTradingAPI(OkxClient):
     def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=False, flag='1',
-                 domain='https://www.okx.com', debug=False, proxy=None):
+                 domain='https://www.okx.com', debug=False, proxy=None, **kwargs):
         OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug,
-                           proxy=proxy)
+                           proxy=proxy, **kwargs)
 
     # Get existing leading positions
     def get_existing_leading_positions(self, instId=''):
@@ -71,3 +71,6 @@ class CopyTradingAPI(OkxClient):
     # Get unrealized profit sharing details
     def get_unrealized_profit_sharing_details(self):
         return self._request_without_params(GET, GET_UNREALIZED_PROFIT_SHARING_DETAILS)
+
+
+AsyncCopyTradingAPI = make_async_api(CopyTradingAPI)
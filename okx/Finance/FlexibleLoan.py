@@ -1,11 +1,11 @@
-from okx.okxclient import OkxClient
+from okx.okxclient import OkxClient, make_async_api
 from okx.consts import *
 
 
 class FlexibleLoanAPI(OkxClient):
     def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',
-                 domain='https://www.okx.com', debug=False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+                 domain='https://www.okx.com', debug=False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     def borrow_currencies(self):
         return self._request_without_params(GET, FINANCE_BORROW_CURRENCIES)
@@ -63,3 +63,6 @@ class FlexibleLoanAPI(OkxClient):
         if limit != '':
             params['limit'] = limit
         return self._request_with_params(GET, FINANCE_INTEREST_ACCRUED, params)
+
+
+AsyncFlexibleLoanAPI = make_async_api(FlexibleLoanAPI)
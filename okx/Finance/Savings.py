@@ -1,10 +1,10 @@
-from okx.okxclient import OkxClient
+from okx.okxclient import OkxClient, make_async_api
 from okx.consts import *
 
 
 class SavingsAPI(OkxClient):
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # - Get saving balance
     def get_saving_balance(self, ccy=''):
@@ -60,3 +60,4 @@ class SavingsAPI(OkxClient):
         return self._request_with_params(GET, GET_PUBLIC_BORROW_INFO, params)
 
 
+AsyncSavingsAPI = make_async_api(SavingsAPI)
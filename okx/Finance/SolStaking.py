@@ -1,10 +1,10 @@
-from okx.okxclient import OkxClient
+from okx.okxclient import OkxClient, make_async_api
 from okx.consts import *
 
 
 class SolStakingAPI(OkxClient):
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     def sol_purchase(self, amt):
 
@@ -49,3 +49,6 @@ class SolStakingAPI(OkxClient):
 
     def sol_product_info(self):
         return self._request_without_params(GET, STACK_SOL_PRODUCT_INFO)
+
+
+AsyncSolStakingAPI = make_async_api(SolStakingAPI)
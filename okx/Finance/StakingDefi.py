@@ -1,10 +1,10 @@
-from okx.okxclient import OkxClient
+from okx.okxclient import OkxClient, make_async_api
 from okx.consts import *
 
 
 class StakingDefiAPI(OkxClient):
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     def get_offers(self, productId='', protocolType='', ccy=''):
         params = {
@@ -61,3 +61,5 @@ class StakingDefiAPI(OkxClient):
         }
         return self._request_with_params(GET, STACK_DEFI_ORDERS_HISTORY, params)
 
+
+AsyncStakingDefiAPI = make_async_api(StakingDefiAPI)
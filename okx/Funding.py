@@ -1,12 +1,12 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class FundingAPI(OkxClient):
 
 
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # Get Non Tradable Assets
     def get_non_tradable_assets(self, ccy: str = ''):
@@ -118,3 +118,5 @@ class FundingAPI(OkxClient):
             params['toAddrType'] = toAddrType
         return self._request_with_params(GET, GET_WITHDRAWAL_HISTORY, params)
 
+
+AsyncFundingAPI = make_async_api(FundingAPI)
@@ -1,11 +1,11 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class PublicAPI(OkxClient):
 
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # Get Instruments
     def get_instruments(self, instType, uly='', instId='',instFamily = ''):
@@ -137,3 +137,6 @@ class PublicAPI(OkxClient):
         if instFamilyList is not None:
             params['instFamilyList'] = instFamilyList
         return self._request_with_params(GET, MARKET_DATA_HISTORY, params)
+
+
+AsyncPublicAPI = make_async_api(PublicAPI)
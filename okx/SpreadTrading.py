@@ -1,11 +1,11 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class SpreadTradingAPI(OkxClient):
 
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # Place Order
     def place_order(self, sprdId='', clOrdId='', tag='', side='', ordType='', sz='', px=''):
@@ -65,3 +65,5 @@ class SpreadTradingAPI(OkxClient):
         params = {'sprdId': sprdId}
         return self._request_with_params(GET, SPREAD_GET_PUBLIC_TRADES, params)
 
+
+AsyncSpreadTradingAPI = make_async_api(SpreadTradingAPI)
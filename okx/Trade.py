@@ -1,14 +1,14 @@
 import json
 
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class TradeAPI(OkxClient):
 
     def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',
-                 domain='https://www.okx.com', debug=False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+                 domain='https://www.okx.com', debug=False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
     # Place Order
     def place_order(self, instId, tdMode, side, ordType, sz, ccy='', clOrdId='', tag='', posSide='', px='',
@@ -25,7 +25,7 @@ class TradeAPI(OkxClient):
 
     # Place Multiple Orders
     def place_multiple_orders(self, orders_data):
-        return self._request_with_params(POST, BATCH_ORDERS, orders_data)
+        return self._request_batch(POST, BATCH_ORDERS, orders_data)
 
     # Cancel Order
     def cancel_order(self, instId, ordId='', clOrdId=''):
@@ -34,7 +34,7 @@ class TradeAPI(OkxClient):
 
     # Cancel Multiple Orders
     def cancel_multiple_orders(self, orders_data):
-        return self._request_with_params(POST, CANCEL_BATCH_ORDERS, orders_data)
+        return self._request_batch(POST, CANCEL_BATCH_ORDERS, orders_data)
 
     # Amend Order
     def amend_order(self, instId, cxlOnFail='', ordId='', clOrdId='', reqId='', newSz='', newPx='', newTpTriggerPx='',
@@ -51,7 +51,7 @@ class TradeAPI(OkxClient):
 
     # Amend Multiple Orders
     def amend_multiple_orders(self, orders_data):
-        return self._request_with_params(POST, AMEND_BATCH_ORDER, orders_data)
+        return self._request_batch(POST, AMEND_BATCH_ORDER, orders_data)
 
     # Close Positions
     def close_positions(self, instId, mgnMode, posSide='', ccy='', autoCxl='', clOrdId='', tag=''):
@@ -213,3 +213,6 @@ class TradeAPI(OkxClient):
             'limit': limit
         }
         return self._request_with_params(GET, ONE_CLICK_REPAY_HISTORY_V2, params)
+
+
+AsyncTradeAPI = make_async_api(TradeAPI)
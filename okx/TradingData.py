@@ -1,11 +1,11 @@
-from .okxclient import OkxClient
+from .okxclient import OkxClient, make_async_api
 from .consts import *
 
 
 class TradingDataAPI(OkxClient):
 
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None):
-        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy)
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1', domain = 'https://www.okx.com',debug = False, proxy=None, **kwargs):
+        OkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
 
 
     def get_support_coin(self):
@@ -73,8 +73,4 @@ class TradingDataAPI(OkxClient):
         return self._request_with_params(GET, CONTRACTS_OPEN_INTEREST_HISTORY, params)
 
 
-
-
-
-
-
+AsyncTradingDataAPI = make_async_api(TradingDataAPI)
@@ -0,0 +1,178 @@
+"""
+Parallel candlestick history backfill.
+
+``[begin, end)`` is split per instrument into shards of at most 100 bars, one
+get_history_candlesticks call each. Shards are fetched concurrently, throttled by the
+HISTORY_CANDLES rate limit, and the rows of every instrument are deduplicated on their
+timestamp and returned oldest first.
+
+Usage:
+    backfill = CandleBackfill(MarketAPI(), max_workers=8)
+    rows = backfill.run(['BTC-USDT', 'ETH-USDT'], '1m', begin=1700000000000, end=1702592000000)
+    rows['BTC-USDT'][0]  # ['1700000000000', open, high, low, close, vol, volCcy, volCcyQuote, confirm]
+
+    rows = await AsyncCandleBackfill(AsyncMarketAPI()).run(['BTC-USDT'], '1H', begin, end)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from . import consts as c
+from .exceptions import OkxParamsException, OkxRequestException
+from .ratelimit import RateLimiter
+
+ROWS_PER_REQUEST = 100
+
+_MINUTE = 60 * 1000
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+# bar: duration in ms, month bars have no fixed length and can not be sharded
+BAR_MS = {
+    '1s': 1000,
+    '1m': _MINUTE, '3m': 3 * _MINUTE, '5m': 5 * _MINUTE, '15m': 15 * _MINUTE, '30m': 30 * _MINUTE,
+    '1H': _HOUR, '2H': 2 * _HOUR, '4H': 4 * _HOUR, '6H': 6 * _HOUR, '12H': 12 * _HOUR,
+    '1D': _DAY, '2D': 2 * _DAY, '3D': 3 * _DAY, '1W': 7 * _DAY,
+    '6Hutc': 6 * _HOUR, '12Hutc': 12 * _HOUR,
+    '1Dutc': _DAY, '2Dutc': 2 * _DAY, '3Dutc': 3 * _DAY, '1Wutc': 7 * _DAY,
+}
+
+
+def shard_range(begin, end, bar, rows=ROWS_PER_REQUEST):
+    """
+    Split [begin, end) into (start, stop) shards covering at most ``rows`` bars each.
+    :param begin: Start timestamp in ms, inclusive
+    :param end: End timestamp in ms, exclusive
+    :param bar: Bar size, one of BAR_MS
+    """
+    if bar not in BAR_MS:
+        raise OkxParamsException('Can not shard bar %s, expected one of %s' % (bar, ', '.join(BAR_MS)))
+    begin, end = int(begin), int(end)
+    step = BAR_MS[bar] * rows
+    return [(start, min(start + step, end)) for start in range(begin, end, step)]
+
+
+def _ts(row):
+    return int(row[0]) if isinstance(row, (list, tuple)) else row.ts
+
+
+def _shard_params(instId, bar, start, after):
+    # after/before are exclusive bounds on the candle timestamp
+    return {'instId': instId, 'after': str(after), 'before': str(start - 1), 'bar': bar,
+            'limit': str(ROWS_PER_REQUEST)}
+
+
+def _next_after(data, start):
+    """Cursor for another request within the shard, None when the shard is complete."""
+    if not data:
+        return None
+    oldest = _ts(data[-1])
+    return oldest if oldest > start else None
+
+
+def _page_data(response, instId):
+    if response.get('code') != '0':
+        raise OkxRequestException('backfill of %s failed, code=%s: %s' % (instId, response.get('code'),
+                                                                           response.get('msg')))
+    return response.get('data') or []
+
+
+def merge_rows(shards):
+    """Merge shard results into one list ordered by timestamp, keeping one row per timestamp."""
+    rows = {}
+    for shard in shards:
+        for row in shard:
+            rows[_ts(row)] = row
+    return [rows[ts] for ts in sorted(rows)]
+
+
+class _Backfill:
+
+    def __init__(self, market_api, rate_limiter=None):
+        """
+        :param market_api: MarketAPI (AsyncMarketAPI for AsyncCandleBackfill)
+        :param rate_limiter: Limiter used when market_api has none; a private RateLimiter by default
+        """
+        self.api = market_api
+        self.rate_limiter = None
+        if getattr(market_api, 'rate_limiter', None) is None:
+            self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+
+    @staticmethod
+    def _jobs(instIds, bar, begin, end):
+        if isinstance(instIds, str):
+            instIds = [instIds]
+        shards = shard_range(begin, end, bar)
+        return [(instId, start, stop) for instId in instIds for start, stop in shards]
+
+    @staticmethod
+    def _collect(jobs, results):
+        by_instrument = {}
+        for (instId, _, _), rows in zip(jobs, results):
+            by_instrument.setdefault(instId, []).append(rows)
+        return {instId: merge_rows(shards) for instId, shards in by_instrument.items()}
+
+
+class CandleBackfill(_Backfill):
+
+    def __init__(self, market_api, max_workers=8, rate_limiter=None):
+        """
+        :param market_api: MarketAPI shared by the worker threads, e.g. the market facade of an OkxSession
+        :param max_workers: Number of shards fetched concurrently
+        """
+        super().__init__(market_api, rate_limiter)
+        self.max_workers = max_workers
+
+    def fetch_shard(self, instId, bar, start, stop):
+        rows = []
+        after = stop
+        while after is not None:
+            params = _shard_params(instId, bar, start, after)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(c.HISTORY_CANDLES, params)
+            data = _page_data(self.api.get_history_candlesticks(**params), instId)
+            rows.extend(data)
+            after = _next_after(data, start)
+        return rows
+
+    def run(self, instIds, bar, begin, end):
+        """
+        Fetch all candles of ``instIds`` in [begin, end).
+        :return: {instId: rows ordered oldest first}
+        """
+        jobs = self._jobs(instIds, bar, begin, end)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda job: self.fetch_shard(job[0], bar, job[1], job[2]), jobs))
+        return self._collect(jobs, results)
+
+
+class AsyncCandleBackfill(_Backfill):
+
+    def __init__(self, market_api, concurrency=8, rate_limiter=None):
+        """
+        :param concurrency: Number of shard requests in flight
+        """
+        super().__init__(market_api, rate_limiter)
+        self.concurrency = concurrency
+
+    async def fetch_shard(self, instId, bar, start, stop):
+        rows = []
+        after = stop
+        while after is not None:
+            params = _shard_params(instId, bar, start, after)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(c.HISTORY_CANDLES, params)
+            data = _page_data(await self.api.get_history_candlesticks(**params), instId)
+            rows.extend(data)
+            after = _next_after(data, start)
+        return rows
+
+    async def run(self, instIds, bar, begin, end):
+        jobs = self._jobs(instIds, bar, begin, end)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(job):
+            async with semaphore:
+                return await self.fetch_shard(job[0], bar, job[1], job[2])
+
+        results = await asyncio.gather(*(fetch(job) for job in jobs))
+        return self._collect(jobs, results)
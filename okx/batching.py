@@ -0,0 +1,208 @@
+"""
+Micro-batching of single order placements.
+
+Orders submitted one at a time are collected for a short window (or until a full batch of
+MAX_BATCH_ORDERS is queued) and sent as one BATCH_ORDERS request. Every order gets its own
+future resolving to a place_order style response, so callers trade a bounded latency budget
+for far fewer signed requests. With an order_validator on the TradeAPI, OrderBatcher checks
+every order when it is submitted, so an invalid order fails alone instead of its whole batch.
+
+Usage:
+    with OrderBatcher(trade, window=0.002) as batcher:
+        future = batcher.place_order('BTC-USDT', 'cash', 'buy', 'limit', '0.01', px='30000')
+        future.result()  # {'code': '0', 'msg': '', 'data': [{'ordId': ..., 'sCode': '0', ...}]}
+
+    batcher = AsyncOrderBatcher(async_trade)
+    response = await batcher.place_order('BTC-USDT', 'cash', 'buy', 'limit', '0.01', px='30000')
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import consts as c
+from .exceptions import OkxParamsException
+from .okxclient import OkxClient
+
+DEFAULT_WINDOW = 0.002
+
+
+def build_order(instId, tdMode, side, ordType, sz, **fields):
+    """Order dict as sent by TradeAPI.place_order; optional fields left empty are omitted."""
+    order = {'instId': instId, 'tdMode': tdMode, 'side': side, 'ordType': ordType, 'sz': sz}
+    order.update((key, value) for key, value in fields.items() if value is not None and value != '')
+    return order
+
+
+def split_response(orders, response):
+    """Split a batch response into one place_order style response per order."""
+    if response.get('code') not in ('0', '1', '2'):
+        return [{'code': response.get('code'), 'msg': response.get('msg', ''), 'data': []} for _ in orders]
+    merged = OkxClient._merge_batch([orders], [response])
+    return [{'code': '0' if item.get('sCode') == '0' else '1', 'msg': item.get('sMsg', ''), 'data': [item]}
+            for item in merged['data']]
+
+
+class OrderBatcher:
+
+    def __init__(self, trade_api, window=DEFAULT_WINDOW, max_batch=c.MAX_BATCH_ORDERS, max_workers=4):
+        """
+        :param trade_api: TradeAPI used to send the batches
+        :param window: Seconds the first queued order waits for others before its batch is sent
+        :param max_batch: Batch size sent immediately, at most MAX_BATCH_ORDERS
+        :param max_workers: Batches in flight at the same time
+        """
+        self.trade_api = trade_api
+        self.window = window
+        self.max_batch = min(max_batch, c.MAX_BATCH_ORDERS)
+        self.batches = 0
+        self.orders = 0
+        self._queue = []
+        self._cond = threading.Condition()
+        self._flush = False
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='okx-order-batch')
+        self._thread = threading.Thread(target=self._run, name='okx-order-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, order, callback=None):
+        """
+        Queue an order dict.
+        :param callback: Called with the future once the order's result is known
+        :return: concurrent.futures.Future resolving to the order's response, failing with
+                 OkxParamsException when the order_validator of the TradeAPI rejects the order
+        """
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        validator = getattr(self.trade_api, 'order_validator', None)
+        if validator is not None:
+            try:
+                order = validator.validate_order(order)
+            except OkxParamsException as e:
+                future.set_exception(e)
+                return future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('OrderBatcher is closed')
+            self._queue.append((order, future, time.monotonic()))
+            self._cond.notify()
+        return future
+
+    def place_order(self, instId, tdMode, side, ordType, sz, callback=None, **fields):
+        """Queue an order with the arguments of TradeAPI.place_order."""
+        return self.submit(build_order(instId, tdMode, side, ordType, sz, **fields), callback)
+
+    def flush(self):
+        """Send the queued orders without waiting for the window to elapse."""
+        with self._cond:
+            self._flush = True
+            self._cond.notify()
+
+    def close(self):
+        """Send the remaining orders and stop the batcher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                deadline = self._queue[0][2] + self.window
+                while len(self._queue) < self.max_batch and not (self._flush or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch]
+                del self._queue[:self.max_batch]
+                self._flush = bool(self._queue) and self._flush
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch):
+        orders = [order for order, _, _ in batch]
+        self.batches += 1
+        self.orders += len(orders)
+        try:
+            responses = split_response(orders, self.trade_api.place_multiple_orders(orders))
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), response in zip(batch, responses):
+            future.set_result(response)
+
+
+class AsyncOrderBatcher:
+    """asyncio variant of OrderBatcher for AsyncTradeAPI, futures are awaited on the running loop."""
+
+    def __init__(self, trade_api, window=DEFAULT_WINDOW, max_batch=c.MAX_BATCH_ORDERS):
+        self.trade_api = trade_api
+        self.window = window
+        self.max_batch = min(max_batch, c.MAX_BATCH_ORDERS)
+        self.batches = 0
+        self.orders = 0
+        self._queue = []
+        self._timer = None
+        self._tasks = set()
+
+    def submit(self, order):
+        """
+        Queue an order dict.
+        :return: asyncio.Future resolving to the order's response
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._queue.append((order, future))
+        if len(self._queue) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def place_order(self, instId, tdMode, side, ordType, sz, **fields):
+        return self.submit(build_order(instId, tdMode, side, ordType, sz, **fields))
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = self._queue[:self.max_batch]
+            del self._queue[:self.max_batch]
+            task = asyncio.ensure_future(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        """Send the remaining orders and wait for every batch in flight."""
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def _send(self, batch):
+        orders = [order for order, _ in batch]
+        self.batches += 1
+        self.orders += len(orders)
+        try:
+            responses = split_response(orders, await self.trade_api.place_multiple_orders(orders))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
@@ -0,0 +1,200 @@
+"""
+TTL cache for static and slow-changing REST endpoints.
+
+Instruments, position tiers, underlyings and currency lists change rarely but are requested
+constantly. With ``response_cache=True`` (or a ResponseCache instance, to share it between
+clients) successful GET responses of the endpoints in DEFAULT_TTLS are kept in memory for their
+TTL and returned without a round-trip. The cache is LRU bounded and can be persisted to a JSON
+file so a restarted process starts warm: changes are written at most every ``save_interval``
+seconds by a timer thread, on flush() or close(), and at interpreter exit.
+
+Cached responses are shared between callers, treat them as read-only.
+
+Usage:
+    cache = ResponseCache(max_entries=512, path='okx-cache.json')
+    public = PublicAPI(response_cache=cache)
+    public.get_instruments('SWAP')        # network
+    public.get_instruments('SWAP')        # cached
+    cache.invalidate(c.INSTRUMENT_INFO)   # e.g. after a listing announcement
+    cache.close()                         # write pending changes
+"""
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from . import consts as c
+
+# request path: seconds a successful response stays valid
+DEFAULT_TTLS = {
+    c.INSTRUMENT_INFO: 300,
+    c.TIER: 3600,
+    c.UNDERLYING: 3600,
+    c.CURRENCY_INFO: 600,
+    c.GET_CURRENCIES: 3600,
+}
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_SAVE_INTERVAL = 5.0
+
+# Caches with a path, flushed at exit; weakly referenced so that they are not kept alive
+_persisted = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_persisted():
+    for cache in list(_persisted):
+        cache.flush()
+
+
+class ResponseCache:
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, path=None, save_interval=DEFAULT_SAVE_INTERVAL):
+        """
+        :param ttls: {request path: seconds}, merged over DEFAULT_TTLS; a TTL of 0 disables caching of a path
+        :param max_entries: Least recently used entries are evicted beyond this size
+        :param path: JSON file the cache is loaded from and saved to
+        :param save_interval: Seconds changes wait before being written to ``path``, batching the writes
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        # Serialises writes of the file, kept apart from _lock so that lookups do not wait for the disk
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        # digest: (expires at, request path, response)
+        self._entries = OrderedDict()
+        if path is not None:
+            if os.path.exists(path):
+                self.load()
+            _persisted.add(self)
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, request_path, key):
+        """
+        Cached response for a request, None when the path is not cached, missing or expired.
+        :param key: Hashable description of the request (method, path, params, credentials)
+        """
+        if not self.ttls.get(request_path):
+            return None
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+        return None
+
+    def put(self, request_path, key, response):
+        """Store a response if its path is cached and the call succeeded."""
+        ttl = self.ttls.get(request_path)
+        if not ttl or not isinstance(response, dict) or response.get('code') != '0':
+            return
+        digest = self._digest(key)
+        with self._lock:
+            self._entries[digest] = (time.time() + ttl, request_path, response)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._changed()
+
+    def invalidate(self, request_path=None):
+        """
+        Drop cached responses.
+        :param request_path: Only drop responses of this path, everything when None
+        """
+        with self._lock:
+            if request_path is None:
+                self._entries.clear()
+            else:
+                for digest in [d for d, entry in self._entries.items() if entry[1] == request_path]:
+                    del self._entries[digest]
+        self._changed()
+
+    def _changed(self):
+        if self.path is None:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                return
+            timer = self._timer = threading.Timer(self.save_interval, self.flush)
+            timer.daemon = True
+        # A flush between the lock and here takes self._timer, start the local one
+        timer.start()
+
+    def flush(self):
+        """Write pending changes to the cache path."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+            dirty, self._dirty = self._dirty, False
+        if timer is not None:
+            timer.cancel()
+        if dirty and self.path is not None:
+            self.save()
+
+    def close(self):
+        """Write pending changes, the cache is no longer flushed at interpreter exit."""
+        self.flush()
+        _persisted.discard(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self, path=None):
+        """Write the unexpired entries to ``path`` (default: the cache path), replacing the file atomically."""
+        path = path or self.path
+        now = time.time()
+        with self._lock:
+            entries = [[digest, expires, request_path, response]
+                       for digest, (expires, request_path, response) in self._entries.items() if expires > now]
+        with self._save_lock:
+            # A temporary file per call, in the target directory so that os.replace stays atomic
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                            dir=os.path.dirname(os.path.abspath(path)))
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def load(self, path=None):
+        """Load the unexpired entries saved by ``save``, a missing or corrupt file is ignored."""
+        path = path or self.path
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self._lock:
+            for entry in entries if isinstance(entries, list) else ():
+                try:
+                    digest, expires, request_path, response = entry
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(expires, (int, float)) and expires > now:
+                    self._entries[digest] = (expires, request_path, response)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
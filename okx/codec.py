@@ -0,0 +1,96 @@
+"""
+JSON codecs used for REST request bodies, REST responses and WebSocket frames.
+
+orjson or msgspec are used when installed (pip install python-okx[fast-json]), the stdlib json
+module otherwise. A codec can be chosen per client with the ``json_codec`` argument of the REST
+clients or ``jsonCodec`` of the WebSocket clients, either by name or as a codec instance.
+"""
+import json
+
+
+class JsonCodec:
+    """stdlib json codec, always available."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Encode ``obj`` to a JSON str."""
+        return json.dumps(obj)
+
+    def dumpb(self, obj):
+        """Encode ``obj`` to JSON bytes."""
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        """Decode a JSON document from str or bytes."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj):
+        return self._dumps(obj).decode('utf-8')
+
+    def dumpb(self, obj):
+        return self._dumps(obj)
+
+    def loads(self, data):
+        return self._loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self._encode = msgspec.json.Encoder().encode
+        self._decode = msgspec.json.Decoder().decode
+
+    def dumps(self, obj):
+        return self._encode(obj).decode('utf-8')
+
+    def dumpb(self, obj):
+        return self._encode(obj)
+
+    def loads(self, data):
+        return self._decode(data)
+
+
+_CODECS = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+_PREFERENCE = (OrjsonCodec.name, MsgspecCodec.name, JsonCodec.name)
+_instances = {}
+
+
+def get_codec(codec=None):
+    """
+    Resolve a codec.
+    :param codec: None or 'auto' for the fastest installed backend, a backend name
+                  ('orjson', 'msgspec', 'json') or a JsonCodec instance
+    :return: JsonCodec instance
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None or codec == 'auto':
+        for name in _PREFERENCE:
+            try:
+                return get_codec(name)
+            except ImportError:
+                continue
+    instance = _instances.get(codec)
+    if instance is None:
+        if codec not in _CODECS:
+            raise ValueError("Unknown JSON codec: %s, expected one of %s" % (codec, ', '.join(_CODECS)))
+        instance = _instances[codec] = _CODECS[codec]()
+    return instance
@@ -13,6 +13,9 @@ LOCALE = 'Locale='
 
 APPLICATION_JSON = 'application/json'
 
+# Orders accepted per request by the batch order endpoints
+MAX_BATCH_ORDERS = 20
+
 GET = "GET"
 POST = "POST"
 
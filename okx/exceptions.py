@@ -3,14 +3,18 @@
 
 class OkxAPIException(Exception):
 
-    def __init__(self, response):
+    def __init__(self, response, result=None):
+        """
+        :param response: httpx.Response of the failed request
+        :param result: Already decoded response body, parsed from ``response`` if None
+        """
         self.code = 0
         try:
-            json_res = response.json()
+            json_res = response.json() if result is None else result
         except ValueError:
             self.message = 'Invalid JSON error message from Okx: {}'.format(response.text)
         else:
-            if "code" in json_res.keys() and "msg" in json_res.keys():
+            if isinstance(json_res, dict) and "code" in json_res.keys() and "msg" in json_res.keys():
                 self.code = json_res['code']
                 self.message = json_res['msg']
             else:
@@ -19,12 +23,59 @@ class OkxAPIException(Exception):
 
         self.status_code = response.status_code
         self.response = response
-        self.request = getattr(response, 'request', None)
+        try:
+            self.request = response.request
+        except (AttributeError, RuntimeError):
+            # httpx raises RuntimeError for responses built without a request
+            self.request = None
 
     def __str__(self):  # pragma: no cover
         return 'API Request Error(code=%s): %s' % (self.code, self.message)
 
 
+class OkxRateLimitException(OkxAPIException):
+    """Request rejected by a rate limit: code 50011, 50061 or HTTP 429."""
+
+
+class OkxServiceUnavailableException(OkxAPIException):
+    """Exchange busy or unavailable: code 50001, 50013, 50026 or HTTP 5xx."""
+
+
+class OkxTimeoutException(OkxAPIException):
+    """
+    Code 50004, the request timed out inside the exchange. Its outcome is unknown: an order may
+    still have been placed, look it up by clOrdId before placing it again.
+    """
+
+
+RATE_LIMIT_CODES = frozenset(('50011', '50061'))
+SERVICE_UNAVAILABLE_CODES = frozenset(('50001', '50013', '50026'))
+TIMEOUT_CODES = frozenset(('50004',))
+
+
+def api_exception(response, result=None):
+    """
+    Typed OkxAPIException for a failed response.
+    :param response: httpx.Response
+    :param result: Decoded body, parsed from ``response`` if None
+    """
+    if result is None:
+        try:
+            result = response.json()
+        except ValueError:
+            result = None
+    code = str(result.get('code')) if isinstance(result, dict) else None
+    if code in RATE_LIMIT_CODES or response.status_code == 429:
+        exception_class = OkxRateLimitException
+    elif code in TIMEOUT_CODES:
+        exception_class = OkxTimeoutException
+    elif code in SERVICE_UNAVAILABLE_CODES or response.status_code >= 500:
+        exception_class = OkxServiceUnavailableException
+    else:
+        exception_class = OkxAPIException
+    return exception_class(response, result)
+
+
 class OkxRequestException(Exception):
 
     def __init__(self, message):
@@ -41,3 +92,12 @@ class OkxParamsException(Exception):
 
     def __str__(self):
         return 'OkxParamsException: %s' % self.message
+
+
+class OkxOrderBookException(Exception):
+
+    def __init__(self, message):
+        self.message = message
+
+    def __str__(self):
+        return 'OkxOrderBookException: %s' % self.message
@@ -0,0 +1,172 @@
+"""
+Request instrumentation for the REST clients.
+
+With ``metrics=True`` (or a RequestMetrics instance, to aggregate several clients) every request
+records, per endpoint path, how long it spent waiting for the rate limiter, serialising params,
+signing, waiting on the network and decoding the response, plus the total, into log-linear
+histograms with ~3% relative error. Response codes (and exception names for failed requests) are
+counted per path. Pre/post hooks see every request, e.g. to feed tracing.
+
+Usage:
+    metrics = RequestMetrics()
+    trade = TradeAPI(api_key, api_secret_key, passphrase, metrics=metrics)
+    ...
+    metrics.snapshot()[c.PLACR_ORDER]['network']['p99']  # seconds
+    metrics.to_prometheus()
+"""
+import threading
+
+PHASES = ('ratelimit', 'serialize', 'sign', 'network', 'decode', 'total')
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class Histogram:
+    """
+    Log-linear histogram of non-negative integers, HDR style: values are bucketed by power of two and
+    each power of two is split into 2 ** sub_bucket_bits linear sub-buckets.
+    """
+
+    __slots__ = ('sub_bucket_bits', '_sub_buckets', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, sub_bucket_bits=5):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return self._sub_buckets * (shift + 1) + (value >> shift) - self._sub_buckets
+
+    def _upper_bound(self, index):
+        if index < self._sub_buckets:
+            return index
+        shift, offset = divmod(index - self._sub_buckets, self._sub_buckets)
+        return ((self._sub_buckets + offset + 1) << shift) - 1
+
+    def record(self, value):
+        value = int(value)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, quantile):
+        """Upper bound of the bucket holding the given quantile (0..1), capped at the maximum."""
+        if not self.count:
+            return None
+        rank = max(1, quantile * self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+
+class RequestMetrics:
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES, sub_bucket_bits=5):
+        """
+        :param quantiles: Quantiles reported by snapshot and to_prometheus
+        :param sub_bucket_bits: Histogram precision, 5 bits keep the relative error around 3%
+        """
+        self.quantiles = quantiles
+        self.sub_bucket_bits = sub_bucket_bits
+        # path: {phase: Histogram of microseconds} / path: {code: count}
+        self.histograms = {}
+        self.codes = {}
+        self._pre_hooks = []
+        self._post_hooks = []
+        self._lock = threading.Lock()
+
+    def add_pre_hook(self, hook):
+        """:param hook: Called as hook(method, request_path, params) before a request is sent"""
+        self._pre_hooks.append(hook)
+
+    def add_post_hook(self, hook):
+        """:param hook: Called as hook(method, request_path, params, result, error, elapsed) after a request"""
+        self._post_hooks.append(hook)
+
+    def record(self, request_path, phase, seconds):
+        with self._lock:
+            phases = self.histograms.get(request_path)
+            if phases is None:
+                phases = self.histograms[request_path] = {}
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = Histogram(self.sub_bucket_bits)
+            histogram.record(seconds * 1e6)
+
+    def count(self, request_path, code):
+        with self._lock:
+            codes = self.codes.setdefault(request_path, {})
+            codes[code] = codes.get(code, 0) + 1
+
+    def before(self, method, request_path, params):
+        for hook in self._pre_hooks:
+            hook(method, request_path, params)
+
+    def after(self, method, request_path, params, result, error, elapsed):
+        """Record the total time and the response code or exception name of a finished request."""
+        self.record(request_path, 'total', elapsed)
+        if error is not None:
+            code = type(error).__name__
+        elif isinstance(result, dict):
+            code = result.get('code', '')
+        else:
+            code = ''
+        self.count(request_path, code)
+        for hook in self._post_hooks:
+            hook(method, request_path, params, result, error, elapsed)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.codes.clear()
+
+    def snapshot(self):
+        """
+        :return: {path: {phase: {'count', 'min', 'max', 'mean', 'p50', ...}, 'codes': {code: count}}}, times in seconds
+        """
+        result = {}
+        with self._lock:
+            for path, phases in self.histograms.items():
+                entry = result[path] = {}
+                for phase, histogram in phases.items():
+                    stats = {'count': histogram.count, 'min': histogram.min / 1e6, 'max': histogram.max / 1e6,
+                             'mean': histogram.total / histogram.count / 1e6}
+                    for quantile in self.quantiles:
+                        stats['p%s' % ('%g' % (quantile * 100)).replace('.', '')] = \
+                            histogram.percentile(quantile) / 1e6
+                    entry[phase] = stats
+            for path, codes in self.codes.items():
+                result.setdefault(path, {})['codes'] = dict(codes)
+        return result
+
+    def to_prometheus(self, prefix='okx_request'):
+        """Prometheus text exposition: one summary per path and phase, one counter per path and code."""
+        lines = ['# TYPE %s_seconds summary' % prefix]
+        with self._lock:
+            for path, phases in sorted(self.histograms.items()):
+                for phase, histogram in sorted(phases.items()):
+                    labels = 'path="%s",phase="%s"' % (path, phase)
+                    for quantile in self.quantiles:
+                        lines.append('%s_seconds{%s,quantile="%g"} %g' % (prefix, labels, quantile,
+                                                                        histogram.percentile(quantile) / 1e6))
+                    lines.append('%s_seconds_sum{%s} %g' % (prefix, labels, histogram.total / 1e6))
+                    lines.append('%s_seconds_count{%s} %d' % (prefix, labels, histogram.count))
+            lines.append('# TYPE %s_codes_total counter' % prefix)
+            for path, codes in sorted(self.codes.items()):
+                for code, count in sorted(codes.items()):
+                    lines.append('%s_codes_total{path="%s",code="%s"} %d' % (prefix, path, code, count))
+        return '\n'.join(lines) + '\n'
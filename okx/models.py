@@ -0,0 +1,186 @@
+"""
+Compact response models for the hot REST endpoints.
+
+OKX returns every number as a string. With ``response_models='float'`` (or ``'decimal'``) on a
+client, the ``data`` list of tickers, order books, candles, orders, fills, positions and balances
+is decoded into ``__slots__`` objects whose numeric fields are already converted; empty strings
+become None and timestamps become int. Responses of other endpoints and error responses are
+returned unchanged.
+
+Usage:
+    market = MarketAPI(response_models='decimal')
+    ticker = market.get_ticker('BTC-USDT')['data'][0]
+    spread = ticker.askPx - ticker.bidPx
+"""
+from decimal import Decimal
+
+from . import consts as c
+
+NUMBER_TYPES = {'float': float, 'decimal': Decimal}
+
+
+class Model:
+    """Base class: text fields are kept as str, numeric fields converted, integer fields parsed as int."""
+
+    __slots__ = ()
+    _text = ()
+    _numeric = ()
+    _integer = ()
+
+    @classmethod
+    def from_dict(cls, item, number=float):
+        obj = cls.__new__(cls)
+        get = item.get
+        for name in cls._text:
+            setattr(obj, name, get(name, ''))
+        for name in cls._numeric:
+            value = get(name)
+            setattr(obj, name, number(value) if value else None)
+        for name in cls._integer:
+            value = get(name)
+            setattr(obj, name, int(value) if value else None)
+        return obj
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join('%s=%r' % item for item in self.to_dict().items()))
+
+
+class Ticker(Model):
+    _text = ('instType', 'instId')
+    _numeric = ('last', 'lastSz', 'askPx', 'askSz', 'bidPx', 'bidSz', 'open24h', 'high24h', 'low24h',
+                'volCcy24h', 'vol24h', 'sodUtc0', 'sodUtc8')
+    _integer = ('ts',)
+    __slots__ = _text + _numeric + _integer
+
+
+class Order(Model):
+    _text = ('instType', 'instId', 'ccy', 'ordId', 'clOrdId', 'tag', 'side', 'posSide', 'tdMode', 'ordType',
+             'state', 'tgtCcy', 'feeCcy', 'rebateCcy', 'category', 'reduceOnly', 'cancelSource', 'stpMode',
+             'tradeId')
+    _numeric = ('px', 'sz', 'pnl', 'accFillSz', 'fillPx', 'fillSz', 'avgPx', 'lever', 'fee', 'rebate')
+    _integer = ('fillTime', 'uTime', 'cTime')
+    __slots__ = _text + _numeric + _integer
+
+
+class Fill(Model):
+    _text = ('instType', 'instId', 'tradeId', 'ordId', 'clOrdId', 'billId', 'subType', 'tag', 'side', 'posSide',
+             'execType', 'feeCcy')
+    _numeric = ('fillPx', 'fillSz', 'fillIdxPx', 'fillPnl', 'fillPxVol', 'fillPxUsd', 'fillMarkVol', 'fillFwdPx',
+                'fillMarkPx', 'fee')
+    _integer = ('ts', 'fillTime')
+    __slots__ = _text + _numeric + _integer
+
+
+class Position(Model):
+    _text = ('instType', 'instId', 'mgnMode', 'posId', 'posSide', 'posCcy', 'ccy', 'adl')
+    _numeric = ('pos', 'availPos', 'avgPx', 'upl', 'uplRatio', 'lever', 'liqPx', 'markPx', 'imr', 'margin',
+                'mgnRatio', 'mmr', 'liab', 'interest', 'notionalUsd', 'last', 'realizedPnl', 'fee', 'fundingFee')
+    _integer = ('cTime', 'uTime')
+    __slots__ = _text + _numeric + _integer
+
+
+class BalanceDetail(Model):
+    _text = ('ccy',)
+    _numeric = ('eq', 'cashBal', 'availBal', 'frozenBal', 'ordFrozen', 'availEq', 'disEq', 'eqUsd', 'upl', 'liab',
+                'crossLiab', 'isoEq', 'mgnRatio', 'notionalLever', 'twap', 'maxLoan', 'interest')
+    _integer = ('uTime',)
+    __slots__ = _text + _numeric + _integer
+
+
+class Balance(Model):
+    """Account balance, ``details`` holds one BalanceDetail per currency."""
+
+    _numeric = ('totalEq', 'isoEq', 'adjEq', 'ordFroz', 'imr', 'mmr', 'borrowFroz', 'mgnRatio', 'notionalUsd', 'upl')
+    _integer = ('uTime',)
+    __slots__ = _numeric + _integer + ('details',)
+
+    @classmethod
+    def from_dict(cls, item, number=float):
+        obj = super().from_dict(item, number)
+        obj.details = [BalanceDetail.from_dict(detail, number) for detail in item.get('details', ())]
+        return obj
+
+
+class Candle(Model):
+    """Candlestick row; index and mark price candles have no volume columns, those are None."""
+
+    __slots__ = ('ts', 'open', 'high', 'low', 'close', 'vol', 'volCcy', 'volCcyQuote', 'confirm')
+
+    @classmethod
+    def from_row(cls, row, number=float):
+        obj = cls.__new__(cls)
+        obj.ts = int(row[0])
+        obj.open = number(row[1])
+        obj.high = number(row[2])
+        obj.low = number(row[3])
+        obj.close = number(row[4])
+        if len(row) >= 9:
+            obj.vol = number(row[5])
+            obj.volCcy = number(row[6])
+            obj.volCcyQuote = number(row[7])
+            obj.confirm = row[8]
+        else:
+            obj.vol = obj.volCcy = obj.volCcyQuote = None
+            obj.confirm = row[5] if len(row) > 5 else ''
+        return obj
+
+
+class OrderBook(Model):
+    """Order book snapshot; asks and bids are lists of (px, sz, orders) tuples."""
+
+    __slots__ = ('asks', 'bids', 'ts')
+
+    @classmethod
+    def from_dict(cls, item, number=float):
+        obj = cls.__new__(cls)
+        obj.asks = [(number(level[0]), number(level[1]), int(level[-1])) for level in item.get('asks', ())]
+        obj.bids = [(number(level[0]), number(level[1]), int(level[-1])) for level in item.get('bids', ())]
+        ts = item.get('ts')
+        obj.ts = int(ts) if ts else None
+        return obj
+
+
+# (method, request path): function decoding one item of "data"
+MODEL_ENDPOINTS = {
+    (c.GET, c.TICKER_INFO): Ticker.from_dict,
+    (c.GET, c.TICKERS_INFO): Ticker.from_dict,
+    (c.GET, c.ORDER_BOOKS): OrderBook.from_dict,
+    (c.GET, c.MARKET_CANDLES): Candle.from_row,
+    (c.GET, c.HISTORY_CANDLES): Candle.from_row,
+    (c.GET, c.INDEX_CANSLES): Candle.from_row,
+    (c.GET, c.MARKPRICE_CANDLES): Candle.from_row,
+    (c.GET, c.ORDER_INFO): Order.from_dict,
+    (c.GET, c.ORDERS_PENDING): Order.from_dict,
+    (c.GET, c.ORDERS_HISTORY): Order.from_dict,
+    (c.GET, c.ORDERS_HISTORY_ARCHIVE): Order.from_dict,
+    (c.GET, c.ORDER_FILLS): Fill.from_dict,
+    (c.GET, c.ORDERS_FILLS_HISTORY): Fill.from_dict,
+    (c.GET, c.POSITION_INFO): Position.from_dict,
+    (c.GET, c.ACCOUNT_INFO): Balance.from_dict,
+}
+
+
+class ModelDecoder:
+
+    def __init__(self, number='float'):
+        """
+        :param number: 'float' or 'decimal', or a callable converting numeric strings
+        """
+        self.number = NUMBER_TYPES.get(number, number)
+        if not callable(self.number):
+            raise ValueError("number must be 'float', 'decimal' or a callable, got %r" % (number,))
+
+    def decode(self, method, request_path, response):
+        """Replace ``response['data']`` items by models if the endpoint has one and the call succeeded."""
+        decode_item = MODEL_ENDPOINTS.get((method, request_path))
+        if decode_item is None or not isinstance(response, dict) or response.get('code') != '0':
+            return response
+        number = self.number
+        response['data'] = [decode_item(item, number) for item in response.get('data') or ()]
+        return response
@@ -1,29 +1,44 @@
-import json
+import asyncio
+import functools
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import httpx
-from httpx import Client
-from datetime import datetime, timezone
+from httpx import Client, AsyncClient
 
 from loguru import logger
 
-from . import consts as c, utils, exceptions
+from . import consts as c, utils, exceptions, codec, models
+from .cache import ResponseCache
+from .metrics import RequestMetrics
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
 
+# Threads of OkxClient.gather, i.e. requests in flight at once on the sync client
+GATHER_MAX_WORKERS = 16
+# sCode of the items of a batch chunk whose request raised instead of returning a response
+CHUNK_ERROR_CODE = '-1'
 
-class OkxClient(Client):
 
-    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',base_api=c.API_URL, debug=False, proxy=None):
-        # Compatible with different versions of httpx
-        # New versions (0.24.0+) use proxy, older versions use proxies
-        try:
-            super().__init__(base_url=base_api, http2=True, proxy=proxy)
-        except TypeError:
-            # Older versions of httpx use proxies parameter
-            if proxy:
-                super().__init__(base_url=base_api, http2=True, proxies={'http://': proxy, 'https://': proxy})
-            else:
-                super().__init__(base_url=base_api, http2=True)
+class _OkxRequestMixin:
+    """Signing and request preparation shared by the sync and asyncio clients."""
+
+    def _init_okx(self, api_key, api_secret_key, passphrase, use_server_time, flag, base_api, debug, rate_limiter=None,
+                  json_codec=None, response_models=None, single_flight=None, response_cache=None,
+                  order_validator=None, metrics=None, retry_policy=None):
+        """
+        :param rate_limiter: okx.ratelimit.RateLimiter delaying requests to stay within endpoint limits
+        :param json_codec: JSON codec name or instance, see okx.codec.get_codec
+        :param response_models: 'float' or 'decimal' to decode hot endpoints into okx.models objects
+        :param single_flight: True or an okx.singleflight.SingleFlight to coalesce identical in-flight GETs
+        :param response_cache: True or an okx.cache.ResponseCache to cache slow-changing GET endpoints
+        :param order_validator: okx.validation.OrderValidator checking orders and amendments before they are sent
+        :param metrics: True or an okx.metrics.RequestMetrics recording per-endpoint latency histograms
+        :param retry_policy: True or an okx.retry.RetryPolicy raising typed exceptions and retrying transient errors
+        """
         self.API_KEY = api_key
         self.API_SECRET_KEY = api_secret_key
         self.PASSPHRASE = passphrase
@@ -31,31 +46,63 @@ class OkxClient(Client):
         self.flag = flag
         self.domain = base_api
         self.debug = debug
+        self.rate_limiter = rate_limiter
+        self.json_codec = codec.get_codec(json_codec)
+        self.model_decoder = models.ModelDecoder(response_models) if response_models else None
+        self.single_flight = SingleFlight() if single_flight is True else single_flight or None
+        self.response_cache = ResponseCache() if response_cache is True else response_cache or None
+        self.order_validator = order_validator
+        self.metrics = RequestMetrics() if metrics is True else metrics or None
+        self.retry_policy = RetryPolicy() if retry_policy is True else retry_policy or None
+        self._signer = None
+        self._signer_key = None
         if use_server_time is not None:
             warnings.warn("use_server_time parameter is deprecated. Please remove it.", DeprecationWarning)
 
-    def _request(self, method, request_path, params):
-        if method == c.GET:
-            request_path = request_path + utils.parse_params_to_str(params)
-        timestamp = utils.get_timestamp()
-        if self.use_server_time:
-            timestamp = self._get_timestamp()
-        body = json.dumps(params) if method == c.POST else ""
+    def _prepare_request(self, method, request_path, params, timestamp=None):
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        path = request_path + utils.parse_params_to_str(params) if method == c.GET else request_path
+        if timestamp is None:
+            timestamp = utils.get_timestamp()
+        body = self.json_codec.dumps(params) if method == c.POST else ""
+        if metrics is not None:
+            serialized = time.perf_counter()
+            metrics.record(request_path, 'serialize', serialized - started)
         if self.API_KEY != '-1':
-            sign = utils.sign(utils.pre_hash(timestamp, method, request_path, str(body), self.debug), self.API_SECRET_KEY)
-            header = utils.get_header(self.API_KEY, sign, timestamp, self.PASSPHRASE, self.flag, self.debug)
+            header = self._get_signer().get_header(timestamp, method, path, body)
         else:
-            header = utils.get_header_no_sign(self.flag, self.debug)
-        response = None
+            header = {c.CONTENT_TYPE: c.APPLICATION_JSON, 'x-simulated-trading': self.flag}
+        if metrics is not None:
+            metrics.record(request_path, 'sign', time.perf_counter() - serialized)
         if self.debug == True:
+            logger.debug(f'header: {header}')
             logger.debug(f'domain: {self.domain}')
-            logger.debug(f'url: {request_path}')
+            logger.debug(f'url: {path}')
             logger.debug(f'body:{body}')
-        if method == c.GET:
-            response = self.get(request_path, headers=header)
-        elif method == c.POST:
-            response = self.post(request_path, data=body, headers=header)
-        return response.json()
+        return path, body, header
+
+    def _decode_response(self, method, request_path, response):
+        if self.retry_policy is not None:
+            self.retry_policy.check(response, None)
+        result = self.json_codec.loads(response.content)
+        if self.retry_policy is not None:
+            self.retry_policy.check(response, result)
+        if self.model_decoder is not None:
+            result = self.model_decoder.decode(method, request_path, result)
+        return result
+
+    def _request_key(self, method, request_path, params):
+        return method, request_path, tuple(params.items()), self.API_KEY, self.flag, self.domain
+
+    def _get_signer(self):
+        # Rebuilt only when the credentials or flag attributes are reassigned
+        signer_key = (self.API_KEY, self.API_SECRET_KEY, self.PASSPHRASE, self.flag)
+        if self._signer_key != signer_key:
+            self._signer = utils.RequestSigner(*signer_key)
+            self._signer_key = signer_key
+        return self._signer
 
     def _request_without_params(self, method, request_path):
         return self._request(method, request_path, {})
@@ -63,11 +110,358 @@ class OkxClient(Client):
     def _request_with_params(self, method, request_path, params):
         return self._request(method, request_path, params)
 
-    def _get_timestamp(self):
-        request_path = c.API_URL + c.SERVER_TIMESTAMP_URL
-        response = self.get(request_path)
+    @staticmethod
+    def _chunk_batch(items):
+        return [items[i:i + c.MAX_BATCH_ORDERS] for i in range(0, len(items), c.MAX_BATCH_ORDERS)]
+
+    @staticmethod
+    def _failed_chunk(exception):
+        """Chunk response standing for a request that raised, e.g. a transport error or a rejected validation"""
+        code = getattr(exception, 'code', None)
+        return {'code': str(code) if code not in (None, 0, '0', 'None') else CHUNK_ERROR_CODE,
+                'msg': getattr(exception, 'message', None) or str(exception) or type(exception).__name__, 'data': []}
+
+    @staticmethod
+    def _merge_batch(chunks, responses):
+        """
+        Merge chunk responses into one batch response with one result per input item, in input order.
+        Items of a chunk rejected as a whole get the chunk's code and msg as sCode and sMsg, items of a
+        chunk whose request raised get CHUNK_ERROR_CODE (or the code of an OkxAPIException) and the error.
+        The merged code follows OKX: '0' all succeeded, '1' all failed, '2' partially succeeded.
+        """
+        data = []
+        msg = ''
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                response = _OkxRequestMixin._failed_chunk(response)
+            results = response.get('data') or []
+            if len(results) != len(chunk):
+                results = [{'ordId': item.get('ordId', ''), 'clOrdId': item.get('clOrdId', ''),
+                            'sCode': response.get('code'), 'sMsg': response.get('msg', '')} for item in chunk]
+            if response.get('code') != '0' and not msg:
+                msg = response.get('msg', '')
+            data.extend(results)
+        succeeded = sum(1 for result in data if result.get('sCode') == '0')
+        code = '0' if succeeded == len(data) else '1' if succeeded == 0 else '2'
+        return {'code': code, 'msg': '' if code == '0' else msg, 'data': data}
+
+    @staticmethod
+    def _merge_rejected(items, rejected, response):
+        """
+        Batch response for ``items`` of which those at the indices of ``rejected`` failed validation and were
+        not sent: they get a per-item failure, the others their result of ``response``, None if none was sent.
+        """
+        valid = [item for index, item in enumerate(items) if index not in rejected]
+        chunks = [[items[index]] for index in rejected]
+        responses = list(rejected.values())
+        if valid:
+            chunks.insert(0, valid)
+            responses.insert(0, response)
+        merged = _OkxRequestMixin._merge_batch(chunks, responses)
+        positions = [index for index in range(len(items)) if index not in rejected] + list(rejected)
+        data = [None] * len(items)
+        for position, result in zip(positions, merged['data']):
+            data[position] = result
+        merged['data'] = data
+        return merged
+
+    @staticmethod
+    def _format_server_timestamp(response):
         if response.status_code == 200:
             ts = datetime.fromtimestamp(int(response.json()['data'][0]['ts']) / 1000.0, tz=timezone.utc)
             return ts.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
         else:
             return ""
+
+
+class OkxClient(_OkxRequestMixin, Client):
+
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',base_api=c.API_URL, debug=False, proxy=None, transport=None, **options):
+        # Compatible with different versions of httpx
+        # New versions (0.24.0+) use proxy, older versions use proxies
+        try:
+            super().__init__(base_url=base_api, http2=True, proxy=proxy, transport=transport)
+        except TypeError:
+            # Older versions of httpx use proxies parameter
+            if proxy:
+                super().__init__(base_url=base_api, http2=True, proxies={'http://': proxy, 'https://': proxy}, transport=transport)
+            else:
+                super().__init__(base_url=base_api, http2=True, transport=transport)
+        self._init_okx(api_key, api_secret_key, passphrase, use_server_time, flag, base_api, debug, **options)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def gather(self, calls, return_exceptions=False):
+        """
+        Run API calls concurrently on at most GATHER_MAX_WORKERS worker threads, sharing the client's
+        connection. Calls made from a worker thread, e.g. a chunked batch inside gather, run in turn on it.
+        :param calls: Zero-argument callables, e.g. functools.partial(api.get_ticker, 'BTC-USDT')
+        :param return_exceptions: Return exceptions in place of results instead of raising the first one
+        :return: Results in the order of ``calls``
+        """
+        if threading.current_thread().name.startswith('okx-gather'):
+            # Waiting on the pool from one of its own threads could leave no thread to run the calls
+            return self._run_in_turn(calls, return_exceptions)
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=GATHER_MAX_WORKERS,
+                                                        thread_name_prefix='okx-gather')
+        futures = [self._executor.submit(call) for call in calls]
+        if not return_exceptions:
+            return [future.result() for future in futures]
+        return [future.exception() or future.result() for future in futures]
+
+    @staticmethod
+    def _run_in_turn(calls, return_exceptions):
+        results = []
+        for call in calls:
+            try:
+                results.append(call())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        super().close()
+
+    def _request(self, method, request_path, params):
+        if self.order_validator is not None:
+            checked = self.order_validator.validate_batch(method, request_path, params)
+            if checked is not None:
+                return self._send_checked(method, request_path, *checked)
+            params = self.order_validator.validate_request(method, request_path, params)
+        if method != c.GET or (self.single_flight is None and self.response_cache is None):
+            return self._send(method, request_path, params)
+        key = self._request_key(method, request_path, params)
+        if self.response_cache is not None:
+            result = self.response_cache.get(request_path, key)
+            if result is not None:
+                return result
+        if self.single_flight is not None:
+            result = self.single_flight.do(key, self._send, method, request_path, params)
+        else:
+            result = self._send(method, request_path, params)
+        if self.response_cache is not None:
+            self.response_cache.put(request_path, key, result)
+        return result
+
+    def _send_checked(self, method, request_path, items, rejected):
+        if not rejected:
+            return self._send(method, request_path, items)
+        valid = [item for index, item in enumerate(items) if index not in rejected]
+        response = self._send(method, request_path, valid) if valid else None
+        return self._merge_rejected(items, rejected, response)
+
+    def _send(self, method, request_path, params):
+        if self.retry_policy is not None:
+            return self.retry_policy.call(self._send_once, method, request_path, params)
+        return self._send_once(method, request_path, params)
+
+    def _send_once(self, method, request_path, params):
+        if self.metrics is not None:
+            return self._send_measured(method, request_path, params)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(request_path, params)
+        timestamp = self._get_timestamp() if self.use_server_time else None
+        path, body, header = self._prepare_request(method, request_path, params, timestamp)
+        response = None
+        if method == c.GET:
+            response = self.get(path, headers=header)
+        elif method == c.POST:
+            response = self.post(path, data=body, headers=header)
+        return self._decode_response(method, request_path, response)
+
+    def _send_measured(self, method, request_path, params):
+        metrics = self.metrics
+        metrics.before(method, request_path, params)
+        started = time.perf_counter()
+        result = None
+        try:
+            if self.rate_limiter is not None:
+                metrics.record(request_path, 'ratelimit', self.rate_limiter.acquire(request_path, params))
+            timestamp = self._get_timestamp() if self.use_server_time else None
+            path, body, header = self._prepare_request(method, request_path, params, timestamp)
+            sent = time.perf_counter()
+            response = None
+            if method == c.GET:
+                response = self.get(path, headers=header)
+            elif method == c.POST:
+                response = self.post(path, data=body, headers=header)
+            received = time.perf_counter()
+            metrics.record(request_path, 'network', received - sent)
+            result = self._decode_response(method, request_path, response)
+            metrics.record(request_path, 'decode', time.perf_counter() - received)
+        except Exception as e:
+            metrics.after(method, request_path, params, None, e, time.perf_counter() - started)
+            raise
+        metrics.after(method, request_path, params, result, None, time.perf_counter() - started)
+        return result
+
+    def _request_batch(self, method, request_path, items):
+        """
+        Send a batch order request, split into concurrent requests of at most MAX_BATCH_ORDERS items sent
+        through gather. A chunk whose request raises becomes per-item failures, see _merge_batch.
+        """
+        if len(items) <= c.MAX_BATCH_ORDERS:
+            return self._request(method, request_path, items)
+        chunks = self._chunk_batch(items)
+        responses = self.gather([functools.partial(self._request, method, request_path, chunk) for chunk in chunks],
+                                return_exceptions=True)
+        for response in responses:
+            if isinstance(response, BaseException) and not isinstance(response, Exception):
+                raise response
+        return self._merge_batch(chunks, responses)
+
+    def _get_timestamp(self):
+        request_path = c.API_URL + c.SERVER_TIMESTAMP_URL
+        response = self.get(request_path)
+        return self._format_server_timestamp(response)
+
+
+class AsyncOkxClient(_OkxRequestMixin, AsyncClient):
+    """
+    asyncio counterpart of OkxClient built on httpx.AsyncClient.
+
+    Requests are signed exactly like OkxClient; ``_request`` is a coroutine, so every
+    API method of an async API class returns an awaitable.
+    """
+
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',base_api=c.API_URL, debug=False, proxy=None, transport=None, **options):
+        try:
+            super().__init__(base_url=base_api, http2=True, proxy=proxy, transport=transport)
+        except TypeError:
+            if proxy:
+                super().__init__(base_url=base_api, http2=True, proxies={'http://': proxy, 'https://': proxy}, transport=transport)
+            else:
+                super().__init__(base_url=base_api, http2=True, transport=transport)
+        self._init_okx(api_key, api_secret_key, passphrase, use_server_time, flag, base_api, debug, **options)
+
+    async def gather(self, calls, return_exceptions=False):
+        """
+        Run API calls concurrently, multiplexed over one connection with HTTP/2.
+        :param calls: Awaitables, e.g. [api.get_ticker('BTC-USDT'), api.get_ticker('ETH-USDT')], or
+                      zero-argument callables returning awaitables
+        :param return_exceptions: As for asyncio.gather
+        :return: Results in the order of ``calls``
+        """
+        return await asyncio.gather(*(call() if callable(call) else call for call in calls),
+                                    return_exceptions=return_exceptions)
+
+    async def _request(self, method, request_path, params):
+        if self.order_validator is not None:
+            checked = await self.order_validator.avalidate_batch(method, request_path, params)
+            if checked is not None:
+                return await self._send_checked(method, request_path, *checked)
+            params = await self.order_validator.avalidate_request(method, request_path, params)
+        if method != c.GET or (self.single_flight is None and self.response_cache is None):
+            return await self._send(method, request_path, params)
+        key = self._request_key(method, request_path, params)
+        if self.response_cache is not None:
+            result = self.response_cache.get(request_path, key)
+            if result is not None:
+                return result
+        if self.single_flight is not None:
+            result = await self.single_flight.do_async(key, self._send, method, request_path, params)
+        else:
+            result = await self._send(method, request_path, params)
+        if self.response_cache is not None:
+            self.response_cache.put(request_path, key, result)
+        return result
+
+    async def _send_checked(self, method, request_path, items, rejected):
+        if not rejected:
+            return await self._send(method, request_path, items)
+        valid = [item for index, item in enumerate(items) if index not in rejected]
+        response = await self._send(method, request_path, valid) if valid else None
+        return self._merge_rejected(items, rejected, response)
+
+    async def _send(self, method, request_path, params):
+        if self.retry_policy is not None:
+            return await self.retry_policy.acall(self._send_once, method, request_path, params)
+        return await self._send_once(method, request_path, params)
+
+    async def _send_once(self, method, request_path, params):
+        if self.metrics is not None:
+            return await self._send_measured(method, request_path, params)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(request_path, params)
+        timestamp = await self._get_timestamp() if self.use_server_time else None
+        path, body, header = self._prepare_request(method, request_path, params, timestamp)
+        response = None
+        if method == c.GET:
+            response = await self.get(path, headers=header)
+        elif method == c.POST:
+            response = await self.post(path, content=body, headers=header)
+        return self._decode_response(method, request_path, response)
+
+    async def _send_measured(self, method, request_path, params):
+        metrics = self.metrics
+        metrics.before(method, request_path, params)
+        started = time.perf_counter()
+        result = None
+        try:
+            if self.rate_limiter is not None:
+                metrics.record(request_path, 'ratelimit', await self.rate_limiter.acquire_async(request_path, params))
+            timestamp = await self._get_timestamp() if self.use_server_time else None
+            path, body, header = self._prepare_request(method, request_path, params, timestamp)
+            sent = time.perf_counter()
+            response = None
+            if method == c.GET:
+                response = await self.get(path, headers=header)
+            elif method == c.POST:
+                response = await self.post(path, content=body, headers=header)
+            received = time.perf_counter()
+            metrics.record(request_path, 'network', received - sent)
+            result = self._decode_response(method, request_path, response)
+            metrics.record(request_path, 'decode', time.perf_counter() - received)
+        except Exception as e:
+            metrics.after(method, request_path, params, None, e, time.perf_counter() - started)
+            raise
+        metrics.after(method, request_path, params, result, None, time.perf_counter() - started)
+        return result
+
+    async def _request_batch(self, method, request_path, items):
+        if len(items) <= c.MAX_BATCH_ORDERS:
+            return await self._request(method, request_path, items)
+        chunks = self._chunk_batch(items)
+        responses = await self.gather([self._request(method, request_path, chunk) for chunk in chunks],
+                                      return_exceptions=True)
+        for response in responses:
+            if isinstance(response, BaseException) and not isinstance(response, Exception):
+                raise response
+        return self._merge_batch(chunks, responses)
+
+    async def _get_timestamp(self):
+        request_path = c.API_URL + c.SERVER_TIMESTAMP_URL
+        response = await self.get(request_path)
+        return self._format_server_timestamp(response)
+
+
+def make_async_api(api_class):
+    """
+    Build the asyncio variant of a REST API class.
+
+    API methods only build params and return ``self._request_with_params(...)``, so they are
+    reused unchanged on top of AsyncOkxClient where that call returns a coroutine.
+    :param api_class: OkxClient subclass, e.g. TradeAPI
+    :return: AsyncOkxClient subclass exposing the same methods, e.g. AsyncTradeAPI
+    """
+    namespace = {
+        name: attr for name, attr in vars(api_class).items()
+        if callable(attr) and not name.startswith('__')
+    }
+
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', use_server_time=None, flag='1',
+                 domain='https://www.okx.com', debug=False, proxy=None, **kwargs):
+        AsyncOkxClient.__init__(self, api_key, api_secret_key, passphrase, use_server_time, flag, domain, debug, proxy, **kwargs)
+
+    namespace['__init__'] = __init__
+    namespace['__module__'] = api_class.__module__
+    namespace['__doc__'] = 'asyncio variant of %s, every API method returns an awaitable.' % api_class.__name__
+    return type('Async' + api_class.__name__, (AsyncOkxClient,), namespace)
@@ -0,0 +1,156 @@
+"""
+Local open-order book fed by the private orders channel.
+
+OrderTracker is seeded once from get_order_list and then kept current by the ``orders`` channel
+of WsPrivateAsync, so order state is read locally instead of polling get_order. Open orders are
+indexed by ordId, clOrdId and instId; updates older than the known state (by uTime) are ignored
+and orders leave the indexes once filled or canceled. The uTime of recently closed orders is kept,
+so a stale seed or a late "live" push arriving after the fill does not reopen them. Listeners are
+called with ``(order, previous)`` on every applied update.
+
+Usage:
+    tracker = OrderTracker(trade)
+    await ws.start()
+    await tracker.subscribe(ws)
+    tracker.seed(instType='SWAP')
+    tracker.add_listener(lambda order, previous: print(order['state']))
+    tracker.by_clOrdId('quote1')
+"""
+import threading
+from collections import OrderedDict
+
+from . import codec
+from .pagination import paginate, apaginate
+
+CLOSED_STATES = frozenset(('filled', 'canceled', 'mmp_canceled'))
+DEFAULT_CLOSED_HISTORY = 10000
+
+
+def _get(order, name):
+    if isinstance(order, dict):
+        return order.get(name)
+    # okx.models.Order from clients created with response_models
+    return getattr(order, name, None)
+
+
+class OrderTracker:
+
+    def __init__(self, trade_api=None, json_codec=None, closed_history=DEFAULT_CLOSED_HISTORY):
+        """
+        :param trade_api: TradeAPI or AsyncTradeAPI used by seed/aseed
+        :param json_codec: Codec decoding raw WebSocket frames, see okx.codec.get_codec
+        :param closed_history: Number of closed orders whose uTime is kept to reject their stale updates
+        """
+        self.trade_api = trade_api
+        self.json_codec = codec.get_codec(json_codec)
+        self._orders = {}
+        self._by_clOrdId = {}
+        self._by_instId = {}
+        # ordId: uTime of the most recently closed orders, oldest first
+        self._closed = OrderedDict()
+        self.closed_history = closed_history
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._orders)
+
+    def get(self, ordId):
+        return self._orders.get(ordId)
+
+    def by_clOrdId(self, clOrdId):
+        ordId = self._by_clOrdId.get(clOrdId)
+        return None if ordId is None else self._orders.get(ordId)
+
+    def open_orders(self, instId=None):
+        """Open orders, of one instrument when instId is given."""
+        if instId is None:
+            return list(self._orders.values())
+        return list(self._by_instId.get(instId, {}).values())
+
+    def add_listener(self, listener):
+        """:param listener: Called as listener(order, previous) after every applied update"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def apply(self, order):
+        """
+        Apply an order snapshot from REST or the orders channel.
+        :return: True when the update was applied, False when it is older than the known state
+        """
+        ordId = _get(order, 'ordId')
+        uTime = int(_get(order, 'uTime') or 0)
+        with self._lock:
+            previous = self._orders.get(ordId)
+            if previous is not None and int(_get(previous, 'uTime') or 0) > uTime:
+                return False
+            closed_uTime = self._closed.get(ordId)
+            if closed_uTime is not None:
+                if closed_uTime >= uTime:
+                    return False
+                del self._closed[ordId]
+            self._remove(ordId, previous)
+            if _get(order, 'state') in CLOSED_STATES:
+                self._closed[ordId] = uTime
+                while len(self._closed) > self.closed_history:
+                    self._closed.popitem(last=False)
+            else:
+                self._orders[ordId] = order
+                clOrdId = _get(order, 'clOrdId')
+                if clOrdId:
+                    self._by_clOrdId[clOrdId] = ordId
+                self._by_instId.setdefault(_get(order, 'instId'), {})[ordId] = order
+        for listener in self._listeners:
+            listener(order, previous)
+        return True
+
+    def _remove(self, ordId, order):
+        if order is None:
+            return
+        del self._orders[ordId]
+        clOrdId = _get(order, 'clOrdId')
+        if clOrdId and self._by_clOrdId.get(clOrdId) == ordId:
+            del self._by_clOrdId[clOrdId]
+        instrument_orders = self._by_instId.get(_get(order, 'instId'))
+        if instrument_orders is not None:
+            instrument_orders.pop(ordId, None)
+            if not instrument_orders:
+                del self._by_instId[_get(order, 'instId')]
+
+    def on_message(self, message):
+        """WebSocket callback applying pushes of the orders channel, other frames are ignored."""
+        if isinstance(message, str):
+            if '"orders"' not in message:
+                return
+            message = self.json_codec.loads(message)
+        if message.get('arg', {}).get('channel') != 'orders' or 'data' not in message:
+            return
+        for order in message['data']:
+            self.apply(order)
+
+    def seed(self, **params):
+        """Load the open orders with TradeAPI.get_order_list, params are passed to it (instType, instId...)."""
+        for order in paginate(self.trade_api.get_order_list, **params):
+            self.apply(order)
+
+    async def aseed(self, **params):
+        """seed for AsyncTradeAPI."""
+        async for order in apaginate(self.trade_api.get_order_list, **params):
+            self.apply(order)
+
+    async def subscribe(self, ws, instType='ANY', **arg):
+        """
+        Subscribe ``ws`` (a started WsPrivateAsync) to the orders channel. The callback already set on
+        ``ws`` keeps receiving the orders frames after the tracker, other channels keep their routes.
+        :param arg: Extra channel arguments, e.g. instId
+        """
+        previous = ws.callback
+
+        def callback(message):
+            self.on_message(message)
+            if previous is not None:
+                previous(message)
+
+        await ws.subscribe([dict(channel='orders', instType=instType, **arg)], callback)
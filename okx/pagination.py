@@ -0,0 +1,146 @@
+"""
+Cursor based auto-pagination for the history endpoints.
+
+History endpoints return records newest first and page backwards with ``after=<cursor of the
+oldest record seen>``. paginate/apaginate follow that cursor and yield records one by one, fetching
+the next page in the background while the caller consumes the current one, and stop at the end of
+the history or at a time bound.
+
+Usage:
+    for fill in paginate(trade.get_fills_history, instType='SPOT', since=1700000000000):
+        ...
+
+    async for candle in apaginate(market.get_history_candlesticks, instId='BTC-USDT', bar='1m'):
+        ...
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import OkxRequestException
+
+# API method name: (cursor field passed back as "after", record time field in ms)
+# Candlestick rows are lists, their fields are column indexes
+CURSORS = {
+    'get_fills': ('billId', 'ts'),
+    'get_fills_history': ('billId', 'ts'),
+    'get_order_list': ('ordId', 'cTime'),
+    'get_orders_history': ('ordId', 'cTime'),
+    'get_orders_history_archive': ('ordId', 'cTime'),
+    'get_account_bills': ('billId', 'ts'),
+    'get_account_bills_archive': ('billId', 'ts'),
+    'get_positions_history': ('uTime', 'uTime'),
+    'get_bills': ('billId', 'ts'),
+    'get_deposit_history': ('ts', 'ts'),
+    'get_withdrawal_history': ('ts', 'ts'),
+    'get_candlesticks': (0, 0),
+    'get_history_candlesticks': (0, 0),
+    'get_index_candlesticks': (0, 0),
+    'get_mark_price_candlesticks': (0, 0),
+    # type=2 pages by timestamp, pass cursor='ts'
+    'get_history_trades': ('tradeId', 'ts'),
+}
+
+
+def _field(record, name):
+    if isinstance(record, (dict, list, tuple)):
+        return record[name]
+    # okx.models objects, candles are indexed by column but expose ts
+    return getattr(record, name if isinstance(name, str) else 'ts')
+
+
+def _resolve(method, cursor):
+    name = getattr(method, '__name__', None)
+    if name not in CURSORS:
+        if cursor is None:
+            raise ValueError("No cursor known for %s, pass cursor=<field>" % name)
+        return cursor, cursor
+    default_cursor, time_field = CURSORS[name]
+    return (cursor if cursor is not None else default_cursor), time_field
+
+
+def _page_data(response):
+    if response.get('code') != '0':
+        raise OkxRequestException('pagination stopped, code=%s: %s' % (response.get('code'), response.get('msg')))
+    return response.get('data') or []
+
+
+class _PageWalker:
+    """Turns pages into (records to yield, next cursor or None when finished)."""
+
+    def __init__(self, cursor_field, time_field, since):
+        self.cursor_field = cursor_field
+        self.time_field = time_field
+        self.since = since
+        self.last_cursor = None
+
+    def step(self, records):
+        if not records:
+            return records, None
+        if self.since is not None:
+            kept = [r for r in records if int(_field(r, self.time_field)) >= self.since]
+            if len(kept) < len(records):
+                return kept, None
+        cursor = _field(records[-1], self.cursor_field)
+        if cursor == self.last_cursor:
+            return records, None
+        self.last_cursor = cursor
+        return records, cursor
+
+
+def paginate(method, cursor=None, since=None, prefetch=True, **params):
+    """
+    Iterate over every record of a history endpoint.
+    :param method: Bound API method, e.g. trade.get_fills_history
+    :param cursor: Cursor field for endpoints missing from CURSORS or to override it
+    :param since: Stop at records older than this timestamp in ms
+    :param prefetch: Request the next page while the current one is consumed
+    :param params: Arguments of the API method, ``after`` is the starting cursor
+    """
+    cursor_field, time_field = _resolve(method, cursor)
+    walker = _PageWalker(cursor_field, time_field, since)
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        response = method(**params)
+        while True:
+            records, next_cursor = walker.step(_page_data(response))
+            pending = None
+            if next_cursor is not None:
+                params['after'] = next_cursor
+                if executor is not None:
+                    pending = executor.submit(method, **params)
+            yield from records
+            if next_cursor is None:
+                return
+            response = pending.result() if pending is not None else method(**params)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def apaginate(method, cursor=None, since=None, prefetch=True, **params):
+    """
+    asyncio variant of paginate for the Async* API classes.
+    """
+    cursor_field, time_field = _resolve(method, cursor)
+    walker = _PageWalker(cursor_field, time_field, since)
+    pending = None
+    try:
+        response = await method(**params)
+        while True:
+            records, next_cursor = walker.step(_page_data(response))
+            if next_cursor is not None:
+                params['after'] = next_cursor
+                if prefetch:
+                    pending = asyncio.ensure_future(method(**params))
+            for record in records:
+                yield record
+            if next_cursor is None:
+                return
+            if pending is not None:
+                response = await pending
+                pending = None
+            else:
+                response = await method(**params)
+    finally:
+        if pending is not None:
+            pending.cancel()
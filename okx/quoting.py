@@ -0,0 +1,165 @@
+"""
+Diff-based quote updates for market making.
+
+QuoteManager keeps the resting quotes it placed per instrument. ``update(instId, quotes)`` diffs
+the desired (side, px, sz) set against them and sends only what changed: quotes present on both
+sides stay untouched, the remaining ones are paired by price level and amended, and only the
+surplus is canceled or placed. A ladder moving by one tick becomes one amend batch instead of a
+cancel batch plus a place batch.
+
+Requests go through TradeAPI (update), AsyncTradeAPI or WsPrivateAsync (aupdate). Passing an
+OrderTracker drops quotes from the book as soon as the orders channel reports them filled or
+canceled.
+
+Usage:
+    quotes = QuoteManager(trade, tdMode='cross', ordType='post_only')
+    quotes.update('BTC-USDT-SWAP', [('buy', '64990', '1'), ('buy', '64980', '2'), ('sell', '65010', '1')])
+"""
+import asyncio
+import itertools
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from .okxclient import OkxClient
+from .ordertracker import CLOSED_STATES
+
+Quote = namedtuple('Quote', 'side px sz')
+QuotePlan = namedtuple('QuotePlan', 'cancels amends places')
+
+# sCode of cancel/amend results whose order is already gone
+ORDER_GONE_CODES = frozenset(('51400', '51401', '51402', '51503'))
+
+
+def _quote(quote):
+    side, px, sz = quote
+    return Quote(side, Decimal(px), Decimal(sz))
+
+
+def _fmt(value):
+    return format(value, 'f')
+
+
+class QuoteManager:
+
+    def __init__(self, api, tdMode='cash', ordType='limit', clOrdIdPrefix=None, tracker=None, **order_fields):
+        """
+        :param api: TradeAPI, AsyncTradeAPI or WsPrivateAsync
+        :param tdMode: Trade mode of the placed quotes
+        :param ordType: 'limit', 'post_only'...
+        :param clOrdIdPrefix: Prefix of the generated clOrdIds, unique per process by default
+        :param tracker: OrderTracker removing filled and canceled quotes
+        :param order_fields: Extra fields of every placed order, e.g. posSide
+        """
+        self.api = api
+        self.order_fields = dict(order_fields, tdMode=tdMode, ordType=ordType)
+        self.clOrdIdPrefix = clOrdIdPrefix or 'q%x' % int(time.time())
+        self._ids = itertools.count(1)
+        # instId: {clOrdId: Quote}
+        self.book = {}
+        if tracker is not None:
+            tracker.add_listener(self._on_order)
+
+    def live(self, instId):
+        """Resting quotes of an instrument as {clOrdId: Quote}."""
+        return dict(self.book.get(instId, {}))
+
+    def _on_order(self, order, previous):
+        state = order.get('state') if isinstance(order, dict) else getattr(order, 'state', None)
+        if state in CLOSED_STATES:
+            instId = order.get('instId') if isinstance(order, dict) else order.instId
+            clOrdId = order.get('clOrdId') if isinstance(order, dict) else order.clOrdId
+            self.book.get(instId, {}).pop(clOrdId, None)
+
+    def plan(self, instId, quotes):
+        """
+        Compute the requests turning the live quotes of ``instId`` into ``quotes``.
+        :param quotes: Iterable of (side, px, sz)
+        :return: QuotePlan of cancel, amend and place request lists
+        """
+        live = self.book.get(instId, {})
+        desired = [_quote(quote) for quote in quotes]
+        unmatched = dict(live)
+        wanted = []
+        for quote in desired:
+            match = next((clOrdId for clOrdId, current in unmatched.items() if current == quote), None)
+            if match is None:
+                wanted.append(quote)
+            else:
+                del unmatched[match]
+        plan = QuotePlan([], [], [])
+        for side in ('buy', 'sell'):
+            # Pair remaining quotes level by level from the top of the book
+            reverse = side == 'buy'
+            current = sorted(((q.px, clOrdId, q) for clOrdId, q in unmatched.items() if q.side == side),
+                             reverse=reverse)
+            target = sorted((q for q in wanted if q.side == side), key=lambda q: q.px, reverse=reverse)
+            for (_, clOrdId, old), new in zip(current, target):
+                amend = {'instId': instId, 'clOrdId': clOrdId}
+                if new.px != old.px:
+                    amend['newPx'] = _fmt(new.px)
+                if new.sz != old.sz:
+                    amend['newSz'] = _fmt(new.sz)
+                plan.amends.append(amend)
+            for _, clOrdId, _ in current[len(target):]:
+                plan.cancels.append({'instId': instId, 'clOrdId': clOrdId})
+            for new in target[len(current):]:
+                order = dict(self.order_fields, instId=instId, side=new.side, px=_fmt(new.px), sz=_fmt(new.sz),
+                             clOrdId='%s%d' % (self.clOrdIdPrefix, next(self._ids)))
+                plan.places.append(order)
+        return plan
+
+    def _apply(self, instId, plan, cancelled, amended, placed):
+        book = self.book.setdefault(instId, {})
+        for request, result in zip(plan.cancels, cancelled):
+            if result.get('sCode') == '0' or result.get('sCode') in ORDER_GONE_CODES:
+                book.pop(request['clOrdId'], None)
+        for request, result in zip(plan.amends, amended):
+            old = book.get(request['clOrdId'])
+            if result.get('sCode') == '0' and old is not None:
+                book[request['clOrdId']] = old._replace(px=Decimal(request.get('newPx', old.px)),
+                                                        sz=Decimal(request.get('newSz', old.sz)))
+            elif result.get('sCode') in ORDER_GONE_CODES:
+                book.pop(request['clOrdId'], None)
+        for request, result in zip(plan.places, placed):
+            if result.get('sCode') == '0':
+                book[request['clOrdId']] = Quote(request['side'], Decimal(request['px']), Decimal(request['sz']))
+
+    @staticmethod
+    def _results(requests, response):
+        """Per-request results of a batch response, failures of the whole request repeated per item."""
+        return OkxClient._merge_batch([requests], [response])['data']
+
+    def update(self, instId, quotes):
+        """
+        Bring the live quotes of ``instId`` to ``quotes`` with TradeAPI batch requests.
+        Cancels are sent first to release margin, then amends, then places.
+        :return: The executed QuotePlan
+        """
+        plan = self.plan(instId, quotes)
+        cancelled = self._results(plan.cancels, self.api.cancel_multiple_orders(plan.cancels)) \
+            if plan.cancels else []
+        amended = self._results(plan.amends, self.api.amend_multiple_orders(plan.amends)) if plan.amends else []
+        placed = self._results(plan.places, self.api.place_multiple_orders(plan.places)) if plan.places else []
+        self._apply(instId, plan, cancelled, amended, placed)
+        return plan
+
+    async def _send_async(self, rest_method, ws_method, requests):
+        if not requests:
+            return []
+        if not hasattr(self.api, ws_method):
+            return self._results(requests, await getattr(self.api, rest_method)(requests))
+        # WebSocket batch operations are limited to MAX_BATCH_ORDERS
+        chunks = OkxClient._chunk_batch(requests)
+        responses = await asyncio.gather(*(getattr(self.api, ws_method)(chunk) for chunk in chunks))
+        return OkxClient._merge_batch(chunks, responses)['data']
+
+    async def aupdate(self, instId, quotes):
+        """update for AsyncTradeAPI or WsPrivateAsync, cancels and amends are sent concurrently."""
+        plan = self.plan(instId, quotes)
+        cancelled, amended = await asyncio.gather(
+            self._send_async('cancel_multiple_orders', 'batch_cancel_orders', plan.cancels),
+            self._send_async('amend_multiple_orders', 'batch_amend_orders', plan.amends))
+        placed = await self._send_async('place_multiple_orders', 'batch_orders', plan.places)
+        self._apply(instId, plan, cancelled, amended, placed)
+        return plan
@@ -0,0 +1,237 @@
+"""
+Client-side token bucket rate limiting keyed on the request paths in okx.consts.
+
+OKX enforces per-endpoint limits, some of them per instrument, and answers with code 50011
+once a limit is exceeded. RateLimiter delays requests until the endpoint has capacity instead,
+blocking the calling thread for sync clients and awaiting for asyncio clients.
+
+Usage:
+    limiter = RateLimiter.shared(api_key)
+    trade = TradeAPI(api_key, api_secret_key, passphrase, rate_limiter=limiter)
+    market = MarketAPI(rate_limiter=limiter)
+"""
+import asyncio
+import threading
+import time
+
+from loguru import logger
+
+from . import consts as c
+
+# Limit scopes: requests are counted per endpoint, or per endpoint and instrument ID
+SCOPE_ENDPOINT = 'endpoint'
+SCOPE_INSTRUMENT = 'instrument'
+
+# path: (requests, per seconds, scope)
+DEFAULT_LIMITS = {
+    # Trade
+    c.PLACR_ORDER: (60, 2, SCOPE_INSTRUMENT),
+    c.BATCH_ORDERS: (300, 2, SCOPE_INSTRUMENT),
+    c.CANCEL_ORDER: (60, 2, SCOPE_INSTRUMENT),
+    c.CANCEL_BATCH_ORDERS: (300, 2, SCOPE_INSTRUMENT),
+    c.AMEND_ORDER: (60, 2, SCOPE_INSTRUMENT),
+    c.AMEND_BATCH_ORDER: (300, 2, SCOPE_INSTRUMENT),
+    c.CLOSE_POSITION: (20, 2, SCOPE_ENDPOINT),
+    c.ORDERS_PENDING: (60, 2, SCOPE_ENDPOINT),
+    c.ORDERS_HISTORY: (40, 2, SCOPE_ENDPOINT),
+    c.ORDERS_HISTORY_ARCHIVE: (20, 2, SCOPE_ENDPOINT),
+    c.ORDER_FILLS: (60, 2, SCOPE_ENDPOINT),
+    c.ORDERS_FILLS_HISTORY: (10, 2, SCOPE_ENDPOINT),
+    c.PLACE_ALGO_ORDER: (20, 2, SCOPE_ENDPOINT),
+    c.CANCEL_ALGOS: (20, 2, SCOPE_ENDPOINT),
+    c.AMEND_ALGO_ORDER: (20, 2, SCOPE_ENDPOINT),
+    c.ORDERS_ALGO_PENDING: (20, 2, SCOPE_ENDPOINT),
+    c.ORDERS_ALGO_HISTORY: (20, 2, SCOPE_ENDPOINT),
+    # Account
+    c.ACCOUNT_INFO: (10, 2, SCOPE_ENDPOINT),
+    c.POSITION_INFO: (10, 2, SCOPE_ENDPOINT),
+    c.POSITIONS_HISTORY: (10, 2, SCOPE_ENDPOINT),
+    c.POSITION_RISK: (10, 2, SCOPE_ENDPOINT),
+    c.BILLS_DETAIL: (5, 1, SCOPE_ENDPOINT),
+    c.BILLS_ARCHIVE: (5, 2, SCOPE_ENDPOINT),
+    c.ACCOUNT_CONFIG: (5, 2, SCOPE_ENDPOINT),
+    c.SET_LEVERAGE: (20, 2, SCOPE_ENDPOINT),
+    c.MAX_TRADE_SIZE: (20, 2, SCOPE_ENDPOINT),
+    c.MAX_AVAIL_SIZE: (20, 2, SCOPE_ENDPOINT),
+    c.FEE_RATES: (5, 2, SCOPE_ENDPOINT),
+    # Funding
+    c.CURRENCY_INFO: (6, 1, SCOPE_ENDPOINT),
+    c.GET_BALANCES: (6, 1, SCOPE_ENDPOINT),
+    c.FUNDS_TRANSFER: (2, 1, SCOPE_ENDPOINT),
+    c.BILLS_INFO: (6, 1, SCOPE_ENDPOINT),
+    c.WITHDRAWAL_COIN: (6, 1, SCOPE_ENDPOINT),
+    c.DEPOSIT_HISTORY: (6, 1, SCOPE_ENDPOINT),
+    # Market Data
+    c.TICKERS_INFO: (20, 2, SCOPE_ENDPOINT),
+    c.TICKER_INFO: (20, 2, SCOPE_ENDPOINT),
+    c.INDEX_TICKERS: (20, 2, SCOPE_ENDPOINT),
+    c.ORDER_BOOKS: (40, 2, SCOPE_ENDPOINT),
+    c.GET_ORDER_LITE_BOOK: (6, 1, SCOPE_ENDPOINT),
+    c.MARKET_CANDLES: (40, 2, SCOPE_ENDPOINT),
+    c.HISTORY_CANDLES: (20, 2, SCOPE_ENDPOINT),
+    c.INDEX_CANSLES: (20, 2, SCOPE_ENDPOINT),
+    c.MARKPRICE_CANDLES: (20, 2, SCOPE_ENDPOINT),
+    c.MARKET_TRADES: (100, 2, SCOPE_ENDPOINT),
+    c.HISTORY_TRADES: (20, 2, SCOPE_ENDPOINT),
+    c.VOLUMNE: (2, 2, SCOPE_ENDPOINT),
+    # Public Data
+    c.INSTRUMENT_INFO: (20, 2, SCOPE_ENDPOINT),
+    c.PRICE_LIMIT: (20, 2, SCOPE_ENDPOINT),
+    c.MARK_PRICE: (10, 2, SCOPE_ENDPOINT),
+    c.FUNDING_RATE: (20, 2, SCOPE_ENDPOINT),
+    c.FUNDING_RATE_HISTORY: (10, 2, SCOPE_ENDPOINT),
+    c.OPEN_INTEREST: (20, 2, SCOPE_ENDPOINT),
+    c.TIER: (10, 2, SCOPE_ENDPOINT),
+    c.UNDERLYING: (20, 2, SCOPE_ENDPOINT),
+    c.SYSTEM_TIME: (10, 2, SCOPE_ENDPOINT),
+    # Convert
+    c.GET_CURRENCIES: (6, 1, SCOPE_ENDPOINT),
+    c.ESTIMATE_QUOTE: (10, 1, SCOPE_ENDPOINT),
+    c.CONVERT_TRADE: (10, 1, SCOPE_ENDPOINT),
+}
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations: a caller takes its tokens immediately and is told
+    how long to wait for them, so waiters are served in arrival order without holding a lock.
+    """
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, requests, per):
+        self.capacity = float(requests)
+        self.rate = requests / float(per)
+        self.tokens = float(requests)
+        self.updated = time.monotonic()
+
+    def reserve(self, tokens=1, now=None):
+        """
+        Take ``tokens`` from the bucket.
+        :return: Seconds the caller has to wait before sending
+        """
+        if now is None:
+            now = time.monotonic()
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Per-endpoint token bucket limiter. One instance should be shared by every API object
+    using the same API key, see RateLimiter.shared.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, limits=None, default_limit=None):
+        """
+        :param limits: Mapping of request path to (requests, per seconds, scope), merged over DEFAULT_LIMITS
+        :param default_limit: (requests, per seconds) applied to paths missing from the table, unlimited if None
+        """
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_limit = default_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+        # path: [requests, delayed requests, total delay, max delay]
+        self._stats = {}
+
+    @classmethod
+    def shared(cls, key='-1'):
+        """
+        Return the process-wide limiter for ``key`` (usually the API key), so that all API
+        objects of one key draw from the same buckets.
+        """
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls._shared[key] = cls()
+            return limiter
+
+    def _costs(self, request_path, params):
+        limit = self.limits.get(request_path)
+        if limit is None:
+            if self.default_limit is None:
+                return []
+            requests, per = self.default_limit
+            return [((request_path, None), requests, per, 1)]
+        requests, per, scope = limit
+        if scope != SCOPE_INSTRUMENT:
+            return [((request_path, None), requests, per, 1)]
+        # Batch endpoints count every order against its own instrument
+        items = params if isinstance(params, list) else [params or {}]
+        per_instrument = {}
+        for item in items:
+            inst_id = item.get('instId') if isinstance(item, dict) else None
+            per_instrument[inst_id] = per_instrument.get(inst_id, 0) + 1
+        return [((request_path, inst_id), requests, per, count) for inst_id, count in per_instrument.items()]
+
+    def reserve(self, request_path, params=None):
+        """
+        Reserve capacity for one request without waiting.
+        :return: Seconds to wait before the request may be sent
+        """
+        costs = self._costs(request_path, params)
+        if not costs:
+            return 0.0
+        delay = 0.0
+        with self._lock:
+            now = time.monotonic()
+            for key, requests, per, tokens in costs:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(requests, per)
+                delay = max(delay, bucket.reserve(tokens, now))
+            stats = self._stats.get(request_path)
+            if stats is None:
+                stats = self._stats[request_path] = [0, 0, 0.0, 0.0]
+            stats[0] += 1
+            if delay > 0:
+                stats[1] += 1
+                stats[2] += delay
+                stats[3] = max(stats[3], delay)
+        if delay > 0:
+            logger.debug(f'rate limit: {request_path} queued for {delay:.3f}s')
+        return delay
+
+    def acquire(self, request_path, params=None):
+        """
+        Block the calling thread until the request may be sent.
+        :return: Queueing delay in seconds
+        """
+        delay = self.reserve(request_path, params)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, request_path, params=None):
+        """
+        Await until the request may be sent without blocking the event loop.
+        :return: Queueing delay in seconds
+        """
+        delay = self.reserve(request_path, params)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self, request_path=None):
+        """
+        Queueing statistics per request path.
+        :return: {path: {'requests', 'delayed', 'totalDelay', 'maxDelay'}}, or one entry if request_path is given
+        """
+        with self._lock:
+            snapshot = {
+                path: {'requests': s[0], 'delayed': s[1], 'totalDelay': s[2], 'maxDelay': s[3]}
+                for path, s in self._stats.items()
+            }
+        if request_path is not None:
+            return snapshot.get(request_path, {'requests': 0, 'delayed': 0, 'totalDelay': 0.0, 'maxDelay': 0.0})
+        return snapshot
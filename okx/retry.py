@@ -0,0 +1,148 @@
+"""
+Error classification and retries of REST requests.
+
+With a RetryPolicy (``retry_policy=True`` or an instance) the client checks every response: an
+HTTP error status or a code other than 0, 1 and 2 (1 and 2 report per-item failures of batch and
+order requests in ``sCode``) raises a typed OkxAPIException, see okx.exceptions.api_exception.
+
+Rate limits (50011, 50061, HTTP 429), busy or unavailable services (50001, 50013, 50026, HTTP 5xx),
+exchange side timeouts (50004) and transport errors are retried with exponential backoff and full
+jitter, then raised once ``max_attempts`` is used up. Only requests that are safe to send twice are
+retried after they may have reached the exchange: GETs, cancels and amends, which address an
+existing order, and placements whose every order carries a clOrdId (algoClOrdId for algo orders),
+a duplicate of which is rejected with sCode 51016 instead of being placed twice. Rate limit
+rejections and connection failures mean nothing was executed and are retried for every request.
+
+Usage:
+    trade = TradeAPI(api_key, api_secret_key, passphrase, retry_policy=RetryPolicy(max_attempts=4))
+    try:
+        trade.place_order('BTC-USDT', 'cash', 'buy', 'limit', '0.01', px='30000', clOrdId='b1')
+    except OkxTimeoutException:
+        trade.get_order('BTC-USDT', clOrdId='b1')
+"""
+import asyncio
+import random
+import time
+
+import httpx
+from loguru import logger
+
+from . import consts as c
+from .exceptions import api_exception, OkxAPIException, OkxRateLimitException
+
+# Codes of successful responses; 1 and 2 are batch results with some or all items failed
+SUCCESS_CODES = frozenset(('0', '1', '2'))
+RETRY_CODES = frozenset(('50001', '50004', '50011', '50013', '50026', '50061'))
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Requests addressing existing orders by ID, sending them twice has the effect of sending them once
+IDEMPOTENT_POSTS = frozenset((c.CANCEL_ORDER, c.CANCEL_BATCH_ORDERS, c.AMEND_ORDER, c.AMEND_BATCH_ORDER,
+                              c.CANCEL_ALGOS, c.AMEND_ALGO_ORDER))
+# Placements deduplicated by the exchange on the client order ID field
+CLIENT_ID_POSTS = {
+    c.PLACR_ORDER: 'clOrdId',
+    c.BATCH_ORDERS: 'clOrdId',
+    c.PLACE_ALGO_ORDER: 'algoClOrdId',
+}
+
+# Transport errors raised before the request was sent
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=2.0, rate_limit_delay=0.5,
+                 retry_codes=RETRY_CODES, retry_statuses=RETRY_STATUSES, on_retry=None):
+        """
+        :param max_attempts: Attempts per request including the first one, 1 only raises typed exceptions
+        :param base_delay: Backoff cap of the first retry in seconds, doubled on every further retry
+        :param max_delay: Upper bound of the backoff cap
+        :param rate_limit_delay: Added to the backoff after a rate limit rejection, OKX limits are per 1-2s windows
+        :param retry_codes: OKX codes that are retried
+        :param retry_statuses: HTTP status codes that are retried
+        :param on_retry: Called as on_retry(method, request_path, attempt, error, delay) before sleeping
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limit_delay = rate_limit_delay
+        self.retry_codes = frozenset(retry_codes)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.on_retry = on_retry
+        self.retries = 0
+
+    def check(self, response, result):
+        """
+        Raise the typed OkxAPIException of a failed response.
+        :param response: httpx.Response
+        :param result: Decoded body, None to check the HTTP status only
+        """
+        if response.status_code >= 400:
+            raise api_exception(response)
+        if isinstance(result, dict) and str(result.get('code', '0')) not in SUCCESS_CODES:
+            raise api_exception(response, result)
+
+    @staticmethod
+    def is_idempotent(method, request_path, params):
+        """Whether the request may be sent again after it possibly reached the exchange."""
+        if method == c.GET or request_path in IDEMPOTENT_POSTS:
+            return True
+        field = CLIENT_ID_POSTS.get(request_path)
+        if field is None:
+            return False
+        items = params if isinstance(params, list) else [params]
+        return bool(items) and all(isinstance(item, dict) and item.get(field) for item in items)
+
+    def is_retryable(self, error, idempotent):
+        if isinstance(error, OkxAPIException):
+            if isinstance(error, OkxRateLimitException):
+                return True
+            return idempotent and (str(error.code) in self.retry_codes or error.status_code in self.retry_statuses)
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return idempotent and isinstance(error, httpx.TransportError)
+
+    def backoff(self, attempt, error):
+        """Seconds to wait before retry number ``attempt`` (1 based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if isinstance(error, OkxRateLimitException):
+            delay += self.rate_limit_delay
+        return delay
+
+    def _retry_delay(self, method, request_path, attempt, error, idempotent):
+        if attempt >= self.max_attempts or not self.is_retryable(error, idempotent):
+            return None
+        delay = self.backoff(attempt, error)
+        self.retries += 1
+        logger.debug(f'retry: {request_path} attempt {attempt} failed with {error!r}, retrying in {delay:.3f}s')
+        if self.on_retry is not None:
+            self.on_retry(method, request_path, attempt, error, delay)
+        return delay
+
+    def call(self, send, method, request_path, params):
+        """Call send(method, request_path, params) until it succeeds or fails for good."""
+        idempotent = self.is_idempotent(method, request_path, params)
+        attempt = 1
+        while True:
+            try:
+                return send(method, request_path, params)
+            except (OkxAPIException, httpx.TransportError) as e:
+                delay = self._retry_delay(method, request_path, attempt, e, idempotent)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, send, method, request_path, params):
+        """call for a coroutine function ``send``."""
+        idempotent = self.is_idempotent(method, request_path, params)
+        attempt = 1
+        while True:
+            try:
+                return await send(method, request_path, params)
+            except (OkxAPIException, httpx.TransportError) as e:
+                delay = self._retry_delay(method, request_path, attempt, e, idempotent)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
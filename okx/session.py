@@ -0,0 +1,260 @@
+"""
+Process-wide connection hub for the REST API classes.
+
+Every API class is its own httpx client, so instantiating TradeAPI, MarketAPI, AccountAPI, ...
+separately opens one TLS/HTTP2 connection pool per object. OkxSession owns a single pooled
+transport and hands out API facades bound to it, so connection setup is paid once per process.
+
+Usage:
+    session = OkxSession(api_key, api_secret_key, passphrase, flag='0', max_connections=50)
+    session.trade.place_order(...)
+    session.market.get_ticker('BTC-USDT')
+    session.close()
+"""
+import threading
+
+import httpx
+
+from . import consts as c
+from .Account import AccountAPI, AsyncAccountAPI
+from .BlockTrading import BlockTradingAPI, AsyncBlockTradingAPI
+from .Convert import ConvertAPI, AsyncConvertAPI
+from .CopyTrading import CopyTradingAPI, AsyncCopyTradingAPI
+from .FDBroker import FDBrokerAPI, AsyncFDBrokerAPI
+from .Funding import FundingAPI, AsyncFundingAPI
+from .Grid import GridAPI, AsyncGridAPI
+from .MarketData import MarketAPI, AsyncMarketAPI
+from .PublicData import PublicAPI, AsyncPublicAPI
+from .SpreadTrading import SpreadTradingAPI, AsyncSpreadTradingAPI
+from .Status import StatusAPI, AsyncStatusAPI
+from .SubAccount import SubAccountAPI, AsyncSubAccountAPI
+from .Trade import TradeAPI, AsyncTradeAPI
+from .TradingData import TradingDataAPI, AsyncTradingDataAPI
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Delegates to the session transport; closing a facade must not close the shared pool."""
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request):
+        return self._transport.handle_request(request)
+
+    def close(self):
+        pass
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    async def handle_async_request(self, request):
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class _BaseSession:
+
+    def __init__(self, api_key='-1', api_secret_key='-1', passphrase='-1', flag='1', domain=c.API_URL,
+                 debug=False, proxy=None, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY, http2=True, **client_kwargs):
+        """
+        :param max_connections: Maximum number of concurrent connections in the pool
+        :param max_keepalive_connections: Maximum number of idle connections kept alive
+        :param keepalive_expiry: Seconds an idle connection is kept before being closed
+        :param http2: Negotiate HTTP/2 on the pooled connections
+        :param client_kwargs: Extra keyword arguments passed to every API facade
+        """
+        self.api_key = api_key
+        self.api_secret_key = api_secret_key
+        self.passphrase = passphrase
+        self.flag = flag
+        self.domain = domain
+        self.debug = debug
+        self.client_kwargs = client_kwargs
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections,
+                                   keepalive_expiry=keepalive_expiry)
+        transport_kwargs = {'http2': http2, 'limits': self.limits}
+        if proxy:
+            # Transports take a proxy URL string only from httpx 0.26, a Proxy from 0.24 on
+            transport_kwargs['proxy'] = httpx.Proxy(proxy) if isinstance(proxy, str) else proxy
+        self.transport = self._create_transport(**transport_kwargs)
+        self._apis = {}
+        self._apis_lock = threading.Lock()
+
+    def api(self, api_class):
+        """
+        Return the facade of ``api_class`` bound to the shared connection pool, created once per session.
+        :param api_class: API class, e.g. TradeAPI
+        """
+        facade = self._apis.get(api_class)
+        if facade is None:
+            # Sessions are shared between threads, e.g. the request threads of a web server
+            with self._apis_lock:
+                facade = self._apis.get(api_class)
+                if facade is None:
+                    facade = api_class(self.api_key, self.api_secret_key, self.passphrase, flag=self.flag,
+                                       domain=self.domain, debug=self.debug,
+                                       transport=self._share(self.transport), **self.client_kwargs)
+                    self._apis[api_class] = facade
+        return facade
+
+
+class OkxSession(_BaseSession):
+    """Sync session, facades are the blocking API classes."""
+
+    _create_transport = staticmethod(httpx.HTTPTransport)
+    _share = staticmethod(_SharedTransport)
+
+    @property
+    def account(self):
+        return self.api(AccountAPI)
+
+    @property
+    def block_trading(self):
+        return self.api(BlockTradingAPI)
+
+    @property
+    def convert(self):
+        return self.api(ConvertAPI)
+
+    @property
+    def copy_trading(self):
+        return self.api(CopyTradingAPI)
+
+    @property
+    def fd_broker(self):
+        return self.api(FDBrokerAPI)
+
+    @property
+    def funding(self):
+        return self.api(FundingAPI)
+
+    @property
+    def grid(self):
+        return self.api(GridAPI)
+
+    @property
+    def market(self):
+        return self.api(MarketAPI)
+
+    @property
+    def public(self):
+        return self.api(PublicAPI)
+
+    @property
+    def spread_trading(self):
+        return self.api(SpreadTradingAPI)
+
+    @property
+    def status(self):
+        return self.api(StatusAPI)
+
+    @property
+    def sub_account(self):
+        return self.api(SubAccountAPI)
+
+    @property
+    def trade(self):
+        return self.api(TradeAPI)
+
+    @property
+    def trading_data(self):
+        return self.api(TradingDataAPI)
+
+    def close(self):
+        for facade in self._apis.values():
+            facade.close()
+        self._apis.clear()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncOkxSession(_BaseSession):
+    """asyncio session, facades are the Async* API classes."""
+
+    _create_transport = staticmethod(httpx.AsyncHTTPTransport)
+    _share = staticmethod(_SharedAsyncTransport)
+
+    @property
+    def account(self):
+        return self.api(AsyncAccountAPI)
+
+    @property
+    def block_trading(self):
+        return self.api(AsyncBlockTradingAPI)
+
+    @property
+    def convert(self):
+        return self.api(AsyncConvertAPI)
+
+    @property
+    def copy_trading(self):
+        return self.api(AsyncCopyTradingAPI)
+
+    @property
+    def fd_broker(self):
+        return self.api(AsyncFDBrokerAPI)
+
+    @property
+    def funding(self):
+        return self.api(AsyncFundingAPI)
+
+    @property
+    def grid(self):
+        return self.api(AsyncGridAPI)
+
+    @property
+    def market(self):
+        return self.api(AsyncMarketAPI)
+
+    @property
+    def public(self):
+        return self.api(AsyncPublicAPI)
+
+    @property
+    def spread_trading(self):
+        return self.api(AsyncSpreadTradingAPI)
+
+    @property
+    def status(self):
+        return self.api(AsyncStatusAPI)
+
+    @property
+    def sub_account(self):
+        return self.api(AsyncSubAccountAPI)
+
+    @property
+    def trade(self):
+        return self.api(AsyncTradeAPI)
+
+    @property
+    def trading_data(self):
+        return self.api(AsyncTradingDataAPI)
+
+    async def aclose(self):
+        for facade in self._apis.values():
+            await facade.aclose()
+        self._apis.clear()
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
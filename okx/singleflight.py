@@ -0,0 +1,75 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+While a request is in flight, identical requests from other threads or coroutines wait for it
+and receive the same response object instead of issuing their own round-trip. Nothing is cached:
+once the leading request completes, the next identical request goes to the network again.
+
+Enabled per client with ``single_flight=True`` (or a shared SingleFlight instance); only GET
+requests are coalesced. Coalesced callers share the decoded response, treat it as read-only.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.coalesced = 0
+
+    def do(self, key, fn, *args):
+        """
+        Call ``fn(*args)``, or wait for the in-flight call with the same key and return its result.
+        Exceptions of the leading call are raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key, fn, *args):
+        """
+        asyncio variant of do, ``fn(*args)`` returns a coroutine. The call runs as a task, so a
+        cancelled caller does not cancel the request shared with the other callers.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        """Number of distinct requests currently in flight."""
+        return len(self._calls) + len(self._tasks)
@@ -1,6 +1,7 @@
 import hmac
 import base64
-import datetime
+import hashlib
+import time
 
 from loguru import logger
 
@@ -48,10 +49,59 @@ def parse_params_to_str(params):
     return url
 
 
+# (epoch second, formatted second) of the last timestamp, replaced as a whole so threads never mix the two
+_timestamp_second = (None, '')
+
+
 def get_timestamp():
-    now = datetime.datetime.utcnow()
-    t = now.isoformat("T", "milliseconds")
-    return t + "Z"
+    global _timestamp_second
+    second, millis = divmod(int(time.time() * 1000), 1000)
+    cached = _timestamp_second
+    if cached[0] != second:
+        cached = _timestamp_second = (second, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second)))
+    return '%s.%03dZ' % (cached[1], millis)
+
+
+_HMAC_IPAD = bytes(x ^ 0x36 for x in range(256))
+_HMAC_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+class RequestSigner:
+    """
+    Per-client signing state: the HMAC key is absorbed once and the hash states are copied for
+    every request, and the static authentication headers are kept as a template that only gets
+    the timestamp and signature patched in.
+    """
+
+    __slots__ = ('_inner', '_outer', '_header')
+
+    def __init__(self, api_key, secret_key, passphrase, flag):
+        # HMAC-SHA256 (RFC 2104) with the padded key already absorbed into the inner and outer hashes
+        key = bytes(secret_key, encoding='utf8')
+        if len(key) > 64:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(64, b'\0')
+        self._inner = hashlib.sha256(key.translate(_HMAC_IPAD))
+        self._outer = hashlib.sha256(key.translate(_HMAC_OPAD))
+        self._header = {
+            c.CONTENT_TYPE: c.APPLICATION_JSON,
+            c.OK_ACCESS_KEY: api_key,
+            c.OK_ACCESS_PASSPHRASE: passphrase,
+            'x-simulated-trading': flag,
+        }
+
+    def sign(self, message):
+        inner = self._inner.copy()
+        inner.update(message.encode('utf-8'))
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return base64.b64encode(outer.digest())
+
+    def get_header(self, timestamp, method, request_path, body):
+        header = self._header.copy()
+        header[c.OK_ACCESS_SIGN] = self.sign(timestamp + method + request_path + body)
+        header[c.OK_ACCESS_TIMESTAMP] = timestamp
+        return header
 
 
 def signature(timestamp, method, request_path, body, secret_key):
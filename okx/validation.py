@@ -0,0 +1,373 @@
+"""
+Pre-trade validation of order prices and sizes against cached instrument specs.
+
+OrderValidator checks orders against the tick size, lot size, minimum and maximum size of
+get_instruments and the price band of get_price_limit before anything is sent. In 'round' mode
+prices are rounded to the tick (buys down, sells up, so an order never becomes more aggressive)
+and sizes down to the lot; in 'reject' mode values off the grid are rejected. Sizes below the
+minimum and prices outside the band always raise OkxParamsException.
+
+Instrument specs are cached for ``spec_ttl`` seconds and price bands for ``price_limit_ttl``.
+They are fetched on demand with ``public_api``. Asyncio clients validate with avalidate_request,
+which awaits the fetches of an AsyncPublicAPI and runs those of a sync PublicAPI in the default
+executor, so the event loop never blocks on them. Specs can also be preloaded with
+``await validator.aload(AsyncPublicAPI(), 'SWAP')`` and ``await validator.aload_price_limit(...)``.
+
+The items of BATCH_ORDERS and AMEND_BATCH_ORDER requests are checked one by one: clients send
+the valid items and report each rejected one with its own sCode and sMsg in the batch response.
+
+Usage:
+    validator = OrderValidator(PublicAPI(flag='0'))
+    validator.load('SWAP')
+    trade = TradeAPI(api_key, api_secret_key, passphrase, flag='0', order_validator=validator)
+    trade.place_order('BTC-USDT-SWAP', 'cross', 'buy', 'limit', '1.04', px='65000.123')  # px=65000.1, sz=1
+"""
+import asyncio
+import functools
+import threading
+import time
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, InvalidOperation
+
+from . import consts as c
+from .exceptions import OkxParamsException
+from .okxclient import AsyncOkxClient
+
+MODE_ROUND = 'round'
+MODE_REJECT = 'reject'
+
+DEFAULT_SPEC_TTL = 3600
+DEFAULT_PRICE_LIMIT_TTL = 5
+
+# Algo order and amend price fields, rounded to the nearest tick; -1 means market price
+_ALGO_PRICE_FIELDS = ('tpTriggerPx', 'tpOrdPx', 'slTriggerPx', 'slOrdPx', 'triggerPx', 'orderPx')
+_AMEND_PRICE_FIELDS = ('newTpTriggerPx', 'newTpOrdPx', 'newSlTriggerPx', 'newSlOrdPx', 'newTriggerPx', 'newOrdPx')
+# Request path: validate_<name> method checking the request, or each item of a batch
+BATCH_PATHS = {c.BATCH_ORDERS: 'order', c.AMEND_BATCH_ORDER: 'amend'}
+_REQUEST_VALIDATORS = dict(BATCH_PATHS, **{c.PLACR_ORDER: 'order', c.AMEND_ORDER: 'amend',
+                                           c.PLACE_ALGO_ORDER: 'algo_order'})
+
+
+def _decimal(value, name):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        raise OkxParamsException('%s is not a number: %r' % (name, value))
+
+
+def inst_type_of(instId):
+    """Best guess of the instrument type from the ID format, margin pairs are reported as SPOT."""
+    parts = instId.split('-')
+    if parts[-1] == 'SWAP':
+        return 'SWAP'
+    if len(parts) == 5 and parts[-1] in ('C', 'P'):
+        return 'OPTION'
+    if len(parts) == 3 and parts[-1].isdigit():
+        return 'FUTURES'
+    return 'SPOT'
+
+
+class InstrumentSpec:
+
+    __slots__ = ('instId', 'instType', 'tickSz', 'lotSz', 'minSz', 'maxLmtSz', 'maxMktSz')
+
+    def __init__(self, instrument):
+        """:param instrument: Item of the get_instruments response"""
+        self.instId = instrument['instId']
+        self.instType = instrument.get('instType', '')
+        for name in ('tickSz', 'lotSz', 'minSz', 'maxLmtSz', 'maxMktSz'):
+            value = instrument.get(name)
+            setattr(self, name, Decimal(value) if value else None)
+
+
+class OrderValidator:
+
+    def __init__(self, public_api=None, mode=MODE_ROUND, spec_ttl=DEFAULT_SPEC_TTL,
+                 price_limit_ttl=DEFAULT_PRICE_LIMIT_TTL, check_price_limit=True):
+        """
+        :param public_api: PublicAPI fetching instrument specs and price limits on demand
+        :param mode: 'round' to round px/sz onto the grid, 'reject' to raise for values off the grid
+        :param check_price_limit: Reject prices outside the get_price_limit band
+        """
+        if mode not in (MODE_ROUND, MODE_REJECT):
+            raise ValueError("mode must be 'round' or 'reject', got %r" % (mode,))
+        self.public_api = public_api
+        self.mode = mode
+        self.spec_ttl = spec_ttl
+        self.price_limit_ttl = price_limit_ttl
+        self.check_price_limit = check_price_limit
+        # instId: (expires at, InstrumentSpec) / (expires at, buyLmt, sellLmt)
+        self._specs = {}
+        self._price_limits = {}
+        self._lock = threading.Lock()
+
+    # Cache
+
+    def _store_specs(self, response):
+        if response.get('code') != '0':
+            raise OkxParamsException('instrument specs unavailable, code=%s: %s' % (response.get('code'),
+                                                                                    response.get('msg')))
+        expires = time.monotonic() + self.spec_ttl
+        with self._lock:
+            for instrument in response.get('data') or ():
+                self._specs[instrument['instId']] = (expires, InstrumentSpec(instrument))
+
+    def _store_price_limit(self, instId, response):
+        if response.get('code') != '0' or not response.get('data'):
+            return
+        item = response['data'][0]
+        if item.get('enabled') is False or not item.get('buyLmt'):
+            return
+        with self._lock:
+            self._price_limits[instId] = (time.monotonic() + self.price_limit_ttl,
+                                          Decimal(item['buyLmt']), Decimal(item['sellLmt']))
+
+    def load(self, instType, **params):
+        """Cache the specs of every instrument of a type, params are passed to get_instruments (uly, instFamily...)."""
+        self._store_specs(self.public_api.get_instruments(instType, **params))
+
+    async def aload(self, public_api, instType, **params):
+        """load with an AsyncPublicAPI."""
+        self._store_specs(await public_api.get_instruments(instType, **params))
+
+    async def aload_price_limit(self, public_api, instId):
+        self._store_price_limit(instId, await public_api.get_price_limit(instId))
+
+    def invalidate(self, instId=None):
+        with self._lock:
+            if instId is None:
+                self._specs.clear()
+                self._price_limits.clear()
+            else:
+                self._specs.pop(instId, None)
+                self._price_limits.pop(instId, None)
+
+    def _must_fetch(self, entry):
+        return self.public_api is not None and (entry is None or entry[0] <= time.monotonic())
+
+    @staticmethod
+    def _instruments_params(instId):
+        instType = inst_type_of(instId)
+        if instType == 'OPTION':
+            return instType, {'instFamily': '-'.join(instId.split('-')[:2])}
+        return instType, {'instId': instId}
+
+    async def _fetch(self, method, *args, **kwargs):
+        """Call a public_api method from the event loop, a sync PublicAPI runs in the default executor."""
+        if isinstance(self.public_api, AsyncOkxClient):
+            return await method(*args, **kwargs)
+        return await asyncio.get_event_loop().run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    def spec(self, instId):
+        """Cached InstrumentSpec, fetched with public_api when missing or expired, None when unavailable."""
+        entry = self._specs.get(instId)
+        if self._must_fetch(entry):
+            instType, params = self._instruments_params(instId)
+            self._store_specs(self.public_api.get_instruments(instType, **params))
+            entry = self._specs.get(instId)
+        return entry[1] if entry is not None else None
+
+    async def aspec(self, instId):
+        """spec awaiting the fetch."""
+        entry = self._specs.get(instId)
+        if self._must_fetch(entry):
+            instType, params = self._instruments_params(instId)
+            self._store_specs(await self._fetch(self.public_api.get_instruments, instType, **params))
+            entry = self._specs.get(instId)
+        return entry[1] if entry is not None else None
+
+    def price_limit(self, instId):
+        """Cached (buyLmt, sellLmt), None when the instrument has no price limit or it is unavailable."""
+        entry = self._price_limits.get(instId)
+        if self._must_fetch(entry):
+            self._store_price_limit(instId, self.public_api.get_price_limit(instId))
+            entry = self._price_limits.get(instId)
+        return (entry[1], entry[2]) if entry is not None else None
+
+    async def aprice_limit(self, instId):
+        """price_limit awaiting the fetch."""
+        entry = self._price_limits.get(instId)
+        if self._must_fetch(entry):
+            self._store_price_limit(instId, await self._fetch(self.public_api.get_price_limit, instId))
+            entry = self._price_limits.get(instId)
+        return (entry[1], entry[2]) if entry is not None else None
+
+    # Checks
+
+    def _to_grid(self, value, step, rounding, name, instId):
+        if step is None:
+            return value
+        rounded = (value / step).to_integral_value(rounding=rounding) * step
+        if rounded != value and self.mode == MODE_REJECT:
+            raise OkxParamsException('%s %s of %s is not a multiple of %s' % (name, value, instId, step))
+        return rounded
+
+    def _price(self, order, field, spec, rounding):
+        value = order.get(field)
+        if value in (None, '', '-1'):
+            return
+        rounded = self._to_grid(_decimal(value, field), spec.tickSz, rounding, field, spec.instId)
+        if rounded <= 0:
+            raise OkxParamsException('%s of %s rounds to %s' % (field, spec.instId, rounded))
+        order[field] = format(rounded, 'f')
+
+    def _size(self, order, field, spec, max_size):
+        value = order.get(field)
+        if value in (None, ''):
+            return
+        rounded = self._to_grid(_decimal(value, field), spec.lotSz, ROUND_FLOOR, field, spec.instId)
+        if spec.minSz is not None and rounded < spec.minSz:
+            raise OkxParamsException('%s %s of %s is below the minimum size %s' % (field, value, spec.instId,
+                                                                                   spec.minSz))
+        if max_size is not None and rounded > max_size:
+            raise OkxParamsException('%s %s of %s is above the maximum size %s' % (field, value, spec.instId,
+                                                                                   max_size))
+        order[field] = format(rounded, 'f')
+
+    def _band_checked(self, order, field):
+        return self.check_price_limit and order.get(field) not in (None, '', '-1') and \
+            order.get('side') in ('buy', 'sell')
+
+    def _check_band(self, order, field, limits):
+        if limits is None:
+            return
+        buyLmt, sellLmt = limits
+        side = order['side']
+        px = Decimal(order[field])
+        if side == 'buy' and px > buyLmt:
+            raise OkxParamsException('%s %s of %s is above the buy limit %s' % (field, px, order['instId'], buyLmt))
+        if side == 'sell' and px < sellLmt:
+            raise OkxParamsException('%s %s of %s is below the sell limit %s' % (field, px, order['instId'], sellLmt))
+
+    def _order_on_grid(self, order, spec):
+        order = dict(order)
+        side = order.get('side')
+        ordType = order.get('ordType')
+        if ordType != 'market':
+            self._price(order, 'px', spec, ROUND_FLOOR if side == 'buy' else ROUND_CEILING)
+        # Spot market order sizes can be quote currency amounts, which are not on the lot grid
+        if not (ordType == 'market' and spec.instType in ('SPOT', 'MARGIN')):
+            self._size(order, 'sz', spec, spec.maxMktSz if ordType == 'market' else spec.maxLmtSz)
+        return order
+
+    def _amend_on_grid(self, amend, spec):
+        amend = dict(amend)
+        for field in ('newPx',) + _AMEND_PRICE_FIELDS:
+            self._price(amend, field, spec, ROUND_HALF_UP)
+        self._size(amend, 'newSz', spec, spec.maxLmtSz)
+        return amend
+
+    def _algo_order_on_grid(self, order, spec):
+        order = dict(order)
+        for field in _ALGO_PRICE_FIELDS:
+            self._price(order, field, spec, ROUND_HALF_UP)
+        self._size(order, 'sz', spec, None)
+        return order
+
+    def validate_order(self, order):
+        """
+        Normalise a place_order / batch order item.
+        :return: Copy of the order with px and sz on the instrument grid
+        :raises OkxParamsException: The order can not be accepted by the exchange
+        """
+        spec = self.spec(order.get('instId', ''))
+        if spec is None:
+            return order
+        order = self._order_on_grid(order, spec)
+        if self._band_checked(order, 'px'):
+            self._check_band(order, 'px', self.price_limit(order['instId']))
+        return order
+
+    async def avalidate_order(self, order):
+        """validate_order awaiting the fetches of specs and price limits."""
+        spec = await self.aspec(order.get('instId', ''))
+        if spec is None:
+            return order
+        order = self._order_on_grid(order, spec)
+        if self._band_checked(order, 'px'):
+            self._check_band(order, 'px', await self.aprice_limit(order['instId']))
+        return order
+
+    def validate_amend(self, amend):
+        """Normalise an amend_order / batch amend item, prices are rounded to the nearest tick."""
+        spec = self.spec(amend.get('instId', ''))
+        return amend if spec is None else self._amend_on_grid(amend, spec)
+
+    async def avalidate_amend(self, amend):
+        spec = await self.aspec(amend.get('instId', ''))
+        return amend if spec is None else self._amend_on_grid(amend, spec)
+
+    def validate_algo_order(self, order):
+        """Normalise a place_algo_order request, prices are rounded to the nearest tick."""
+        spec = self.spec(order.get('instId', ''))
+        if spec is None:
+            return order
+        order = self._algo_order_on_grid(order, spec)
+        if self._band_checked(order, 'orderPx'):
+            self._check_band(order, 'orderPx', self.price_limit(order['instId']))
+        return order
+
+    async def avalidate_algo_order(self, order):
+        spec = await self.aspec(order.get('instId', ''))
+        if spec is None:
+            return order
+        order = self._algo_order_on_grid(order, spec)
+        if self._band_checked(order, 'orderPx'):
+            self._check_band(order, 'orderPx', await self.aprice_limit(order['instId']))
+        return order
+
+    def validate_request(self, method, request_path, params):
+        """
+        Validate the params of a REST request, requests other than order placement and amendment pass through.
+        The items of a batch raise on the first rejected one, see validate_batch to check them one by one.
+        """
+        name = _REQUEST_VALIDATORS.get(request_path) if method == c.POST else None
+        if name is None:
+            return params
+        validate = getattr(self, 'validate_' + name)
+        if request_path in BATCH_PATHS:
+            return [validate(item) for item in params]
+        return validate(params)
+
+    async def avalidate_request(self, method, request_path, params):
+        """validate_request for asyncio clients, fetches are awaited."""
+        name = _REQUEST_VALIDATORS.get(request_path) if method == c.POST else None
+        if name is None:
+            return params
+        validate = getattr(self, 'avalidate_' + name)
+        if request_path in BATCH_PATHS:
+            return [await validate(item) for item in params]
+        return await validate(params)
+
+    def validate_batch(self, method, request_path, params):
+        """
+        Validate the items of a BATCH_ORDERS or AMEND_BATCH_ORDER request one by one.
+        :return: (items, {index: OkxParamsException}), the accepted items normalised and the rejected ones
+                 as given; None for other requests
+        """
+        name = BATCH_PATHS.get(request_path) if method == c.POST else None
+        if name is None:
+            return None
+        validate = getattr(self, 'validate_' + name)
+        items, rejected = [], {}
+        for index, item in enumerate(params):
+            try:
+                items.append(validate(item))
+            except OkxParamsException as e:
+                items.append(item)
+                rejected[index] = e
+        return items, rejected
+
+    async def avalidate_batch(self, method, request_path, params):
+        """validate_batch for asyncio clients, fetches are awaited."""
+        name = BATCH_PATHS.get(request_path) if method == c.POST else None
+        if name is None:
+            return None
+        validate = getattr(self, 'avalidate_' + name)
+        items, rejected = [], {}
+        for index, item in enumerate(params):
+            try:
+                items.append(await validate(item))
+            except OkxParamsException as e:
+                items.append(item)
+                rejected[index] = e
+        return items, rejected
@@ -0,0 +1,126 @@
+"""
+Bounded queue between the reader of a WebSocket connection and the tasks running its callbacks.
+
+Without a queue, callbacks run inside the receive loop: a slow callback stops the connection from
+being read, the server's send buffer fills up and the server eventually drops the connection.
+With a queue the reader only enqueues, and when the callbacks fall behind the overflow policy
+decides what happens:
+
+    block         the reader waits for space, pushing back on the socket (no message is lost)
+    drop_oldest   the oldest queued message is discarded
+    conflate      a push of a full-state channel (CONFLATED_CHANNELS, e.g. tickers, books5 or
+                  bbo-tbt) replaces the queued push of the same subscription, so a slow consumer
+                  always gets the latest state. Other channels such as trades, candles, orders or
+                  fills, incremental updates (action "update") and events are never conflated;
+                  when the queue is still full the oldest message is discarded.
+"""
+import asyncio
+import time
+from collections import deque
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_CONFLATE = 'conflate'
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_CONFLATE)
+# Channels whose every push carries the complete current state, so only the latest one matters
+CONFLATED_CHANNELS = frozenset((
+    'tickers', 'index-tickers', 'mark-price', 'books5', 'bbo-tbt', 'funding-rate', 'open-interest',
+    'price-limit', 'estimated-price', 'opt-summary',
+))
+
+
+class DispatchQueue:
+
+    def __init__(self, maxsize, overflow=OVERFLOW_BLOCK):
+        """
+        :param maxsize: Number of queued messages above which the overflow policy applies
+        :param overflow: 'block', 'drop_oldest' or 'conflate'
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("overflow must be one of %s" % ', '.join(OVERFLOW_POLICIES))
+        self.maxsize = maxsize
+        self.overflow = overflow
+        # [message, decoded, enqueued at, conflation key or None]
+        self.items = deque()
+        # conflation key: queued slot
+        self.latest = {}
+        self.highWater = 0
+        self.dropped = 0
+        self.conflated = 0
+        # Seconds the last dequeued message waited, and the longest wait seen
+        self.lag = 0.0
+        self.maxLag = 0.0
+        self._notEmpty = asyncio.Event()
+        self._space = asyncio.Event()
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, message, decoded=None, key=None, conflate=False):
+        """
+        Enqueue a message without waiting, see mustWait for the block policy
+        :param key: Subscription of a push, subscriptionKey(arg)
+        :param conflate: The push carries a full state and may replace the queued push of ``key``
+        """
+        if key is not None and self.overflow == OVERFLOW_CONFLATE:
+            if conflate:
+                slot = self.latest.get(key)
+                if slot is not None:
+                    slot[0] = message
+                    slot[1] = decoded
+                    self.conflated += 1
+                    return
+            else:
+                # A later full push must not overtake this update
+                self.latest.pop(key, None)
+        else:
+            conflate = False
+        items = self.items
+        if len(items) >= self.maxsize and self.overflow != OVERFLOW_BLOCK:
+            oldest = items.popleft()
+            if oldest[3] is not None and self.latest.get(oldest[3]) is oldest:
+                del self.latest[oldest[3]]
+            self.dropped += 1
+        slot = [message, decoded, time.monotonic(), key if conflate else None]
+        items.append(slot)
+        if conflate:
+            self.latest[key] = slot
+        if len(items) > self.highWater:
+            self.highWater = len(items)
+        self._notEmpty.set()
+
+    def mustWait(self):
+        """True when the block policy requires the reader to wait for space before reading on"""
+        return self.overflow == OVERFLOW_BLOCK and len(self.items) >= self.maxsize
+
+    async def waitForSpace(self):
+        while self.mustWait():
+            self._space.clear()
+            await self._space.wait()
+
+    async def get(self):
+        """:return: (message, decoded) of the oldest queued message"""
+        while not self.items:
+            self._notEmpty.clear()
+            await self._notEmpty.wait()
+        slot = self.items.popleft()
+        if slot[3] is not None and self.latest.get(slot[3]) is slot:
+            del self.latest[slot[3]]
+        self.lag = time.monotonic() - slot[2]
+        if self.lag > self.maxLag:
+            self.maxLag = self.lag
+        if len(self.items) < self.maxsize:
+            self._space.set()
+        return slot[0], slot[1]
+
+    def stats(self):
+        return {
+            "depth": len(self.items),
+            "highWater": self.highWater,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "lag": self.lag,
+            "maxLag": self.maxLag,
+        }
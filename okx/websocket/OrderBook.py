@@ -0,0 +1,303 @@
+"""
+Local L2 order books maintained from the books channels of WsPublicAsync.
+
+OrderBook merges a snapshot and its incremental updates into two sorted arrays of price levels.
+Every update must continue the sequence (its prevSeqId is the last seqId), and when the push
+carries a checksum the CRC32 of the top 25 levels, computed on the original price and size
+strings, must match it. OrderBooks subscribes the channels and resubscribes an instrument, which
+makes the server send a fresh snapshot, whenever one of these checks fails or the connection had
+a gap.
+
+books and books-l2-tbt / books50-l2-tbt send a snapshot followed by updates; books5 and bbo-tbt
+pushes are complete snapshots.
+
+Usage:
+    books = OrderBooks(ws)
+    await books.subscribe(['BTC-USDT', 'ETH-USDT'], channel='books')
+    book = books.book('BTC-USDT')
+    if book.ready:
+        book.bestBid(), book.bestAsk(), book.vwap('buy', 2.5)
+"""
+import asyncio
+import logging
+import zlib
+from bisect import bisect_left
+
+from okx.exceptions import OkxOrderBookException
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_LEVELS = 25
+ACTION_SNAPSHOT = 'snapshot'
+ACTION_UPDATE = 'update'
+
+
+class BookSide:
+    """
+    Price levels of one side, kept as an ascending array of sort keys (prices, negated for bids so
+    that the best level comes first), a parallel array of the "px:sz" checksum fragments and a map
+    of key to (px, sz, price, size) where px and sz are the strings sent by the server.
+    """
+
+    __slots__ = ('descending', 'keys', 'pairs', 'levels')
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.keys = []
+        self.pairs = []
+        self.levels = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self, levels):
+        self.levels = {}
+        for level in levels:
+            size = float(level[1])
+            if size:
+                price = float(level[0])
+                self.levels[-price if self.descending else price] = (level[0], level[1], price, size)
+        self.keys = sorted(self.levels)
+        self.pairs = [level[0] + ':' + level[1] for level in map(self.levels.__getitem__, self.keys)]
+
+    def update(self, level):
+        price = float(level[0])
+        key = -price if self.descending else price
+        size = float(level[1])
+        keys = self.keys
+        if not size:
+            if self.levels.pop(key, None) is not None:
+                index = bisect_left(keys, key)
+                del keys[index]
+                del self.pairs[index]
+            return
+        # Most updates touch the top of the book, inserting there is a short memmove
+        index = bisect_left(keys, key)
+        if key in self.levels:
+            self.pairs[index] = level[0] + ':' + level[1]
+        else:
+            keys.insert(index, key)
+            self.pairs.insert(index, level[0] + ':' + level[1])
+        self.levels[key] = (level[0], level[1], price, size)
+
+    def best(self):
+        return self.levels[self.keys[0]] if self.keys else None
+
+    def top(self, count):
+        return list(map(self.levels.__getitem__, self.keys[:count]))
+
+    def sizeAt(self, price):
+        level = self.levels.get(-price if self.descending else price)
+        return level[3] if level is not None else 0.0
+
+
+def checksumOfPairs(bids, asks):
+    """checksum of "px:sz" fragments"""
+    common = min(len(bids), len(asks))
+    parts = [None] * (2 * common)
+    parts[::2] = bids[:common]
+    parts[1::2] = asks[:common]
+    parts += bids[common:] or asks[common:]
+    value = zlib.crc32(':'.join(parts).encode())
+    return value - (1 << 32) if value >= 1 << 31 else value
+
+
+def checksum(bids, asks):
+    """
+    Signed CRC32 of the top levels as defined by OKX: bid and ask px:sz pairs interleaved level by
+    level, the remaining levels of the deeper side appended.
+    :param bids: (px, sz, ...) tuples, best first
+    :param asks: (px, sz, ...) tuples, best first
+    """
+    return checksumOfPairs([level[0] + ':' + level[1] for level in bids],
+                           [level[0] + ':' + level[1] for level in asks])
+
+
+class OrderBook:
+
+    def __init__(self, instId, verifyChecksum=True):
+        """
+        :param instId: Instrument ID
+        :param verifyChecksum: Check the checksum of every push that has one
+        """
+        self.instId = instId
+        self.verifyChecksum = verifyChecksum
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.seqId = None
+        self.ts = None
+        self.ready = False
+
+    def apply(self, item, action=ACTION_SNAPSHOT):
+        """
+        Apply one data item of a books push.
+        :param item: {"asks": [[px, sz, ...], ...], "bids": [...], "seqId": ..., "prevSeqId": ..., "checksum": ...}
+        :param action: 'snapshot' or 'update'
+        :raises OkxOrderBookException: Update out of sequence or checksum mismatch, the book is no longer ready
+        """
+        if action == ACTION_UPDATE:
+            if not self.ready:
+                raise OkxOrderBookException('%s: update without a snapshot' % self.instId)
+            prevSeqId = item.get('prevSeqId')
+            if prevSeqId is not None and self.seqId is not None and int(prevSeqId) != self.seqId:
+                self.ready = False
+                raise OkxOrderBookException('%s: sequence gap, prevSeqId %s after seqId %s'
+                                            % (self.instId, prevSeqId, self.seqId))
+            update = self.bids.update
+            for level in item.get('bids') or ():
+                update(level)
+            update = self.asks.update
+            for level in item.get('asks') or ():
+                update(level)
+        else:
+            self.bids.load(item.get('bids') or ())
+            self.asks.load(item.get('asks') or ())
+        seqId = item.get('seqId')
+        self.seqId = int(seqId) if seqId is not None else None
+        self.ts = item.get('ts')
+        expected = item.get('checksum')
+        if self.verifyChecksum and expected is not None and self.checksum() != int(expected):
+            self.ready = False
+            raise OkxOrderBookException('%s: checksum mismatch at seqId %s' % (self.instId, seqId))
+        self.ready = True
+
+    def reset(self):
+        self.bids.load(())
+        self.asks.load(())
+        self.seqId = None
+        self.ready = False
+
+    def checksum(self):
+        return checksumOfPairs(self.bids.pairs[:CHECKSUM_LEVELS], self.asks.pairs[:CHECKSUM_LEVELS])
+
+    def bestBid(self):
+        """(price, size) of the best bid, None if the side is empty"""
+        level = self.bids.best()
+        return (level[2], level[3]) if level is not None else None
+
+    def bestAsk(self):
+        level = self.asks.best()
+        return (level[2], level[3]) if level is not None else None
+
+    def spread(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        return ask[2] - bid[2] if bid is not None and ask is not None else None
+
+    def depth(self, side, levels=None):
+        """
+        Top levels of a side as [(price, size)], best first
+        :param side: 'bids' or 'asks'
+        :param levels: Number of levels, all when None
+        """
+        bookSide = self.bids if side == 'bids' else self.asks
+        return [(level[2], level[3]) for level in bookSide.top(levels if levels is not None else len(bookSide))]
+
+    def sizeAt(self, side, price):
+        """Size resting at ``price`` on 'bids' or 'asks', 0.0 when there is no level"""
+        return (self.bids if side == 'bids' else self.asks).sizeAt(float(price))
+
+    def vwap(self, side, size):
+        """
+        Average price of filling ``size`` against the book
+        :param side: 'buy' walks the asks, 'sell' the bids
+        :return: Volume weighted price, None if the book is not deep enough
+        """
+        bookSide = self.asks if side == 'buy' else self.bids
+        remaining = float(size)
+        notional = 0.0
+        levels = bookSide.levels
+        for key in bookSide.keys:
+            level = levels[key]
+            take = level[3] if level[3] < remaining else remaining
+            notional += take * level[2]
+            remaining -= take
+            if remaining <= 0:
+                return notional / float(size)
+        return None
+
+
+class OrderBooks:
+    """OrderBook per instrument of one books channel, fed and resynchronised through a WsPublicAsync"""
+
+    def __init__(self, ws, verifyChecksum=True, onUpdate=None):
+        """
+        :param ws: WsPublicAsync, started before subscribe is called
+        :param verifyChecksum: Check the checksum of every push that has one
+        :param onUpdate: Called with the OrderBook after every applied push
+        """
+        self.ws = ws
+        self.verifyChecksum = verifyChecksum
+        self.onUpdate = onUpdate
+        # (channel, instId): OrderBook
+        self.books = {}
+        self.resyncs = 0
+        self._resyncing = set()
+
+    def book(self, instId, channel='books'):
+        return self.books.get((channel, instId))
+
+    async def subscribe(self, instIds, channel='books'):
+        args = []
+        for instId in instIds:
+            self.books.setdefault((channel, instId), OrderBook(instId, self.verifyChecksum))
+            args.append({"channel": channel, "instId": instId})
+        # The routes of the channel keep the callback already set on ws for other messages
+        fallback = self.ws.callback
+        await self.ws.subscribe(args, self.handleMessage)
+        if fallback is not None:
+            self.ws.callback = fallback
+
+    async def unsubscribe(self, instIds, channel='books'):
+        args = [{"channel": channel, "instId": instId} for instId in instIds]
+        for instId in instIds:
+            self.books.pop((channel, instId), None)
+        await self.ws.unsubscribe(args, self.ws.callback)
+
+    def handleMessage(self, message):
+        """WebSocket callback for raw or decoded books pushes"""
+        if isinstance(message, str):
+            message = self.ws.jsonCodec.loads(message)
+        arg = message.get('arg')
+        if arg is None:
+            return
+        key = (arg.get('channel'), arg.get('instId'))
+        book = self.books.get(key)
+        if book is None:
+            return
+        if message.get('event') == 'gap':
+            book.reset()
+            return
+        data = message.get('data')
+        if not data:
+            return
+        action = message.get('action', ACTION_SNAPSHOT)
+        if action == ACTION_UPDATE and not book.ready:
+            # Waiting for the snapshot of a resubscription
+            return
+        try:
+            for item in data:
+                book.apply(item, action)
+        except OkxOrderBookException as e:
+            logger.warning(f"{e}, resubscribing")
+            self.resync(key)
+            return
+        if self.onUpdate is not None:
+            self.onUpdate(book)
+
+    def resync(self, key):
+        """Resubscribe one (channel, instId) book so that the server sends a new snapshot"""
+        if key in self._resyncing:
+            return
+        self.books[key].reset()
+        self._resyncing.add(key)
+        self.resyncs += 1
+        task = asyncio.ensure_future(self._resubscribe(key))
+        task.add_done_callback(lambda _: self._resyncing.discard(key))
+
+    async def _resubscribe(self, key):
+        channel, instId = key
+        arg = {"channel": channel, "instId": instId}
+        fallback = self.ws.callback
+        await self.ws.unsubscribe([arg], fallback)
+        await self.ws.subscribe([arg], self.handleMessage)
+        self.ws.callback = fallback
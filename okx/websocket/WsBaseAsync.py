@@ -0,0 +1,296 @@
+import asyncio
+import inspect
+import logging
+import random
+import time
+
+from websockets.exceptions import ConnectionClosed
+
+from okx.websocket.DispatchQueue import DispatchQueue, CONFLATED_CHANNELS, OVERFLOW_BLOCK, OVERFLOW_CONFLATE
+
+logger = logging.getLogger(__name__)
+
+
+# instId of routes matching every instrument of a channel
+ANY = '*'
+
+
+def subscriptionKey(arg):
+    """Hashable identity of a subscription arg, e.g. {"channel": "books", "instId": "BTC-USDT"}"""
+    return tuple(sorted(arg.items()))
+
+
+def routeKey(channel=None, instId=ANY, op=None, event=None):
+    if channel is not None:
+        return 'arg', channel, instId or ANY
+    if op is not None:
+        return 'op', op
+    if event is not None:
+        return 'event', event
+    raise ValueError("a route needs a channel, op or event")
+
+
+def peekRoute(message, loads):
+    """
+    (arg, op, event) of a raw frame without decoding it: only the small arg object is parsed.
+    Pushes and subscription events carry an arg, operation responses an op, other events an event.
+    """
+    start = message.find('"arg":{')
+    if start != -1:
+        end = message.find('}', start)
+        return loads(message[start + 6:end + 1]), None, None
+    start = message.find('"op":"')
+    if start != -1:
+        return None, message[start + 6:message.find('"', start + 6)], None
+    start = message.find('"event":"')
+    if start != -1:
+        return None, None, message[start + 9:message.find('"', start + 9)]
+    return None, None, None
+
+
+class WsBaseAsync:
+    """
+    Connection supervision shared by WsPublicAsync and WsPrivateAsync.
+
+    Messages are routed once per frame: pushes and subscription events go to the callback of their
+    (channel, instId) route, or the (channel, ANY) route, operation responses to their op route and
+    other events to their event route. subscribe() adds the routes of its args, messages without a
+    route go to ``callback``, the callback of the last subscribe, unsubscribe or send call. Routing
+    a raw frame parses its arg only, so handlers receiving raw strings do not pay for a full decode.
+
+    start() runs a supervisor task consuming the connection. When the connection drops, every
+    active subscription receives a gap event through the callback, formatted like the server's
+    own events:
+
+        {"event": "gap", "arg": {"channel": "books", "instId": "BTC-USDT"}, "ts": "1700000000000"}
+
+    where ts is the time the disconnect was detected in ms. The supervisor then reconnects with
+    jittered exponential backoff, logs in again if the connection was logged in, and replays the
+    subscriptions, whose subscribe events mark the end of the gap.
+
+    With a queueSize, received frames go through a DispatchQueue and ``workers`` tasks run the
+    callbacks, so slow callbacks no longer hold up reading the connection. Callbacks may then be
+    coroutine functions, awaited by the worker; with several workers messages are handled
+    concurrently and their order is only kept per worker.
+    """
+
+    def _initSupervisor(self, autoReconnect=True, reconnectDelay=0.1, maxReconnectDelay=10):
+        """
+        :param autoReconnect: Reconnect and replay subscriptions when the connection drops
+        :param reconnectDelay: Backoff cap of the first reconnect attempt in seconds, doubled per failed attempt
+        :param maxReconnectDelay: Upper bound of the backoff cap
+        """
+        # subscriptionKey(arg): arg of every active subscription, in subscription order
+        self.subscriptions = {}
+        # routeKey(...): callback
+        self.routes = {}
+        self.autoReconnect = autoReconnect
+        self.reconnectDelay = reconnectDelay
+        self.maxReconnectDelay = maxReconnectDelay
+        self.reconnects = 0
+        self._supervisor = None
+        self._stopping = False
+
+    def _initDispatchQueue(self, queueSize=0, overflow=OVERFLOW_BLOCK, workers=1, conflateChannels=None):
+        """
+        :param queueSize: Bound of the queue between the reader and the callbacks, 0 to run callbacks in the reader
+        :param overflow: 'block', 'drop_oldest' or 'conflate', see okx.websocket.DispatchQueue
+        :param workers: Number of tasks running callbacks
+        :param conflateChannels: Channels conflated by the 'conflate' policy, default CONFLATED_CHANNELS
+        """
+        if queueSize and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.dispatchQueue = DispatchQueue(queueSize, overflow) if queueSize else None
+        self.workers = workers
+        self.conflateChannels = frozenset(conflateChannels if conflateChannels is not None else CONFLATED_CHANNELS)
+        self._workerTasks = []
+
+    def queueStats(self):
+        """depth, highWater, dropped, conflated and lag (seconds) of the dispatch queue, None without one"""
+        return self.dispatchQueue.stats() if self.dispatchQueue is not None else None
+
+    def addRoute(self, callback, channel=None, instId=ANY, op=None, event=None):
+        """
+        Send the messages of a channel (optionally of one instrument), an operation or an event to ``callback``
+        :param channel: Channel name, e.g. 'books'
+        :param instId: Instrument ID, ANY for every instrument of the channel
+        :param op: Operation whose responses are routed, e.g. 'order'
+        :param event: Event without arg that is routed, e.g. 'error' or 'notice'
+        """
+        self.routes[routeKey(channel, instId, op, event)] = callback
+
+    def removeRoute(self, channel=None, instId=ANY, op=None, event=None):
+        self.routes.pop(routeKey(channel, instId, op, event), None)
+
+    def _trackSubscribe(self, args, callback=None):
+        for arg in args:
+            self.subscriptions[subscriptionKey(arg)] = arg
+            if callback is not None:
+                self.routes[routeKey(arg["channel"], arg.get("instId", ANY))] = callback
+
+    def _trackUnsubscribe(self, args):
+        for arg in args:
+            self.subscriptions.pop(subscriptionKey(arg), None)
+            key = routeKey(arg["channel"], arg.get("instId", ANY))
+            # Subscriptions differing in other fields, e.g. instType, share the route
+            if not any(routeKey(other["channel"], other.get("instId", ANY)) == key
+                       for other in self.subscriptions.values()):
+                self.routes.pop(key, None)
+
+    def _handlerFor(self, message, decoded):
+        if decoded is not None:
+            arg, op, event = decoded.get("arg"), decoded.get("op"), decoded.get("event")
+        else:
+            arg, op, event = peekRoute(message, self.jsonCodec.loads)
+        routes = self.routes
+        handler = None
+        if arg is not None:
+            channel = arg.get("channel")
+            handler = routes.get(('arg', channel, arg.get("instId", ANY))) or routes.get(('arg', channel, ANY))
+        elif op is not None:
+            handler = routes.get(('op', op))
+        elif event is not None:
+            handler = routes.get(('event', event))
+        return handler or self.callback
+
+    def dispatch(self, message, decoded=None):
+        """
+        Hand a received frame to its route
+        :param message: Raw frame
+        :param decoded: The decoded frame if already available
+        """
+        if self.decodeMessages and decoded is None:
+            decoded = self.jsonCodec.loads(message)
+        handler = self._handlerFor(message, decoded) if self.routes else self.callback
+        if handler:
+            return handler(decoded if self.decodeMessages else message)
+
+    def _deliver(self, message, decoded=None):
+        """Dispatch a received frame, through the dispatch queue when there is one"""
+        queue = self.dispatchQueue
+        if queue is None:
+            self.dispatch(message, decoded)
+        elif queue.overflow != OVERFLOW_CONFLATE:
+            queue.put(message, decoded)
+        else:
+            if decoded is not None:
+                arg, update, push = decoded.get("arg"), decoded.get("action") == "update", "data" in decoded
+            else:
+                arg = peekRoute(message, self.jsonCodec.loads)[0]
+                update, push = '"action":"update"' in message, '"data":' in message
+            if arg is None or not push:
+                queue.put(message, decoded)
+            else:
+                conflate = not update and arg.get("channel") in self.conflateChannels
+                queue.put(message, decoded, subscriptionKey(arg), conflate=conflate)
+
+    async def _waitForQueue(self):
+        # Block policy: stop reading the connection until the callbacks catch up
+        queue = self.dispatchQueue
+        if queue is not None and queue.mustWait():
+            await queue.waitForSpace()
+
+    async def _work(self):
+        queue = self.dispatchQueue
+        while True:
+            message, decoded = await queue.get()
+            try:
+                result = self.dispatch(message, decoded)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Error handling WebSocket message")
+
+    def _dispatchEvent(self, event):
+        try:
+            self._deliver(self.jsonCodec.dumps(event), event)
+        except Exception:
+            logger.exception("Error handling WebSocket event")
+
+    def _onDisconnect(self):
+        """Hook for state tied to the lost connection"""
+
+    def _connectionLost(self, emitGaps):
+        self.websocket = None
+        self.isLoggedIn = False
+        self._onDisconnect()
+        if emitGaps:
+            ts = str(int(time.time() * 1000))
+            for arg in list(self.subscriptions.values()):
+                self._dispatchEvent({"event": "gap", "arg": arg, "ts": ts})
+
+    async def _restore(self, relogin):
+        if relogin:
+            await self.login()
+        if self.subscriptions:
+            payload = self.jsonCodec.dumps({"op": "subscribe", "args": list(self.subscriptions.values())})
+            if self.debug:
+                logger.debug(f"resubscribe: {payload}")
+            await self.websocket.send(payload)
+
+    async def _consumeUntilClosed(self):
+        while True:
+            try:
+                await self.consume()
+                return
+            except (ConnectionClosed, OSError) as e:
+                logger.warning(f"WebSocket connection lost: {e!r}")
+                return
+            except Exception:
+                # A failing callback must not take the feed down, keep reading the same connection
+                logger.exception("Error handling WebSocket message")
+
+    async def _supervise(self):
+        attempt = 0
+        relogin = False
+        restored = True
+        consumer = None
+        try:
+            while not self._stopping:
+                if self.websocket is None:
+                    delay = random.uniform(0, min(self.maxReconnectDelay, self.reconnectDelay * 2 ** attempt))
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    await self.connect()
+                    if self.websocket is None:
+                        continue
+                    self.reconnects += 1
+                    # Login waits for the server's login event, so messages are consumed while restoring
+                    consumer = asyncio.ensure_future(self._consumeUntilClosed())
+                    try:
+                        await self._restore(relogin)
+                    except Exception as e:
+                        logger.warning(f"Restoring WebSocket session failed: {e!r}")
+                        await self.websocket.close()
+                    else:
+                        attempt = 0
+                        restored = True
+                else:
+                    consumer = asyncio.ensure_future(self._consumeUntilClosed())
+                await consumer
+                consumer = None
+                if self._stopping or not self.autoReconnect:
+                    return
+                relogin = relogin or self.isLoggedIn
+                # Gap events are sent once per outage, not per failed reconnect attempt
+                self._connectionLost(emitGaps=restored)
+                restored = False
+        finally:
+            if consumer is not None:
+                consumer.cancel()
+
+    def _startSupervisor(self):
+        self._stopping = False
+        if self.dispatchQueue is not None and not self._workerTasks:
+            self._workerTasks = [self.loop.create_task(self._work()) for _ in range(self.workers)]
+        self._supervisor = self.loop.create_task(self._supervise() if self.autoReconnect else self.consume())
+
+    async def _stopSupervisor(self):
+        self._stopping = True
+        supervisor = self._supervisor
+        self._supervisor = None
+        if supervisor is not None and supervisor is not asyncio.current_task():
+            supervisor.cancel()
+        for worker in self._workerTasks:
+            worker.cancel()
+        self._workerTasks = []
@@ -0,0 +1,250 @@
+"""
+Public WebSocket subscriptions spread over several connections.
+
+One WsPublicAsync is one socket: thousands of subscriptions on it make a single slow consumer of
+the server and a single point of failure. WsPoolAsync places every (channel, instId) on one of
+``size`` connections by CRC32 of the instId, so the channels of an instrument share a connection
+and the placement is the same in every process. Pushes of all connections reach the callbacks
+given to subscribe, each connection reconnecting and replaying its own subscriptions as
+WsPublicAsync does.
+
+The pool counts the pushes of every placement. rebalance() moves the busiest placements from the
+most loaded connection to the least loaded one: the instrument is unsubscribed on its connection,
+receives a gap event and is subscribed on the other, whose snapshot or subscribe event ends the gap.
+
+Ingestion can also be split across processes: every process creates its pool with the same
+shardCount and its own shardIndex, subscribes the full list and keeps only the instruments of its
+shard.
+
+Usage:
+    pool = WsPoolAsync(url, size=4, rebalanceInterval=60)
+    await pool.start()
+    await pool.subscribe([{"channel": "tickers", "instId": instId} for instId in instIds], callback)
+"""
+import asyncio
+import logging
+import time
+import zlib
+
+from okx.websocket.WsBaseAsync import ANY, routeKey, subscriptionKey
+from okx.websocket.WsPublicAsync import WsPublicAsync
+
+logger = logging.getLogger(__name__)
+
+# Args per subscribe frame, keeping frames well below the server's request size limit
+SUBSCRIBE_BATCH = 100
+
+
+def placementHash(channel, instId):
+    """Hash placing a (channel, instId) route, by instId so that the channels of an instrument stay together"""
+    return zlib.crc32((channel if instId == ANY else instId).encode())
+
+
+class WsPoolAsync:
+
+    def __init__(self, url, size=4, shardIndex=0, shardCount=1, rebalanceInterval=None, rebalanceTolerance=0.25,
+                 debug=False, jsonCodec=None, decodeMessages=False, autoReconnect=True, reconnectDelay=0.1,
+                 maxReconnectDelay=10, queueSize=0, overflow='block', workers=1,
+                 conflateChannels=None):
+        """
+        :param url: Public WebSocket url
+        :param size: Number of connections
+        :param shardIndex: Shard of this process, between 0 and shardCount - 1
+        :param shardCount: Number of processes sharing the subscriptions, args of other shards are skipped
+        :param rebalanceInterval: Seconds between automatic rebalances, None to only rebalance on request
+        :param rebalanceTolerance: Load above the mean, as a fraction of it, tolerated on a connection
+        Other parameters are passed to every WsPublicAsync.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if not 0 <= shardIndex < shardCount:
+            raise ValueError("shardIndex must be between 0 and shardCount - 1")
+        self.url = url
+        self.size = size
+        self.shardIndex = shardIndex
+        self.shardCount = shardCount
+        self.rebalanceInterval = rebalanceInterval
+        self.rebalanceTolerance = rebalanceTolerance
+        self.decodeMessages = decodeMessages
+        self.callback = None
+        self.connections = [
+            WsPublicAsync(url, debug=debug, jsonCodec=jsonCodec, decodeMessages=decodeMessages,
+                          autoReconnect=autoReconnect, reconnectDelay=reconnectDelay,
+                          maxReconnectDelay=maxReconnectDelay, queueSize=queueSize, overflow=overflow,
+                          workers=workers, conflateChannels=conflateChannels)
+            for _ in range(size)
+        ]
+        # routeKey: index of the connection carrying it
+        self.placement = {}
+        # routeKey: {subscriptionKey(arg): arg}
+        self.args = {}
+        # routeKey: callback
+        self.handlers = {}
+        # routeKey: pushes received since the last rebalance
+        self.counts = {}
+        self.moves = 0
+        self._windowStart = time.monotonic()
+        self._rebalancer = None
+
+    def owns(self, arg):
+        """True when ``arg`` belongs to the shard of this pool"""
+        return placementHash(arg["channel"], arg.get("instId", ANY)) % self.shardCount == self.shardIndex
+
+    def connectionOf(self, arg):
+        """The WsPublicAsync carrying ``arg``, None when it is not subscribed"""
+        index = self.placement.get(routeKey(arg["channel"], arg.get("instId", ANY)))
+        return None if index is None else self.connections[index]
+
+    def _initialPlacement(self, key):
+        return placementHash(key[1], key[2]) // self.shardCount % self.size
+
+    def _handler(self, key, callback):
+        counts = self.counts
+
+        def handler(message):
+            counts[key] = counts.get(key, 0) + 1
+            return callback(message)
+
+        return handler
+
+    def _onUnrouted(self, message):
+        # Messages without an arg, e.g. error events, go to the last callback like on a single connection
+        if self.callback is not None:
+            return self.callback(message)
+
+    async def _subscribeOn(self, index, keys):
+        ws = self.connections[index]
+        args = []
+        for key in keys:
+            # Routes first, so that pushes answering the subscribe are counted
+            ws.addRoute(self._handler(key, self.handlers[key]), channel=key[1], instId=key[2])
+            args.extend(self.args[key].values())
+        for start in range(0, len(args), SUBSCRIBE_BATCH):
+            await ws.subscribe(args[start:start + SUBSCRIBE_BATCH], None)
+        ws.callback = self._onUnrouted
+
+    async def _unsubscribeOn(self, index, args):
+        ws = self.connections[index]
+        for start in range(0, len(args), SUBSCRIBE_BATCH):
+            await ws.unsubscribe(args[start:start + SUBSCRIBE_BATCH], self._onUnrouted)
+
+    async def subscribe(self, params: list, callback):
+        """
+        Subscribe the args of this shard, each on the connection of its instrument
+        :return: The args subscribed by this pool
+        """
+        self.callback = callback
+        batches = {}
+        subscribed = []
+        for arg in params:
+            if not self.owns(arg):
+                continue
+            key = routeKey(arg["channel"], arg.get("instId", ANY))
+            index = self.placement.get(key)
+            if index is None:
+                index = self.placement[key] = self._initialPlacement(key)
+            self.args.setdefault(key, {})[subscriptionKey(arg)] = arg
+            self.handlers[key] = callback
+            batches.setdefault(index, {})[key] = None
+            subscribed.append(arg)
+        await asyncio.gather(*(self._subscribeOn(index, keys) for index, keys in batches.items()))
+        return subscribed
+
+    async def unsubscribe(self, params: list, callback=None):
+        if callback is not None:
+            self.callback = callback
+        batches = {}
+        for arg in params:
+            key = routeKey(arg["channel"], arg.get("instId", ANY))
+            index = self.placement.get(key)
+            if index is None:
+                continue
+            args = self.args[key]
+            args.pop(subscriptionKey(arg), None)
+            if not args:
+                del self.args[key], self.placement[key], self.handlers[key]
+                self.counts.pop(key, None)
+            batches.setdefault(index, []).append(arg)
+        await asyncio.gather(*(self._unsubscribeOn(index, args) for index, args in batches.items()))
+
+    def loads(self):
+        """Pushes per second of every connection since the last rebalance"""
+        elapsed = max(time.monotonic() - self._windowStart, 1e-9)
+        loads = [0.0] * self.size
+        for key, index in self.placement.items():
+            loads[index] += self.counts.get(key, 0)
+        return [count / elapsed for count in loads]
+
+    def planRebalance(self):
+        """
+        Moves evening out the counted load: the busiest placement that lowers the peak is taken off the
+        most loaded connection onto the least loaded one until every connection is within the tolerance
+        :return: [(routeKey, fromIndex, toIndex)]
+        """
+        loads = [0] * self.size
+        for key, index in self.placement.items():
+            loads[index] += self.counts.get(key, 0)
+        limit = sum(loads) / self.size * (1 + self.rebalanceTolerance)
+        placement = dict(self.placement)
+        moves = []
+        for _ in range(len(placement)):
+            busiest = max(range(self.size), key=loads.__getitem__)
+            idlest = min(range(self.size), key=loads.__getitem__)
+            if loads[busiest] <= limit:
+                break
+            gain = loads[busiest] - loads[idlest]
+            candidates = [(self.counts.get(key, 0), key) for key, index in placement.items()
+                          if index == busiest and 0 < self.counts.get(key, 0) < gain]
+            if not candidates:
+                break
+            count, key = max(candidates)
+            placement[key] = idlest
+            loads[busiest] -= count
+            loads[idlest] += count
+            moves.append((key, busiest, idlest))
+        return moves
+
+    async def rebalance(self):
+        """
+        Apply planRebalance and start a new counting window
+        :return: The moves made
+        """
+        moves = self.planRebalance()
+        ts = str(int(time.time() * 1000))
+        for key, source, target in moves:
+            args = list(self.args[key].values())
+            await self._unsubscribeOn(source, args)
+            self.placement[key] = target
+            self.moves += 1
+            ws = self.connections[target]
+            ws.addRoute(self._handler(key, self.handlers[key]), channel=key[1], instId=key[2])
+            for arg in args:
+                ws._dispatchEvent({"event": "gap", "arg": arg, "ts": ts})
+            await self._subscribeOn(target, [key])
+        if moves:
+            logger.info(f"WebSocket pool moved {len(moves)} subscriptions")
+        self.counts.clear()
+        self._windowStart = time.monotonic()
+        return moves
+
+    async def _rebalancePeriodically(self):
+        while True:
+            await asyncio.sleep(self.rebalanceInterval)
+            try:
+                await self.rebalance()
+            except Exception:
+                logger.exception("WebSocket pool rebalance failed")
+
+    async def start(self):
+        await asyncio.gather(*(ws.start() for ws in self.connections))
+        for ws in self.connections:
+            ws.callback = self._onUnrouted
+        self._windowStart = time.monotonic()
+        if self.rebalanceInterval:
+            self._rebalancer = asyncio.ensure_future(self._rebalancePeriodically())
+
+    async def stop(self):
+        if self._rebalancer is not None:
+            self._rebalancer.cancel()
+            self._rebalancer = None
+        await asyncio.gather(*(ws.stop() for ws in self.connections))
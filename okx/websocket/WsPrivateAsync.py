@@ -1,18 +1,23 @@
 import asyncio
-import json
+import itertools
 import logging
 import warnings
 
+from okx import codec
+from okx.exceptions import OkxRequestException
 from okx.websocket import WsUtils
+from okx.websocket.WsBaseAsync import WsBaseAsync
 from okx.websocket.WebSocketFactory import WebSocketFactory
 
 logger = logging.getLogger(__name__)
 
 
-class WsPrivateAsync:
-    def __init__(self, apiKey, passphrase, secretKey, url, useServerTime=None, debug=False):
+class WsPrivateAsync(WsBaseAsync):
+    def __init__(self, apiKey, passphrase, secretKey, url, useServerTime=None, debug=False, jsonCodec=None,
+                 decodeMessages=False, requestTimeout=10, loginTimeout=10, autoReconnect=True, reconnectDelay=0.1,
+                 maxReconnectDelay=10, queueSize=0, overflow='block', workers=1,
+                 conflateChannels=None):
         self.url = url
-        self.subscriptions = set()
         self.callback = None
         self.loop = asyncio.get_event_loop()
         self.factory = WebSocketFactory(url)
@@ -22,6 +27,25 @@ class WsPrivateAsync:
         self.useServerTime = False
         self.websocket = None
         self.debug = debug
+        # Codec used for outgoing frames, and for incoming ones when decodeMessages is set so that
+        # callbacks receive decoded dicts instead of raw strings
+        self.jsonCodec = codec.get_codec(jsonCodec)
+        self.decodeMessages = decodeMessages
+        # Order operations are correlated with their response through the request id:
+        # id -> (future, timeout handle)
+        self.requestTimeout = requestTimeout
+        self.pendingRequests = {}
+        self._requestIds = itertools.count(1)
+        # login() waits for the server's login event instead of a fixed delay
+        self.loginTimeout = loginTimeout
+        self.isLoggedIn = False
+        self._loginFuture = None
+        # Login in flight, shared by concurrent login() calls
+        self._loginTask = None
+        # Supervised reconnects replaying the login and subscriptions, see WsBaseAsync
+        self._initSupervisor(autoReconnect, reconnectDelay, maxReconnectDelay)
+        # Optional queue decoupling callbacks from the reader, see WsBaseAsync
+        self._initDispatchQueue(queueSize, overflow, workers, conflateChannels)
 
         # Set log level
         if debug:
@@ -32,34 +56,116 @@ class WsPrivateAsync:
             warnings.warn("useServerTime parameter is deprecated. Please remove it.", DeprecationWarning)
 
     async def connect(self):
+        self.isLoggedIn = False
         self.websocket = await self.factory.connect()
 
     async def consume(self):
         async for message in self.websocket:
-            if self.debug:
-                logger.debug("Received message: {%s}", message)
-            if self.callback:
-                self.callback(message)
+            self.handleMessage(message)
+            await self._waitForQueue()
+
+    def handleMessage(self, message):
+        if self.debug:
+            logger.debug("Received message: {%s}", message)
+        decoded = None
+        if self.decodeMessages:
+            decoded = self.jsonCodec.loads(message)
+        if self._loginFuture is not None and '"event"' in message:
+            decoded = decoded if decoded is not None else self.jsonCodec.loads(message)
+            self._resolveLogin(decoded)
+        if self.pendingRequests and '"op"' in message:
+            decoded = decoded if decoded is not None else self.jsonCodec.loads(message)
+            self._resolveRequest(decoded)
+        self._deliver(message, decoded)
+
+    def _resolveLogin(self, event):
+        future = self._loginFuture
+        if future.done() or event.get("event") not in ("login", "error"):
+            return
+        if event["event"] == "login" and event.get("code", "0") == "0":
+            future.set_result(True)
+        else:
+            future.set_exception(OkxRequestException(
+                "login failed, code=%s: %s" % (event.get("code"), event.get("msg"))))
+
+    def _resolveRequest(self, response):
+        pending = self.pendingRequests.pop(response.get("id"), None)
+        if pending is None:
+            return
+        future, timeoutHandle = pending
+        timeoutHandle.cancel()
+        if not future.done():
+            future.set_result(response)
+
+    def _expireRequest(self, id):
+        pending = self.pendingRequests.pop(id, None)
+        if pending is not None and not pending[0].done():
+            pending[0].set_exception(asyncio.TimeoutError("No response to request %s" % id))
+
+    async def request(self, op: str, args: list, callback=None, id: str = None, timeout=None):
+        """
+        Send an operation and return a future resolving with its response
+        :param op: Operation type
+        :param args: Parameter list
+        :param callback: Callback function
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds before the future fails with asyncio.TimeoutError, default requestTimeout
+        :return: asyncio.Future resolving with the response dict of this request
+        """
+        if id is None:
+            id = str(next(self._requestIds))
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        timeoutHandle = loop.call_later(timeout or self.requestTimeout, self._expireRequest, id)
+        self.pendingRequests[id] = (future, timeoutHandle)
+        try:
+            await self.send(op, args, callback=callback, id=id)
+        except BaseException:
+            self.pendingRequests.pop(id, None)
+            timeoutHandle.cancel()
+            raise
+        return future
 
     async def subscribe(self, params: list, callback, id: str = None):
         self.callback = callback
+        self._trackSubscribe(params, callback)
 
-        logRes = await self.login()
-        await asyncio.sleep(5)
-        if logRes:
-            payload_dict = {
-                "op": "subscribe",
-                "args": params
-            }
-            if id is not None:
-                payload_dict["id"] = id
-            payload = json.dumps(payload_dict)
-            if self.debug:
-                logger.debug(f"subscribe: {payload}")
-            await self.websocket.send(payload)
+        if not self.isLoggedIn:
+            await self.login()
+        payload_dict = {
+            "op": "subscribe",
+            "args": params
+        }
+        if id is not None:
+            payload_dict["id"] = id
+        payload = self.jsonCodec.dumps(payload_dict)
+        if self.debug:
+            logger.debug(f"subscribe: {payload}")
+        await self.websocket.send(payload)
         # await self.consume()
 
-    async def login(self):
+    async def login(self, timeout=None):
+        """
+        Send the login frame and wait for the server's login event, consume() must be running.
+        Concurrent calls, e.g. subscribe() calls made while logged out, wait for the same login.
+        :param timeout: Seconds to wait for the login event, default loginTimeout
+        :raises OkxRequestException: The server answered with an error event
+        :raises asyncio.TimeoutError: No answer within the timeout
+        """
+        task = self._loginTask
+        if task is None:
+            task = self._loginTask = asyncio.ensure_future(self._login(timeout))
+            task.add_done_callback(self._loginDone)
+        return await asyncio.shield(task)
+
+    def _loginDone(self, task):
+        if self._loginTask is task:
+            self._loginTask = None
+        if not task.cancelled():
+            # Retrieved here so that a failure awaited by no caller is not reported as never retrieved
+            task.exception()
+
+    async def _login(self, timeout):
         loginPayload = WsUtils.initLoginParams(
             useServerTime=self.useServerTime,
             apiKey=self.apiKey,
@@ -68,18 +174,25 @@ class WsPrivateAsync:
         )
         if self.debug:
             logger.debug(f"login: {loginPayload}")
-        await self.websocket.send(loginPayload)
+        self._loginFuture = asyncio.get_event_loop().create_future()
+        try:
+            await self.websocket.send(loginPayload)
+            await asyncio.wait_for(self._loginFuture, timeout or self.loginTimeout)
+        finally:
+            self._loginFuture = None
+        self.isLoggedIn = True
         return True
 
     async def unsubscribe(self, params: list, callback, id: str = None):
         self.callback = callback
+        self._trackUnsubscribe(params)
         payload_dict = {
             "op": "unsubscribe",
             "args": params
         }
         if id is not None:
             payload_dict["id"] = id
-        payload = json.dumps(payload_dict)
+        payload = self.jsonCodec.dumps(payload_dict)
         if self.debug:
             logger.debug(f"unsubscribe: {payload}")
         else:
@@ -102,90 +215,121 @@ class WsPrivateAsync:
         }
         if id is not None:
             payload_dict["id"] = id
-        payload = json.dumps(payload_dict)
+        payload = self.jsonCodec.dumps(payload_dict)
         if self.debug:
             logger.debug(f"send: {payload}")
         await self.websocket.send(payload)
 
-    async def place_order(self, args: list, callback=None, id: str = None):
+    async def place_order(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Place order
         :param args: Order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("order", args, id=id)
+        future = await self.request("order", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def batch_orders(self, args: list, callback=None, id: str = None):
+    async def batch_orders(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Batch place orders
         :param args: Batch order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("batch-orders", args, id=id)
+        future = await self.request("batch-orders", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def cancel_order(self, args: list, callback=None, id: str = None):
+    async def cancel_order(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Cancel order
         :param args: Cancel order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("cancel-order", args, id=id)
+        future = await self.request("cancel-order", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def batch_cancel_orders(self, args: list, callback=None, id: str = None):
+    async def batch_cancel_orders(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Batch cancel orders
         :param args: Batch cancel order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("batch-cancel-orders", args, id=id)
+        future = await self.request("batch-cancel-orders", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def amend_order(self, args: list, callback=None, id: str = None):
+    async def amend_order(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Amend order
         :param args: Amend order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("amend-order", args, id=id)
+        future = await self.request("amend-order", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def batch_amend_orders(self, args: list, callback=None, id: str = None):
+    async def batch_amend_orders(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Batch amend orders
         :param args: Batch amend order parameter list
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("batch-amend-orders", args, id=id)
+        future = await self.request("batch-amend-orders", args, callback=callback, id=id, timeout=timeout)
+        return await future
 
-    async def mass_cancel(self, args: list, callback=None, id: str = None):
+    async def mass_cancel(self, args: list, callback=None, id: str = None, timeout=None):
         """
         Mass cancel orders
         Note: This method is for /ws/v5/business channel, rate limit: 1 request/second
         :param args: Cancel parameter list, contains instType and instFamily
         :param callback: Callback function
-        :param id: Optional request ID
+        :param id: Optional request ID, assigned automatically when omitted
+        :param timeout: Seconds to wait for the response, default requestTimeout
+        :return: The response dict
+        :raises asyncio.TimeoutError: No response within the timeout
         """
-        if callback:
-            self.callback = callback
-        await self.send("mass-cancel", args, id=id)
+        future = await self.request("mass-cancel", args, callback=callback, id=id, timeout=timeout)
+        return await future
+
+    def _onDisconnect(self):
+        # The outcome of requests in flight is unknown, their responses are lost with the connection
+        for id, (future, timeoutHandle) in self.pendingRequests.items():
+            timeoutHandle.cancel()
+            if not future.done():
+                future.set_exception(ConnectionError("Connection lost before the response to request %s" % id))
+        self.pendingRequests.clear()
+        if self._loginFuture is not None and not self._loginFuture.done():
+            self._loginFuture.set_exception(ConnectionError("Connection lost during login"))
 
     async def stop(self):
+        await self._stopSupervisor()
+        if self._loginTask is not None:
+            self._loginTask.cancel()
+        for future, timeoutHandle in self.pendingRequests.values():
+            timeoutHandle.cancel()
+            future.cancel()
+        self.pendingRequests.clear()
         await self.factory.close()
 
     async def start(self):
@@ -194,7 +338,7 @@ class WsPrivateAsync:
         else:
             logger.info("Connecting to WebSocket...")
         await self.connect()
-        self.loop.create_task(self.consume())
+        self._startSupervisor()
 
     def stop_sync(self):
         if self.loop.is_running():
@@ -1,27 +1,37 @@
 import asyncio
-import json
 import logging
 
+from okx import codec
 from okx.websocket import WsUtils
+from okx.websocket.WsBaseAsync import WsBaseAsync
 from okx.websocket.WebSocketFactory import WebSocketFactory
 
 logger = logging.getLogger(__name__)
 
 
-class WsPublicAsync:
-    def __init__(self, url, apiKey='', passphrase='', secretKey='', debug=False):
+class WsPublicAsync(WsBaseAsync):
+    def __init__(self, url, apiKey='', passphrase='', secretKey='', debug=False, jsonCodec=None, decodeMessages=False,
+                 autoReconnect=True, reconnectDelay=0.1, maxReconnectDelay=10, queueSize=0, overflow='block',
+                 workers=1, conflateChannels=None):
         self.url = url
-        self.subscriptions = set()
         self.callback = None
         self.loop = asyncio.get_event_loop()
         self.factory = WebSocketFactory(url)
         self.websocket = None
         self.debug = debug
+        # Codec used for outgoing frames, and for incoming ones when decodeMessages is set so that
+        # callbacks receive decoded dicts instead of raw strings
+        self.jsonCodec = codec.get_codec(jsonCodec)
+        self.decodeMessages = decodeMessages
         # Credentials for business channel login
         self.apiKey = apiKey
         self.passphrase = passphrase
         self.secretKey = secretKey
         self.isLoggedIn = False
+        # Supervised reconnects replaying the login and subscriptions, see WsBaseAsync
+        self._initSupervisor(autoReconnect, reconnectDelay, maxReconnectDelay)
+        # Optional queue decoupling callbacks from the reader, see WsBaseAsync
+        self._initDispatchQueue(queueSize, overflow, workers, conflateChannels)
 
         # Set log level
         if debug:
@@ -34,8 +44,8 @@ class WsPublicAsync:
         async for message in self.websocket:
             if self.debug:
                 logger.debug("Received message: {%s}", message)
-            if self.callback:
-                self.callback(message)
+            self._deliver(message)
+            await self._waitForQueue()
 
     async def login(self):
         """
@@ -58,13 +68,14 @@ class WsPublicAsync:
 
     async def subscribe(self, params: list, callback, id: str = None):
         self.callback = callback
+        self._trackSubscribe(params, callback)
         payload_dict = {
             "op": "subscribe",
             "args": params
         }
         if id is not None:
             payload_dict["id"] = id
-        payload = json.dumps(payload_dict)
+        payload = self.jsonCodec.dumps(payload_dict)
         if self.debug:
             logger.debug(f"subscribe: {payload}")
         await self.websocket.send(payload)
@@ -72,13 +83,14 @@ class WsPublicAsync:
 
     async def unsubscribe(self, params: list, callback, id: str = None):
         self.callback = callback
+        self._trackUnsubscribe(params)
         payload_dict = {
             "op": "unsubscribe",
             "args": params
         }
         if id is not None:
             payload_dict["id"] = id
-        payload = json.dumps(payload_dict)
+        payload = self.jsonCodec.dumps(payload_dict)
         if self.debug:
             logger.debug(f"unsubscribe: {payload}")
         else:
@@ -101,12 +113,13 @@ class WsPublicAsync:
         }
         if id is not None:
             payload_dict["id"] = id
-        payload = json.dumps(payload_dict)
+        payload = self.jsonCodec.dumps(payload_dict)
         if self.debug:
             logger.debug(f"send: {payload}")
         await self.websocket.send(payload)
 
     async def stop(self):
+        await self._stopSupervisor()
         await self.factory.close()
 
     async def start(self):
@@ -115,7 +128,7 @@ class WsPublicAsync:
         else:
             logger.info("Connecting to WebSocket...")
         await self.connect()
-        self.loop.create_task(self.consume())
+        self._startSupervisor()
 
     def stop_sync(self):
         if self.loop.is_running():
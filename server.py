@@ -6,7 +6,7 @@ OKX 做空网格策略 Web 服务器
 
 from flask import Flask, jsonify, render_template_string
 from flask_cors import CORS
-from okx import MarketData as Market
+from okx.session import OkxSession
 from datetime import datetime, timezone, timedelta
 import statistics
 
@@ -17,10 +17,13 @@ CORS(app)
 PROXY = 'http://127.0.0.1:7890'
 BTC_SWAP_ID = 'BTC-USDT-SWAP'
 
+# 进程内共享连接池，避免每个请求重新建立 TLS 连接；并发的相同 GET 请求合并为一次
+okx_session = OkxSession(proxy=PROXY, single_flight=True)
+
 
 def get_market_data():
     """获取市场数据"""
-    market_api = Market.MarketAPI(proxy=PROXY)
+    market_api = okx_session.market
 
     # 获取实时价格
     ticker_result = market_api.get_ticker(BTC_SWAP_ID)
@@ -57,4 +57,7 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     install_requires=parse_requirements(),
+    extras_require={
+        "fast-json": ["orjson>=3.6.0"],
+    },
 )
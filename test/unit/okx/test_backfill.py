@@ -0,0 +1,109 @@
+"""
+Unit tests for okx.backfill module
+
+Mirrors the structure: okx/backfill.py -> test/unit/okx/test_backfill.py
+"""
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from okx import consts as c
+from okx.backfill import (BAR_MS, ROWS_PER_REQUEST, shard_range, merge_rows, CandleBackfill,
+                          AsyncCandleBackfill)
+from okx.exceptions import OkxParamsException, OkxRequestException
+
+MINUTE = BAR_MS['1m']
+
+
+class FakeMarket:
+    """Answers get_history_candlesticks with one 1m candle per minute, newest first."""
+
+    rate_limiter = None
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def page(self, instId, after, before, bar, limit):
+        with self.lock:
+            self.calls.append((instId, after, before))
+        step = BAR_MS[bar]
+        first = (int(before) // step + 1) * step
+        stamps = [ts for ts in range(first, int(after), step)][::-1][:int(limit)]
+        return {'code': '0', 'msg': '', 'data': [[str(ts), '1', '1', '1', '1', '0', '0', '0', '1'] for ts in stamps]}
+
+    def get_history_candlesticks(self, instId, after='', before='', bar='', limit=''):
+        return self.page(instId, after, before, bar, limit)
+
+
+class AsyncFakeMarket(FakeMarket):
+
+    async def get_history_candlesticks(self, instId, after='', before='', bar='', limit=''):
+        await asyncio.sleep(0)
+        return self.page(instId, after, before, bar, limit)
+
+
+class TestSharding(unittest.TestCase):
+    """Unit tests for shard_range and merge_rows"""
+
+    def test_shards_cover_range_without_overlap(self):
+        shards = shard_range(0, 250 * MINUTE, '1m')
+        self.assertEqual(shards, [(0, 100 * MINUTE), (100 * MINUTE, 200 * MINUTE), (200 * MINUTE, 250 * MINUTE)])
+
+    def test_unknown_bar_rejected(self):
+        with self.assertRaises(OkxParamsException):
+            shard_range(0, 1, '1M')
+
+    def test_merge_deduplicates_and_orders(self):
+        merged = merge_rows([[['3'], ['2']], [['2'], ['1']]])
+        self.assertEqual(merged, [['1'], ['2'], ['3']])
+
+
+class TestCandleBackfill(unittest.TestCase):
+    """Unit tests for CandleBackfill"""
+
+    def test_run_returns_complete_ordered_history(self):
+        market = FakeMarket()
+        result = CandleBackfill(market, max_workers=4).run(['BTC-USDT', 'ETH-USDT'], '1m', 0, 250 * MINUTE)
+        for instId in ('BTC-USDT', 'ETH-USDT'):
+            self.assertEqual([int(row[0]) for row in result[instId]], list(range(0, 250 * MINUTE, MINUTE)))
+        self.assertEqual(len(market.calls), 6)
+
+    def test_shard_requests_are_rate_limited(self):
+        limiter = MagicMock()
+        CandleBackfill(FakeMarket(), rate_limiter=limiter).run('BTC-USDT', '1m', 0, 150 * MINUTE)
+        self.assertEqual(limiter.acquire.call_count, 2)
+        self.assertEqual(limiter.acquire.call_args[0][0], c.HISTORY_CANDLES)
+
+    def test_client_limiter_is_not_duplicated(self):
+        market = FakeMarket()
+        market.rate_limiter = MagicMock()
+        self.assertIsNone(CandleBackfill(market).rate_limiter)
+
+    def test_full_shard_is_paged_within_shard(self):
+        market = FakeMarket()
+        original = market.page
+        market.page = lambda instId, after, before, bar, limit: original(instId, after, before, bar, '60')
+        rows = CandleBackfill(market).fetch_shard('BTC-USDT', '1m', 0, ROWS_PER_REQUEST * MINUTE)
+        self.assertEqual(len(merge_rows([rows])), ROWS_PER_REQUEST)
+
+    def test_error_response_raises(self):
+        market = MagicMock(rate_limiter=None)
+        market.get_history_candlesticks.return_value = {'code': '51001', 'msg': 'Instrument ID does not exist'}
+        with self.assertRaises(OkxRequestException):
+            CandleBackfill(market).run('FOO-USDT', '1m', 0, MINUTE)
+
+
+class TestAsyncCandleBackfill(unittest.TestCase):
+    """Unit tests for AsyncCandleBackfill"""
+
+    def test_run_returns_complete_ordered_history(self):
+        market = AsyncFakeMarket()
+        backfill = AsyncCandleBackfill(market, concurrency=2)
+        result = asyncio.get_event_loop().run_until_complete(backfill.run(['BTC-USDT'], '1m', 0, 230 * MINUTE))
+        self.assertEqual([int(row[0]) for row in result['BTC-USDT']], list(range(0, 230 * MINUTE, MINUTE)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for okx.batching module
+
+Mirrors the structure: okx/batching.py -> test/unit/okx/test_batching.py
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+
+from okx.batching import OrderBatcher, AsyncOrderBatcher, build_order, split_response
+
+
+def batch_response(orders):
+    data = [{'clOrdId': order.get('clOrdId', ''), 'ordId': 'o%d' % i, 'sCode': '0', 'sMsg': ''}
+            for i, order in enumerate(orders)]
+    return {'code': '0', 'msg': '', 'data': data}
+
+
+class TestHelpers(unittest.TestCase):
+    """Unit tests for build_order and split_response"""
+
+    def test_build_order_omits_empty_fields(self):
+        order = build_order('BTC-USDT', 'cash', 'buy', 'limit', '1', px='100', clOrdId='', reduceOnly=None)
+        self.assertEqual(order, {'instId': 'BTC-USDT', 'tdMode': 'cash', 'side': 'buy', 'ordType': 'limit',
+                                 'sz': '1', 'px': '100'})
+
+    def test_split_partial_failure(self):
+        orders = [{'clOrdId': 'a'}, {'clOrdId': 'b'}]
+        response = {'code': '1', 'msg': 'Operation failed.', 'data': [
+            {'clOrdId': 'a', 'ordId': '1', 'sCode': '0', 'sMsg': ''},
+            {'clOrdId': 'b', 'ordId': '', 'sCode': '51008', 'sMsg': 'Insufficient balance'}]}
+        first, second = split_response(orders, response)
+        self.assertEqual(first['code'], '0')
+        self.assertEqual(second, {'code': '1', 'msg': 'Insufficient balance', 'data': [response['data'][1]]})
+
+    def test_split_request_failure(self):
+        responses = split_response([{}, {}], {'code': '50011', 'msg': 'Too Many Requests', 'data': []})
+        self.assertEqual(responses, [{'code': '50011', 'msg': 'Too Many Requests', 'data': []}] * 2)
+
+
+class TestOrderBatcher(unittest.TestCase):
+    """Unit tests for the thread based OrderBatcher"""
+
+    def test_orders_within_window_share_one_batch(self):
+        trade = MagicMock(order_validator=None)
+        trade.place_multiple_orders.side_effect = batch_response
+        with OrderBatcher(trade, window=0.05) as batcher:
+            futures = [batcher.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', clOrdId=str(i)) for i in range(3)]
+            results = [future.result(1) for future in futures]
+        trade.place_multiple_orders.assert_called_once()
+        self.assertEqual([r['data'][0]['clOrdId'] for r in results], ['0', '1', '2'])
+        self.assertEqual((batcher.batches, batcher.orders), (1, 3))
+
+    def test_full_batch_is_sent_without_waiting(self):
+        trade = MagicMock(order_validator=None)
+        trade.place_multiple_orders.side_effect = batch_response
+        batcher = OrderBatcher(trade, window=10, max_batch=2)
+        futures = [batcher.submit({'clOrdId': str(i)}) for i in range(2)]
+        self.assertEqual(futures[1].result(1)['data'][0]['clOrdId'], '1')
+        batcher.close()
+
+    def test_batches_are_sent_concurrently_and_resolve_in_order(self):
+        trade = MagicMock(order_validator=None)
+        barrier = threading.Barrier(2, timeout=2)
+
+        def place(orders):
+            # Both batches are in flight at once, the second one answers first
+            barrier.wait()
+            time.sleep(0.02 if orders[0]['clOrdId'] == '0' else 0)
+            return batch_response(orders)
+
+        trade.place_multiple_orders.side_effect = place
+        with OrderBatcher(trade, window=0.05, max_batch=2) as batcher:
+            futures = [batcher.submit({'clOrdId': str(i)}) for i in range(4)]
+            results = [future.result(1) for future in futures]
+        self.assertEqual([r['data'][0]['clOrdId'] for r in results], ['0', '1', '2', '3'])
+        self.assertEqual([r['code'] for r in results], ['0'] * 4)
+        self.assertEqual((batcher.batches, batcher.orders), (2, 4))
+
+    def test_invalid_order_fails_alone(self):
+        from okx.exceptions import OkxParamsException
+
+        def validate_order(order):
+            if order['sz'] == '0':
+                raise OkxParamsException('sz 0 of BTC-USDT is below the minimum size 0.00001')
+            return dict(order, px='100.1')
+
+        trade = MagicMock()
+        trade.order_validator.validate_order.side_effect = validate_order
+        trade.place_multiple_orders.side_effect = batch_response
+        with OrderBatcher(trade, window=0.05) as batcher:
+            futures = [batcher.place_order('BTC-USDT', 'cash', 'buy', 'limit', sz, px='100.12', clOrdId=str(i))
+                       for i, sz in enumerate(['1', '0', '2'])]
+            with self.assertRaises(OkxParamsException):
+                futures[1].result(1)
+            results = [futures[0].result(1), futures[2].result(1)]
+        sent = trade.place_multiple_orders.call_args[0][0]
+        self.assertEqual([(order['clOrdId'], order['px']) for order in sent], [('0', '100.1'), ('2', '100.1')])
+        self.assertEqual([r['data'][0]['clOrdId'] for r in results], ['0', '2'])
+
+    def test_callback_and_errors(self):
+        trade = MagicMock(order_validator=None)
+        trade.place_multiple_orders.side_effect = httpx.ConnectError('down')
+        done = threading.Event()
+        with OrderBatcher(trade, window=0) as batcher:
+            future = batcher.submit({'clOrdId': 'a'}, callback=lambda f: done.set())
+            with self.assertRaises(httpx.ConnectError):
+                future.result(1)
+        self.assertTrue(done.is_set())
+
+    def test_close_flushes_and_rejects_new_orders(self):
+        trade = MagicMock(order_validator=None)
+        trade.place_multiple_orders.side_effect = batch_response
+        batcher = OrderBatcher(trade, window=10)
+        future = batcher.submit({'clOrdId': 'a'})
+        batcher.close()
+        self.assertEqual(future.result(0)['code'], '0')
+        with self.assertRaises(RuntimeError):
+            batcher.submit({'clOrdId': 'b'})
+
+
+class TestAsyncOrderBatcher(unittest.TestCase):
+    """Unit tests for AsyncOrderBatcher"""
+
+    def test_orders_are_batched_and_resolved(self):
+        calls = []
+
+        async def place_multiple_orders(orders):
+            calls.append(orders)
+            return batch_response(orders)
+
+        trade = MagicMock()
+        trade.place_multiple_orders = place_multiple_orders
+
+        async def run_test():
+            batcher = AsyncOrderBatcher(trade, window=0.01, max_batch=4)
+            futures = [batcher.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', clOrdId=str(i)) for i in range(6)]
+            results = await asyncio.gather(*futures)
+            await batcher.close()
+            return results
+
+        results = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual([len(orders) for orders in calls], [4, 2])
+        self.assertEqual([r['data'][0]['clOrdId'] for r in results], [str(i) for i in range(6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Unit tests for okx.cache module
+
+Mirrors the structure: okx/cache.py -> test/unit/okx/test_cache.py
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+import okx.cache as cache_module
+from okx import consts as c
+from okx.cache import ResponseCache
+
+OK = {'code': '0', 'msg': '', 'data': [{'instId': 'BTC-USDT'}]}
+
+
+class TestResponseCache(unittest.TestCase):
+    """Unit tests for ResponseCache"""
+
+    def test_hit_after_put(self):
+        cache = ResponseCache()
+        self.assertIsNone(cache.get(c.INSTRUMENT_INFO, 'key'))
+        cache.put(c.INSTRUMENT_INFO, 'key', OK)
+        self.assertIs(cache.get(c.INSTRUMENT_INFO, 'key'), OK)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_uncached_path_and_errors_are_not_stored(self):
+        cache = ResponseCache()
+        cache.put(c.TICKER_INFO, 'key', OK)
+        cache.put(c.INSTRUMENT_INFO, 'key', {'code': '50001', 'msg': 'busy', 'data': []})
+        self.assertEqual(len(cache), 0)
+
+    def test_entries_expire(self):
+        cache = ResponseCache(ttls={c.INSTRUMENT_INFO: 10})
+        with patch.object(cache_module.time, 'time', return_value=1000.0):
+            cache.put(c.INSTRUMENT_INFO, 'key', OK)
+        with patch.object(cache_module.time, 'time', return_value=1009.0):
+            self.assertIs(cache.get(c.INSTRUMENT_INFO, 'key'), OK)
+        with patch.object(cache_module.time, 'time', return_value=1011.0):
+            self.assertIsNone(cache.get(c.INSTRUMENT_INFO, 'key'))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put(c.INSTRUMENT_INFO, 'a', OK)
+        cache.put(c.INSTRUMENT_INFO, 'b', OK)
+        cache.get(c.INSTRUMENT_INFO, 'a')
+        cache.put(c.INSTRUMENT_INFO, 'c', OK)
+        self.assertIsNotNone(cache.get(c.INSTRUMENT_INFO, 'a'))
+        self.assertIsNone(cache.get(c.INSTRUMENT_INFO, 'b'))
+
+    def test_invalidate_by_path(self):
+        cache = ResponseCache()
+        cache.put(c.INSTRUMENT_INFO, 'a', OK)
+        cache.put(c.TIER, 'b', OK)
+        cache.invalidate(c.INSTRUMENT_INFO)
+        self.assertIsNone(cache.get(c.INSTRUMENT_INFO, 'a'))
+        self.assertIsNotNone(cache.get(c.TIER, 'b'))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_persistence_restores_warm_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.json')
+            cache = ResponseCache(path=path)
+            cache.put(c.INSTRUMENT_INFO, ('GET', 'key'), OK)
+            cache.close()
+            restored = ResponseCache(path=path)
+            self.assertEqual(restored.get(c.INSTRUMENT_INFO, ('GET', 'key')), OK)
+            restored.close()
+
+    def test_puts_are_written_by_one_delayed_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.json')
+            cache = ResponseCache(path=path, save_interval=60)
+            with patch.object(cache, 'save', wraps=cache.save) as mock_save:
+                for i in range(50):
+                    cache.put(c.INSTRUMENT_INFO, ('GET', i), OK)
+                self.assertFalse(os.path.exists(path))
+                cache.flush()
+                cache.flush()
+            mock_save.assert_called_once()
+            self.assertEqual(len(ResponseCache(path=path)), 50)
+            cache.close()
+
+    def test_concurrent_saves_leave_a_valid_file(self):
+        import threading
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.json')
+            cache = ResponseCache(path=path)
+            for i in range(200):
+                cache.put(c.INSTRUMENT_INFO, ('GET', i), OK)
+            threads = [threading.Thread(target=cache.save) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(ResponseCache(path=path)), 200)
+            self.assertEqual(os.listdir(directory), ['cache.json'])
+            cache.close()
+
+    def test_corrupt_file_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.json')
+            with open(path, 'w') as f:
+                f.write('[["abc", 1e12, "/api')
+            cache = ResponseCache(path=path)
+            self.assertEqual(len(cache), 0)
+            cache.close()
+
+
+    def test_flush_before_timer_starts_does_not_break_put(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(path=os.path.join(directory, 'cache.json'), save_interval=60)
+            lock = cache._lock
+            releases = []
+
+            class FlushingLock:
+                """Runs a flush, as the timer or atexit could, right after _changed releases the lock"""
+
+                def __enter__(self):
+                    return lock.__enter__()
+
+                def __exit__(self, *exc_info):
+                    lock.__exit__(*exc_info)
+                    releases.append(1)
+                    if len(releases) == 2:
+                        cache.flush()
+
+            cache._lock = FlushingLock()
+            cache.put(c.INSTRUMENT_INFO, ('GET', 'key'), OK)
+            cache._lock = lock
+            self.assertIsNone(cache._timer)
+            cache.close()
+
+    def test_exit_flush_does_not_keep_caches_alive(self):
+        import gc
+        import weakref
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(path=os.path.join(directory, 'cache.json'))
+            self.assertIn(cache, cache_module._persisted)
+            cache.close()
+            self.assertNotIn(cache, cache_module._persisted)
+            ref = weakref.ref(ResponseCache(path=os.path.join(directory, 'other.json')))
+            gc.collect()
+            self.assertIsNone(ref())
+
+
+class TestClientResponseCache(unittest.TestCase):
+    """Unit tests for the response_cache client option"""
+
+    def test_second_call_is_served_from_cache(self):
+        from okx.PublicData import PublicAPI
+        api = PublicAPI(response_cache=True)
+        with patch.object(api, 'get', return_value=httpx.Response(200, json=OK)) as mock_get:
+            first = api.get_instruments('SPOT')
+            second = api.get_instruments('SPOT')
+            api.get_instruments('SWAP')
+        self.assertEqual(first, OK)
+        self.assertIs(second, first)
+        self.assertEqual(mock_get.call_count, 2)
+        api.close()
+
+    def test_uncached_endpoints_always_hit_network(self):
+        from okx.MarketData import MarketAPI
+        api = MarketAPI(response_cache=True)
+        with patch.object(api, 'get', return_value=httpx.Response(200, json=OK)) as mock_get:
+            api.get_ticker('BTC-USDT')
+            api.get_ticker('BTC-USDT')
+        self.assertEqual(mock_get.call_count, 2)
+        api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
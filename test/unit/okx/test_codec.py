@@ -0,0 +1,57 @@
+"""
+Unit tests for okx.codec module
+
+Mirrors the structure: okx/codec.py -> test/unit/okx/test_codec.py
+"""
+import importlib.util
+import unittest
+
+from okx import codec
+
+PAYLOAD = {'op': 'order', 'args': [{'instId': 'BTC-USDT', 'sz': '1', 'px': '65000.1'}], 'id': 'a1'}
+
+
+class TestGetCodec(unittest.TestCase):
+    """Unit tests for codec selection"""
+
+    def test_named_stdlib_codec(self):
+        self.assertIsInstance(codec.get_codec('json'), codec.JsonCodec)
+        self.assertIs(codec.get_codec('json'), codec.get_codec('json'))
+
+    def test_instance_is_returned_unchanged(self):
+        instance = codec.JsonCodec()
+        self.assertIs(codec.get_codec(instance), instance)
+
+    def test_auto_prefers_installed_fast_backend(self):
+        expected = 'orjson' if importlib.util.find_spec('orjson') else (
+            'msgspec' if importlib.util.find_spec('msgspec') else 'json')
+        self.assertEqual(codec.get_codec().name, expected)
+        self.assertEqual(codec.get_codec('auto').name, expected)
+
+    def test_unknown_codec_raises(self):
+        with self.assertRaises(ValueError):
+            codec.get_codec('yaml')
+
+
+class TestCodecRoundTrip(unittest.TestCase):
+    """Every available backend encodes to str/bytes and decodes str and bytes"""
+
+    def _available(self):
+        for name in ('json', 'orjson', 'msgspec'):
+            try:
+                yield codec.get_codec(name)
+            except ImportError:
+                continue
+
+    def test_round_trip(self):
+        for instance in self._available():
+            with self.subTest(codec=instance.name):
+                text = instance.dumps(PAYLOAD)
+                self.assertIsInstance(text, str)
+                self.assertIsInstance(instance.dumpb(PAYLOAD), bytes)
+                self.assertEqual(instance.loads(text), PAYLOAD)
+                self.assertEqual(instance.loads(text.encode('utf-8')), PAYLOAD)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for okx.metrics module
+
+Mirrors the structure: okx/metrics.py -> test/unit/okx/test_metrics.py
+"""
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import httpx
+
+from okx import consts as c
+from okx.metrics import Histogram, RequestMetrics
+
+
+class TestHistogram(unittest.TestCase):
+    """Unit tests for the log-linear Histogram"""
+
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(1, 11):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(0.5), 5)
+        self.assertEqual(histogram.percentile(1.0), 10)
+        self.assertEqual((histogram.min, histogram.max, histogram.count), (1, 10, 10))
+
+    def test_relative_error_is_bounded(self):
+        histogram = Histogram()
+        for value in range(1, 100001):
+            histogram.record(value)
+        for quantile in (0.5, 0.9, 0.99):
+            expected = quantile * 100000
+            self.assertLess(abs(histogram.percentile(quantile) - expected) / expected, 0.035)
+
+    def test_bucket_indexes_are_contiguous(self):
+        histogram = Histogram(sub_bucket_bits=3)
+        indexes = [histogram._index(value) for value in range(1, 1000)]
+        self.assertEqual(sorted(set(indexes)), list(range(1, max(indexes) + 1)))
+        for value in range(1, 1000):
+            self.assertGreaterEqual(histogram._upper_bound(histogram._index(value)), value)
+
+    def test_empty_percentile(self):
+        self.assertIsNone(Histogram().percentile(0.5))
+
+
+class TestRequestMetrics(unittest.TestCase):
+    """Unit tests for RequestMetrics"""
+
+    def test_snapshot_and_codes(self):
+        metrics = RequestMetrics()
+        metrics.record(c.TICKER_INFO, 'network', 0.010)
+        metrics.record(c.TICKER_INFO, 'network', 0.020)
+        metrics.after('GET', c.TICKER_INFO, {}, {'code': '0'}, None, 0.03)
+        metrics.after('GET', c.TICKER_INFO, {}, None, httpx.ConnectError('down'), 0.03)
+        snapshot = metrics.snapshot()[c.TICKER_INFO]
+        self.assertEqual(snapshot['network']['count'], 2)
+        self.assertAlmostEqual(snapshot['network']['mean'], 0.015, places=4)
+        self.assertIn('p999', snapshot['network'])
+        self.assertEqual(snapshot['codes'], {'0': 1, 'ConnectError': 1})
+
+    def test_prometheus_export(self):
+        metrics = RequestMetrics(quantiles=(0.5,))
+        metrics.record(c.TICKER_INFO, 'total', 0.001)
+        metrics.count(c.TICKER_INFO, '0')
+        text = metrics.to_prometheus()
+        self.assertIn('okx_request_seconds{path="%s",phase="total",quantile="0.5"} 0.001' % c.TICKER_INFO, text)
+        self.assertIn('okx_request_seconds_count{path="%s",phase="total"} 1' % c.TICKER_INFO, text)
+        self.assertIn('okx_request_codes_total{path="%s",code="0"} 1' % c.TICKER_INFO, text)
+
+    def test_hooks(self):
+        metrics = RequestMetrics()
+        pre, post = MagicMock(), MagicMock()
+        metrics.add_pre_hook(pre)
+        metrics.add_post_hook(post)
+        metrics.before('GET', c.TICKER_INFO, {'instId': 'BTC-USDT'})
+        metrics.after('GET', c.TICKER_INFO, {'instId': 'BTC-USDT'}, {'code': '0'}, None, 0.5)
+        pre.assert_called_once_with('GET', c.TICKER_INFO, {'instId': 'BTC-USDT'})
+        post.assert_called_once_with('GET', c.TICKER_INFO, {'instId': 'BTC-USDT'}, {'code': '0'}, None, 0.5)
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Unit tests for the metrics client option"""
+
+    def test_request_phases_are_recorded(self):
+        from okx.Trade import TradeAPI
+        api = TradeAPI('key', 'secret', 'pass', metrics=True, rate_limiter=MagicMock(**{'acquire.return_value': 0.0}))
+        with patch.object(api, 'post', return_value=httpx.Response(200, json={'code': '1', 'data': []})):
+            api.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', px='1')
+        phases = api.metrics.snapshot()[c.PLACR_ORDER]
+        self.assertEqual(set(phases), {'ratelimit', 'serialize', 'sign', 'network', 'decode', 'total', 'codes'})
+        self.assertEqual(phases['codes'], {'1': 1})
+        api.close()
+
+    def test_failed_request_is_counted_and_raised(self):
+        from okx.MarketData import MarketAPI
+        api = MarketAPI(metrics=True)
+        with patch.object(api, 'get', side_effect=httpx.ReadTimeout('slow')):
+            with self.assertRaises(httpx.ReadTimeout):
+                api.get_ticker('BTC-USDT')
+        self.assertEqual(api.metrics.snapshot()[c.TICKER_INFO]['codes'], {'ReadTimeout': 1})
+        api.close()
+
+    def test_async_client_records_network_time(self):
+        from okx.MarketData import AsyncMarketAPI
+        api = AsyncMarketAPI(metrics=True)
+
+        async def run_test():
+            with patch.object(api, 'get', new_callable=AsyncMock) as mock_get:
+                mock_get.return_value = httpx.Response(200, json={'code': '0', 'data': []})
+                await api.get_ticker('BTC-USDT')
+            await api.aclose()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(api.metrics.snapshot()[c.TICKER_INFO]['network']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for okx.models module
+
+Mirrors the structure: okx/models.py -> test/unit/okx/test_models.py
+"""
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import httpx
+
+from okx import consts as c
+from okx.models import ModelDecoder, Ticker, Candle, OrderBook, Balance, Order
+
+
+TICKER_RESPONSE = {
+    'code': '0', 'msg': '',
+    'data': [{'instType': 'SWAP', 'instId': 'BTC-USDT-SWAP', 'last': '65000.1', 'lastSz': '2', 'askPx': '65000.2',
+              'askSz': '10', 'bidPx': '65000.1', 'bidSz': '5', 'open24h': '64000', 'high24h': '66000',
+              'low24h': '63000', 'volCcy24h': '1000', 'vol24h': '100000', 'sodUtc0': '', 'sodUtc8': '',
+              'ts': '1700000000000'}]
+}
+
+
+class TestModels(unittest.TestCase):
+    """Unit tests for individual models"""
+
+    def test_ticker_converts_numbers(self):
+        ticker = Ticker.from_dict(TICKER_RESPONSE['data'][0], Decimal)
+        self.assertEqual(ticker.instId, 'BTC-USDT-SWAP')
+        self.assertEqual(ticker.askPx - ticker.bidPx, Decimal('0.1'))
+        self.assertIsNone(ticker.sodUtc0)
+        self.assertEqual(ticker.ts, 1700000000000)
+        self.assertFalse(hasattr(ticker, '__dict__'))
+
+    def test_candle_from_full_and_short_rows(self):
+        candle = Candle.from_row(['1700000000000', '1', '3', '0.5', '2', '10', '20', '30', '1'])
+        self.assertEqual((candle.ts, candle.open, candle.high, candle.low, candle.close), (1700000000000, 1.0, 3.0, 0.5, 2.0))
+        self.assertEqual(candle.volCcyQuote, 30.0)
+        self.assertEqual(candle.confirm, '1')
+        index_candle = Candle.from_row(['1700000000000', '1', '3', '0.5', '2', '0'])
+        self.assertIsNone(index_candle.vol)
+        self.assertEqual(index_candle.confirm, '0')
+
+    def test_order_book_levels(self):
+        book = OrderBook.from_dict({'asks': [['41006.8', '0.6', '0', '1']], 'bids': [['41006.3', '0.3', '0', '2']],
+                                    'ts': '1700000000000'})
+        self.assertEqual(book.asks, [(41006.8, 0.6, 1)])
+        self.assertEqual(book.bids, [(41006.3, 0.3, 2)])
+
+    def test_balance_details(self):
+        balance = Balance.from_dict({'totalEq': '100.5', 'uTime': '1', 'details': [{'ccy': 'USDT', 'eq': '100.5'}]})
+        self.assertEqual(balance.totalEq, 100.5)
+        self.assertEqual(balance.details[0].ccy, 'USDT')
+        self.assertEqual(balance.details[0].eq, 100.5)
+
+
+class TestModelDecoder(unittest.TestCase):
+    """Unit tests for ModelDecoder"""
+
+    def test_decodes_mapped_endpoint(self):
+        decoder = ModelDecoder('decimal')
+        result = decoder.decode(c.GET, c.TICKER_INFO, dict(TICKER_RESPONSE))
+        self.assertIsInstance(result['data'][0], Ticker)
+        self.assertEqual(result['data'][0].last, Decimal('65000.1'))
+
+    def test_place_order_response_is_not_decoded(self):
+        """POST to the order path shares ORDER_INFO's path but returns acknowledgements"""
+        response = {'code': '0', 'data': [{'ordId': '1', 'sCode': '0'}]}
+        self.assertEqual(ModelDecoder().decode(c.POST, c.PLACR_ORDER, response), response)
+
+    def test_error_response_is_not_decoded(self):
+        response = {'code': '51001', 'msg': 'Instrument ID does not exist', 'data': []}
+        self.assertEqual(ModelDecoder().decode(c.GET, c.TICKER_INFO, response), response)
+
+    def test_invalid_number_type(self):
+        with self.assertRaises(ValueError):
+            ModelDecoder('int8')
+
+    def test_client_response_models(self):
+        from okx.Trade import TradeAPI
+        api = TradeAPI(response_models='float')
+        response = httpx.Response(200, json={'code': '0', 'data': [{'ordId': '1', 'px': '10.5', 'cTime': '5'}]})
+        with patch.object(api, 'get', return_value=response):
+            result = api.get_order_list(instId='BTC-USDT')
+        order = result['data'][0]
+        self.assertIsInstance(order, Order)
+        self.assertEqual((order.ordId, order.px, order.cTime), ('1', 10.5, 5))
+        api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,16 @@ Unit tests for okx.okxclient module
 
 Mirrors the structure: okx/okxclient.py -> test/unit/okx/test_okxclient.py
 """
+import asyncio
+import json
+import time
 import unittest
 import warnings
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import httpx
+
+from okx.okxclient import OkxClient
 
 # Test constants
 MOCK_CLIENT_INIT = 'okx.okxclient.Client.__init__'
@@ -186,6 +193,273 @@ class TestOkxClientRequest(unittest.TestCase):
             mock_request.assert_called_once_with('GET', TEST_API_ENDPOINT, params)
 
 
+class TestAsyncOkxClient(unittest.TestCase):
+    """Unit tests for AsyncOkxClient and the generated async API classes"""
+
+    def test_async_request_get_is_awaitable_and_signed(self):
+        """Test AsyncOkxClient._request builds the query string and signs GET requests"""
+        from okx.okxclient import AsyncOkxClient
+        client = AsyncOkxClient(api_key='test_key', api_secret_key='test_secret', passphrase='test_pass', flag='0')
+        mock_response = httpx.Response(200, json={'code': '0', 'data': []})
+
+        async def run_test():
+            with patch.object(client, 'get', new_callable=AsyncMock) as mock_get:
+                mock_get.return_value = mock_response
+                result = await client._request_with_params('GET', TEST_API_ENDPOINT, {'instId': 'BTC-USDT', 'sz': ''})
+                self.assertEqual(result, {'code': '0', 'data': []})
+                path = mock_get.call_args[0][0]
+                headers = mock_get.call_args.kwargs['headers']
+                self.assertEqual(path, TEST_API_ENDPOINT + '?instId=BTC-USDT')
+                self.assertEqual(headers['OK-ACCESS-KEY'], 'test_key')
+                self.assertIn('OK-ACCESS-SIGN', headers)
+            await client.aclose()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_async_request_post_sends_json_body(self):
+        """Test AsyncOkxClient._request posts the JSON encoded params"""
+        from okx.okxclient import AsyncOkxClient
+        client = AsyncOkxClient(flag='1')
+        mock_response = httpx.Response(200, json={'code': '0'})
+
+        async def run_test():
+            with patch.object(client, 'post', new_callable=AsyncMock) as mock_post:
+                mock_post.return_value = mock_response
+                await client._request_with_params('POST', TEST_API_ENDPOINT, {'instId': 'BTC-USDT'})
+                self.assertEqual(json.loads(mock_post.call_args.kwargs['content']), {'instId': 'BTC-USDT'})
+                self.assertNotIn('OK-ACCESS-SIGN', mock_post.call_args.kwargs['headers'])
+            await client.aclose()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_generated_async_api_reuses_api_methods(self):
+        """Test make_async_api exposes every API method on an AsyncOkxClient subclass"""
+        from okx.okxclient import AsyncOkxClient
+        from okx.MarketData import MarketAPI, AsyncMarketAPI
+        from okx import consts as c
+
+        self.assertTrue(issubclass(AsyncMarketAPI, AsyncOkxClient))
+        self.assertFalse(issubclass(AsyncMarketAPI, OkxClient))
+        self.assertIs(AsyncMarketAPI.get_ticker, MarketAPI.get_ticker)
+        api = AsyncMarketAPI(flag='0')
+        self.assertEqual(api.flag, '0')
+
+        async def run_test():
+            with patch.object(AsyncMarketAPI, '_request', new_callable=AsyncMock) as mock_request:
+                mock_request.return_value = {'code': '0'}
+                result = await api.get_ticker('BTC-USDT')
+                self.assertEqual(result, {'code': '0'})
+                mock_request.assert_called_once_with(c.GET, c.TICKER_INFO, {'instId': 'BTC-USDT'})
+            await api.aclose()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+class TestBatchRequests(unittest.TestCase):
+    """Unit tests for chunked batch order requests"""
+
+    @staticmethod
+    def _echo(method, request_path, chunk):
+        data = [{'clOrdId': order['clOrdId'], 'ordId': 'o' + order['clOrdId'], 'sCode': '0', 'sMsg': ''}
+                for order in chunk]
+        return {'code': '0', 'msg': '', 'data': data}
+
+    def test_small_batch_is_one_request(self):
+        """Test batches within the limit are sent unchanged"""
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(20)]
+        with patch.object(client, '_request', side_effect=self._echo) as mock_request:
+            result = client._request_batch('POST', TEST_API_ENDPOINT, orders)
+        mock_request.assert_called_once_with('POST', TEST_API_ENDPOINT, orders)
+        self.assertEqual(len(result['data']), 20)
+        client.close()
+
+    def test_large_batch_is_chunked_and_merged_in_order(self):
+        """Test oversized batches are split into chunks of 20 and results keep the input order"""
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(45)]
+        with patch.object(client, '_request', side_effect=self._echo) as mock_request:
+            result = client._request_batch('POST', TEST_API_ENDPOINT, orders)
+        self.assertEqual(sorted(len(call[0][2]) for call in mock_request.call_args_list), [5, 20, 20])
+        self.assertEqual(result['code'], '0')
+        self.assertEqual([item['clOrdId'] for item in result['data']], [str(i) for i in range(45)])
+        client.close()
+
+    def test_rejected_chunk_reports_per_item_status(self):
+        """Test a chunk failing as a whole yields per-item results and a partial success code"""
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(25)]
+
+        def respond(method, request_path, chunk):
+            if chunk[0]['clOrdId'] == '20':
+                return {'code': '50011', 'msg': 'Too Many Requests', 'data': []}
+            return self._echo(method, request_path, chunk)
+
+        with patch.object(client, '_request', side_effect=respond):
+            result = client._request_batch('POST', TEST_API_ENDPOINT, orders)
+        self.assertEqual(result['code'], '2')
+        self.assertEqual(result['msg'], 'Too Many Requests')
+        self.assertEqual(len(result['data']), 25)
+        self.assertEqual(result['data'][20], {'ordId': '', 'clOrdId': '20', 'sCode': '50011',
+                                              'sMsg': 'Too Many Requests'})
+        client.close()
+
+    def test_sync_chunks_are_sent_concurrently_in_order(self):
+        """Test sync chunks are sent at once from gather threads and merged in input order"""
+        import threading
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(45)]
+        barrier = threading.Barrier(3, timeout=2)
+        threads = []
+
+        def respond(method, request_path, chunk):
+            threads.append(threading.current_thread())
+            # Reverse the completion order of the chunks
+            barrier.wait()
+            time.sleep(0.01 * (2 - int(chunk[0]['clOrdId']) // 20))
+            return self._echo(method, request_path, chunk)
+
+        with patch.object(client, '_request', side_effect=respond):
+            result = client._request_batch('POST', TEST_API_ENDPOINT, orders)
+        self.assertEqual(result['code'], '0')
+        self.assertEqual([item['clOrdId'] for item in result['data']], [str(i) for i in range(45)])
+        self.assertNotIn(threading.current_thread(), threads)
+        client.close()
+
+    def test_chunked_batch_inside_gather_does_not_wait_on_its_own_pool(self):
+        """Test a chunked batch sent from a gather thread runs its chunks in turn instead of deadlocking"""
+        from functools import partial
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(45)]
+        with patch.object(client, '_request', side_effect=self._echo), \
+                patch('okx.okxclient.GATHER_MAX_WORKERS', 1):
+            results = client.gather([partial(client._request_batch, 'POST', TEST_API_ENDPOINT, orders)])
+        self.assertEqual(len(results[0]['data']), 45)
+        client.close()
+
+    def test_raising_chunk_keeps_results_of_other_chunks(self):
+        """Test a chunk whose request raises becomes per-item failures instead of raising"""
+        from okx.exceptions import OkxParamsException
+        client = OkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(45)]
+
+        def respond(method, request_path, chunk):
+            if chunk[0]['clOrdId'] == '20':
+                raise httpx.ReadError('connection reset')
+            if chunk[0]['clOrdId'] == '40':
+                raise OkxParamsException('sz must be positive')
+            return self._echo(method, request_path, chunk)
+
+        with patch.object(client, '_request', side_effect=respond):
+            result = client._request_batch('POST', TEST_API_ENDPOINT, orders)
+        self.assertEqual(result['code'], '2')
+        self.assertEqual([item['sCode'] for item in result['data'][19:21]], ['0', '-1'])
+        self.assertEqual(result['data'][20]['sMsg'], 'connection reset')
+        self.assertEqual(result['data'][44], {'ordId': '', 'clOrdId': '44', 'sCode': '-1',
+                                              'sMsg': 'sz must be positive'})
+        client.close()
+
+    def test_all_chunks_failing_is_code_1(self):
+        """Test the merged code is '1' when no item succeeded"""
+        merged = OkxClient._merge_batch([[{'clOrdId': 'a'}]], [{'code': '51000', 'msg': 'Parameter error',
+                                                                 'data': []}])
+        self.assertEqual((merged['code'], merged['msg']), ('1', 'Parameter error'))
+
+    def test_trade_api_uses_batch_dispatch(self):
+        """Test TradeAPI batch methods go through _request_batch"""
+        from okx.Trade import TradeAPI
+        from okx import consts as c
+        api = TradeAPI()
+        orders = [{'clOrdId': str(i)} for i in range(30)]
+        with patch.object(api, '_request', side_effect=self._echo) as mock_request:
+            result = api.place_multiple_orders(orders)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[0][1], c.BATCH_ORDERS)
+        self.assertEqual(len(result['data']), 30)
+        api.close()
+
+    def test_async_large_batch_is_gathered(self):
+        """Test AsyncOkxClient dispatches chunks concurrently and merges them in order"""
+        from okx.exceptions import OkxRateLimitException
+        from okx.okxclient import AsyncOkxClient
+        client = AsyncOkxClient()
+        orders = [{'clOrdId': str(i)} for i in range(41)]
+
+        async def respond(method, request_path, chunk):
+            await asyncio.sleep(0.01 if chunk[0]['clOrdId'] == '0' else 0)
+            return self._echo(method, request_path, chunk)
+
+        async def run_test():
+            with patch.object(client, '_request', side_effect=respond) as mock_request:
+                result = await client._request_batch('POST', TEST_API_ENDPOINT, orders)
+            self.assertEqual(mock_request.call_count, 3)
+            self.assertEqual([item['clOrdId'] for item in result['data']], [str(i) for i in range(41)])
+
+            async def fail_last(method, request_path, chunk):
+                if chunk[0]['clOrdId'] == '40':
+                    raise OkxRateLimitException(MagicMock(status_code=200, json=lambda: {
+                        'code': '50011', 'msg': 'Too Many Requests'}))
+                return self._echo(method, request_path, chunk)
+
+            with patch.object(client, '_request', side_effect=fail_last):
+                result = await client._request_batch('POST', TEST_API_ENDPOINT, orders)
+            self.assertEqual(result['code'], '2')
+            self.assertEqual(result['data'][40]['sCode'], '50011')
+            self.assertEqual(result['data'][0]['sCode'], '0')
+            await client.aclose()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+class TestGather(unittest.TestCase):
+    """Unit tests for concurrent request execution with gather"""
+
+    def test_sync_gather_runs_calls_concurrently_in_order(self):
+        """Test OkxClient.gather runs calls on worker threads and keeps their order"""
+        import threading
+        client = OkxClient()
+        barrier = threading.Barrier(3, timeout=2)
+
+        def call(value):
+            barrier.wait()
+            return value
+
+        from functools import partial
+        self.assertEqual(client.gather([partial(call, i) for i in range(3)]), [0, 1, 2])
+        client.close()
+        self.assertIsNone(client._executor)
+
+    def test_sync_gather_exceptions(self):
+        """Test gather raises the first exception or returns exceptions in place"""
+        client = OkxClient()
+
+        def fail():
+            raise httpx.ConnectError('down')
+
+        with self.assertRaises(httpx.ConnectError):
+            client.gather([fail, lambda: 1])
+        results = client.gather([fail, lambda: 1], return_exceptions=True)
+        self.assertIsInstance(results[0], httpx.ConnectError)
+        self.assertEqual(results[1], 1)
+        client.close()
+
+    def test_async_gather_accepts_awaitables_and_callables(self):
+        """Test AsyncOkxClient.gather runs coroutines and coroutine functions concurrently"""
+        from okx.okxclient import AsyncOkxClient
+        client = AsyncOkxClient()
+
+        async def call(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        async def run_test():
+            results = await client.gather([call(1), lambda: call(2)])
+            await client.aclose()
+            return results
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(run_test()), [1, 2])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,118 @@
+"""
+Unit tests for okx.ordertracker module
+
+Mirrors the structure: okx/ordertracker.py -> test/unit/okx/test_ordertracker.py
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+
+from okx.models import Order
+from okx.ordertracker import OrderTracker
+
+
+def order(ordId, state='live', uTime='1000', instId='BTC-USDT', clOrdId='', **fields):
+    return dict(ordId=ordId, clOrdId=clOrdId, instId=instId, state=state, uTime=uTime, cTime=uTime, **fields)
+
+
+def push(*orders):
+    return json.dumps({'arg': {'channel': 'orders', 'instType': 'ANY', 'uid': '1'}, 'data': list(orders)})
+
+
+class TestOrderTracker(unittest.TestCase):
+    """Unit tests for OrderTracker"""
+
+    def test_indexes_open_orders(self):
+        tracker = OrderTracker()
+        tracker.apply(order('1', clOrdId='a'))
+        tracker.apply(order('2', instId='ETH-USDT'))
+        self.assertEqual(tracker.get('1')['clOrdId'], 'a')
+        self.assertIs(tracker.by_clOrdId('a'), tracker.get('1'))
+        self.assertEqual([o['ordId'] for o in tracker.open_orders('ETH-USDT')], ['2'])
+        self.assertEqual(len(tracker), 2)
+
+    def test_closed_orders_leave_indexes(self):
+        tracker = OrderTracker()
+        tracker.apply(order('1', clOrdId='a'))
+        tracker.apply(order('1', clOrdId='a', state='filled', uTime='1001'))
+        self.assertIsNone(tracker.get('1'))
+        self.assertIsNone(tracker.by_clOrdId('a'))
+        self.assertEqual(tracker.open_orders('BTC-USDT'), [])
+
+    def test_stale_updates_are_ignored(self):
+        tracker = OrderTracker()
+        tracker.apply(order('1', state='partially_filled', uTime='2000'))
+        self.assertFalse(tracker.apply(order('1', state='live', uTime='1000')))
+        self.assertEqual(tracker.get('1')['state'], 'partially_filled')
+
+    def test_closed_orders_are_not_reopened_by_stale_updates(self):
+        tracker = OrderTracker()
+        tracker.apply(order('1', state='filled', uTime='2000'))
+        # A seed page fetched before the fill, then a late push of the open state
+        self.assertFalse(tracker.apply(order('1', state='live', uTime='1000')))
+        self.assertFalse(tracker.apply(order('1', state='partially_filled', uTime='2000')))
+        self.assertIsNone(tracker.get('1'))
+        self.assertEqual(len(tracker), 0)
+
+    def test_closed_history_is_bounded(self):
+        tracker = OrderTracker(closed_history=2)
+        for ordId in '123':
+            tracker.apply(order(ordId, state='canceled', uTime='2000'))
+        self.assertEqual(list(tracker._closed), ['2', '3'])
+        self.assertTrue(tracker.apply(order('1', uTime='1000')))
+
+    def test_listeners_receive_previous_state(self):
+        tracker = OrderTracker()
+        listener = MagicMock()
+        tracker.add_listener(listener)
+        first = order('1')
+        second = order('1', state='canceled', uTime='1001')
+        tracker.apply(first)
+        tracker.apply(second)
+        listener.assert_called_with(second, first)
+        tracker.remove_listener(listener)
+        tracker.apply(order('2'))
+        self.assertEqual(listener.call_count, 2)
+
+    def test_on_message_applies_orders_pushes_only(self):
+        tracker = OrderTracker()
+        tracker.on_message(push(order('1'), order('2')))
+        tracker.on_message(json.dumps({'event': 'subscribe', 'arg': {'channel': 'orders'}}))
+        tracker.on_message(json.dumps({'arg': {'channel': 'account'}, 'data': [{'ordId': '3'}]}))
+        tracker.on_message(json.loads(push(order('1', state='filled', uTime='1001'))))
+        self.assertEqual([o['ordId'] for o in tracker.open_orders()], ['2'])
+
+    def test_seed_pages_through_order_list(self):
+        trade = MagicMock()
+        pages = [{'code': '0', 'data': [order('2'), order('1')]}, {'code': '0', 'data': []}]
+        trade.get_order_list = MagicMock(side_effect=pages)
+        trade.get_order_list.__name__ = 'get_order_list'
+        tracker = OrderTracker(trade)
+        tracker.seed(instType='SPOT')
+        self.assertEqual(len(tracker), 2)
+        self.assertEqual(trade.get_order_list.call_args_list[1].kwargs, {'instType': 'SPOT', 'after': '1'})
+
+    def test_model_orders_are_supported(self):
+        tracker = OrderTracker()
+        tracker.apply(Order.from_dict(order('1', clOrdId='a')))
+        self.assertEqual(tracker.by_clOrdId('a').ordId, '1')
+        tracker.apply(order('1', clOrdId='a', state='canceled', uTime='1001'))
+        self.assertEqual(len(tracker), 0)
+
+    def test_subscribe_chains_existing_callback(self):
+        tracker = OrderTracker()
+        ws = MagicMock()
+        ws.callback = MagicMock()
+        ws.subscribe = AsyncMock()
+        asyncio.get_event_loop().run_until_complete(tracker.subscribe(ws, instType='SWAP'))
+        params, callback = ws.subscribe.call_args[0]
+        self.assertEqual(params, [{'channel': 'orders', 'instType': 'SWAP'}])
+        message = push(order('1'))
+        callback(message)
+        self.assertIsNotNone(tracker.get('1'))
+        ws.callback.assert_called_once_with(message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for okx.pagination module
+
+Mirrors the structure: okx/pagination.py -> test/unit/okx/test_pagination.py
+"""
+import asyncio
+import unittest
+
+from okx.exceptions import OkxRequestException
+from okx.models import Candle
+from okx.pagination import paginate, apaginate
+
+
+class FakeHistory:
+    """Serves records newest first and pages with ``after`` like the OKX history endpoints."""
+
+    def __init__(self, records, page_size=2):
+        self.records = records
+        self.page_size = page_size
+        self.calls = []
+
+    def page(self, after=None, **params):
+        self.calls.append(dict(params, after=after))
+        start = 0
+        if after:
+            start = next(i for i, r in enumerate(self.records) if r['billId'] == after) + 1
+        return {'code': '0', 'msg': '', 'data': self.records[start:start + self.page_size]}
+
+
+def make_fills(count):
+    return [{'billId': str(100 - i), 'ts': str(1000 - i)} for i in range(count)]
+
+
+class TestPaginate(unittest.TestCase):
+    """Unit tests for the sync paginator"""
+
+    def _method(self, history):
+        def get_fills_history(**params):
+            return history.page(**params)
+        return get_fills_history
+
+    def test_follows_cursor_until_history_ends(self):
+        history = FakeHistory(make_fills(5))
+        result = list(paginate(self._method(history), instType='SPOT'))
+        self.assertEqual([r['billId'] for r in result], ['100', '99', '98', '97', '96'])
+        self.assertEqual([call['after'] for call in history.calls], [None, '99', '97', '96'])
+        self.assertTrue(all(call['instType'] == 'SPOT' for call in history.calls))
+
+    def test_without_prefetch(self):
+        history = FakeHistory(make_fills(3))
+        result = list(paginate(self._method(history), prefetch=False))
+        self.assertEqual(len(result), 3)
+
+    def test_stops_at_time_bound(self):
+        history = FakeHistory(make_fills(10))
+        result = list(paginate(self._method(history), since=997, prefetch=False))
+        self.assertEqual([r['ts'] for r in result], ['1000', '999', '998', '997'])
+        self.assertEqual(len(history.calls), 3)
+
+    def test_streams_lazily(self):
+        history = FakeHistory(make_fills(10))
+        iterator = paginate(self._method(history), prefetch=False)
+        next(iterator)
+        self.assertEqual(len(history.calls), 1)
+        iterator.close()
+
+    def test_error_response_raises(self):
+        def get_fills_history(**params):
+            return {'code': '50011', 'msg': 'Too Many Requests', 'data': []}
+        with self.assertRaises(OkxRequestException):
+            list(paginate(get_fills_history))
+
+    def test_unknown_method_requires_cursor(self):
+        def get_something(**params):
+            return {'code': '0', 'data': []}
+        with self.assertRaises(ValueError):
+            list(paginate(get_something))
+        self.assertEqual(list(paginate(get_something, cursor='id')), [])
+
+    def test_candle_rows_and_models_use_timestamp(self):
+        rows = [[str(ts), '1', '2', '0.5', '1.5', '10', '10', '10', '1'] for ts in (300, 200, 100)]
+        calls = []
+
+        def get_history_candlesticks(after=None, **params):
+            calls.append(after)
+            remaining = [row for row in rows if after is None or int(row[0]) < int(after)]
+            return {'code': '0', 'data': [Candle.from_row(row) for row in remaining[:2]]}
+
+        result = list(paginate(get_history_candlesticks, instId='BTC-USDT', prefetch=False))
+        self.assertEqual([candle.ts for candle in result], [300, 200, 100])
+        self.assertEqual(calls, [None, 200, 100])
+
+
+class TestApaginate(unittest.TestCase):
+    """Unit tests for the async paginator"""
+
+    def test_follows_cursor_with_prefetch(self):
+        history = FakeHistory(make_fills(5))
+
+        async def get_bills(**params):
+            await asyncio.sleep(0)
+            return history.page(**params)
+
+        async def run_test():
+            return [r['billId'] async for r in apaginate(get_bills, ccy='USDT')]
+
+        result = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(result, ['100', '99', '98', '97', '96'])
+
+    def test_stops_at_time_bound(self):
+        history = FakeHistory(make_fills(10))
+
+        async def get_bills(**params):
+            return history.page(**params)
+
+        async def run_test():
+            return [r['ts'] async for r in apaginate(get_bills, since=999)]
+
+        result = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(result, ['1000', '999'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for okx.quoting module
+
+Mirrors the structure: okx/quoting.py -> test/unit/okx/test_quoting.py
+"""
+import asyncio
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from okx.ordertracker import OrderTracker
+from okx.quoting import QuoteManager, Quote
+
+INST = 'BTC-USDT-SWAP'
+
+
+def ok(requests):
+    data = [{'clOrdId': r['clOrdId'], 'ordId': '', 'sCode': '0', 'sMsg': ''} for r in requests]
+    return {'code': '0', 'msg': '', 'data': data}
+
+
+def trade_api():
+    api = MagicMock(spec=['place_multiple_orders', 'cancel_multiple_orders', 'amend_multiple_orders'])
+    api.place_multiple_orders.side_effect = ok
+    api.cancel_multiple_orders.side_effect = ok
+    api.amend_multiple_orders.side_effect = ok
+    return api
+
+
+LADDER = [('buy', '100', '1'), ('buy', '99', '2'), ('sell', '101', '1'), ('sell', '102', '2')]
+
+
+class TestQuoteManager(unittest.TestCase):
+    """Unit tests for QuoteManager"""
+
+    def test_first_update_places_everything(self):
+        api = trade_api()
+        quotes = QuoteManager(api, tdMode='cross', ordType='post_only', clOrdIdPrefix='t')
+        plan = quotes.update(INST, LADDER)
+        self.assertEqual((len(plan.cancels), len(plan.amends), len(plan.places)), (0, 0, 4))
+        self.assertEqual(plan.places[0], {'tdMode': 'cross', 'ordType': 'post_only', 'instId': INST, 'side': 'buy',
+                                          'px': '100', 'sz': '1', 'clOrdId': 't1'})
+        self.assertEqual(sorted(quotes.live(INST).values()),
+                         sorted(Quote(s, Decimal(p), Decimal(z)) for s, p, z in LADDER))
+        api.cancel_multiple_orders.assert_not_called()
+
+    def test_unchanged_ladder_sends_nothing(self):
+        api = trade_api()
+        quotes = QuoteManager(api)
+        quotes.update(INST, LADDER)
+        plan = quotes.update(INST, [('buy', '100.0', '1'), ('buy', '99', '2.00'), ('sell', '101', '1'),
+                                    ('sell', '102', '2')])
+        self.assertEqual(plan, ([], [], []))
+        self.assertEqual(api.place_multiple_orders.call_count, 1)
+
+    def test_shifted_ladder_is_amended(self):
+        api = trade_api()
+        quotes = QuoteManager(api, clOrdIdPrefix='t')
+        quotes.update(INST, LADDER)
+        plan = quotes.update(INST, [('buy', '100', '1'), ('buy', '98', '2'), ('sell', '101', '3'),
+                                    ('sell', '102', '2')])
+        self.assertEqual(plan.cancels, [])
+        self.assertEqual(plan.places, [])
+        self.assertEqual(plan.amends, [{'instId': INST, 'clOrdId': 't2', 'newPx': '98'},
+                                       {'instId': INST, 'clOrdId': 't3', 'newSz': '3'}])
+        self.assertEqual(quotes.live(INST)['t2'], Quote('buy', Decimal('98'), Decimal('2')))
+
+    def test_surplus_is_canceled_and_missing_placed(self):
+        api = trade_api()
+        quotes = QuoteManager(api, clOrdIdPrefix='t')
+        quotes.update(INST, LADDER)
+        plan = quotes.update(INST, [('buy', '100', '1'), ('sell', '101', '1'), ('sell', '102', '2'),
+                                    ('sell', '103', '1')])
+        self.assertEqual(plan.cancels, [{'instId': INST, 'clOrdId': 't2'}])
+        self.assertEqual([p['px'] for p in plan.places], ['103'])
+        self.assertNotIn('t2', quotes.live(INST))
+
+    def test_failed_place_is_retried_next_update(self):
+        api = trade_api()
+        api.place_multiple_orders.side_effect = lambda requests: {'code': '50011', 'msg': 'Too Many Requests',
+                                                                  'data': []}
+        quotes = QuoteManager(api)
+        quotes.update(INST, LADDER[:1])
+        self.assertEqual(quotes.live(INST), {})
+        api.place_multiple_orders.side_effect = ok
+        self.assertEqual(len(quotes.update(INST, LADDER[:1]).places), 1)
+
+    def test_gone_orders_leave_book_on_amend_failure(self):
+        api = trade_api()
+        quotes = QuoteManager(api, clOrdIdPrefix='t')
+        quotes.update(INST, LADDER[:1])
+        api.amend_multiple_orders.side_effect = lambda requests: {
+            'code': '1', 'msg': '', 'data': [{'clOrdId': 't1', 'ordId': '', 'sCode': '51503', 'sMsg': 'gone'}]}
+        quotes.update(INST, [('buy', '99', '1')])
+        self.assertEqual(quotes.live(INST), {})
+
+    def test_tracker_removes_filled_quotes(self):
+        tracker = OrderTracker()
+        quotes = QuoteManager(trade_api(), clOrdIdPrefix='t', tracker=tracker)
+        quotes.update(INST, LADDER[:1])
+        tracker.apply({'ordId': '1', 'clOrdId': 't1', 'instId': INST, 'state': 'filled', 'uTime': '1'})
+        self.assertEqual(quotes.live(INST), {})
+
+    def test_aupdate_with_websocket(self):
+        ws = MagicMock(spec=['batch_orders', 'batch_cancel_orders', 'batch_amend_orders'])
+        sent = []
+
+        def op(name):
+            async def send(args):
+                sent.append((name, len(args)))
+                return dict(ok(args), op=name, id='1')
+            return send
+
+        ws.batch_orders = op('batch-orders')
+        ws.batch_cancel_orders = op('batch-cancel-orders')
+        ws.batch_amend_orders = op('batch-amend-orders')
+        quotes = QuoteManager(ws)
+        ladder = [('buy', str(100 - i), '1') for i in range(25)]
+        asyncio.get_event_loop().run_until_complete(quotes.aupdate(INST, ladder))
+        self.assertEqual(sent, [('batch-orders', 20), ('batch-orders', 5)])
+        self.assertEqual(len(quotes.live(INST)), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for okx.ratelimit module
+
+Mirrors the structure: okx/ratelimit.py -> test/unit/okx/test_ratelimit.py
+"""
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import httpx
+
+import okx.ratelimit as ratelimit_module
+from okx.ratelimit import TokenBucket, RateLimiter, SCOPE_ENDPOINT, SCOPE_INSTRUMENT
+from okx import consts as c
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Unit tests for TokenBucket reservations"""
+
+    def test_reserve_within_capacity_has_no_delay(self):
+        bucket = TokenBucket(2, 1)
+        self.assertEqual(bucket.reserve(1, now=bucket.updated), 0.0)
+        self.assertEqual(bucket.reserve(1, now=bucket.updated), 0.0)
+
+    def test_reserve_over_capacity_queues_in_order(self):
+        bucket = TokenBucket(2, 1)
+        now = bucket.updated
+        bucket.reserve(2, now=now)
+        self.assertAlmostEqual(bucket.reserve(1, now=now), 0.5)
+        self.assertAlmostEqual(bucket.reserve(1, now=now), 1.0)
+
+    def test_tokens_refill_over_time(self):
+        bucket = TokenBucket(2, 1)
+        now = bucket.updated
+        bucket.reserve(2, now=now)
+        self.assertEqual(bucket.reserve(1, now=now + 0.5), 0.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Unit tests for RateLimiter"""
+
+    def test_unknown_path_is_not_limited(self):
+        limiter = RateLimiter()
+        for _ in range(1000):
+            self.assertEqual(limiter.reserve('/api/v5/unknown'), 0.0)
+
+    def test_default_limit_applies_to_unknown_paths(self):
+        limiter = RateLimiter(default_limit=(1, 1))
+        self.assertEqual(limiter.reserve('/api/v5/unknown'), 0.0)
+        self.assertGreater(limiter.reserve('/api/v5/unknown'), 0.0)
+
+    def test_endpoint_limit_from_default_table(self):
+        limiter = RateLimiter()
+        requests = ratelimit_module.DEFAULT_LIMITS[c.MARKET_CANDLES][0]
+        delays = [limiter.reserve(c.MARKET_CANDLES, {'instId': 'BTC-USDT'}) for _ in range(requests + 1)]
+        self.assertTrue(all(d == 0.0 for d in delays[:-1]))
+        self.assertGreater(delays[-1], 0.0)
+
+    def test_instrument_scope_uses_separate_buckets(self):
+        limiter = RateLimiter(limits={c.PLACR_ORDER: (1, 2, SCOPE_INSTRUMENT)})
+        self.assertEqual(limiter.reserve(c.PLACR_ORDER, {'instId': 'BTC-USDT'}), 0.0)
+        self.assertEqual(limiter.reserve(c.PLACR_ORDER, {'instId': 'ETH-USDT'}), 0.0)
+        self.assertGreater(limiter.reserve(c.PLACR_ORDER, {'instId': 'BTC-USDT'}), 0.0)
+
+    def test_batch_orders_count_each_order(self):
+        limiter = RateLimiter(limits={c.BATCH_ORDERS: (3, 1, SCOPE_INSTRUMENT)})
+        orders = [{'instId': 'BTC-USDT'}] * 3 + [{'instId': 'ETH-USDT'}]
+        self.assertEqual(limiter.reserve(c.BATCH_ORDERS, orders), 0.0)
+        self.assertAlmostEqual(limiter.reserve(c.BATCH_ORDERS, [{'instId': 'BTC-USDT'}]), 1 / 3, places=2)
+
+    def test_stats_report_queueing_delay(self):
+        limiter = RateLimiter(limits={c.TICKER_INFO: (1, 1, SCOPE_ENDPOINT)})
+        limiter.reserve(c.TICKER_INFO)
+        limiter.reserve(c.TICKER_INFO)
+        stats = limiter.stats(c.TICKER_INFO)
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['delayed'], 1)
+        self.assertGreater(stats['totalDelay'], 0.0)
+        self.assertEqual(limiter.stats('/api/v5/other')['requests'], 0)
+
+    def test_acquire_sleeps_for_delay(self):
+        limiter = RateLimiter()
+        with patch.object(limiter, 'reserve', return_value=0.25), \
+             patch.object(ratelimit_module.time, 'sleep') as mock_sleep:
+            self.assertEqual(limiter.acquire(c.TICKER_INFO), 0.25)
+            mock_sleep.assert_called_once_with(0.25)
+
+    def test_acquire_async_awaits_delay(self):
+        limiter = RateLimiter()
+
+        async def run_test():
+            with patch.object(limiter, 'reserve', return_value=0.25), \
+                 patch.object(ratelimit_module.asyncio, 'sleep', new_callable=AsyncMock) as mock_sleep:
+                self.assertEqual(await limiter.acquire_async(c.TICKER_INFO), 0.25)
+                mock_sleep.assert_awaited_once_with(0.25)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_shared_returns_one_limiter_per_key(self):
+        self.assertIs(RateLimiter.shared('key-a'), RateLimiter.shared('key-a'))
+        self.assertIsNot(RateLimiter.shared('key-a'), RateLimiter.shared('key-b'))
+
+    def test_client_acquires_before_sending(self):
+        from okx.MarketData import MarketAPI
+        limiter = MagicMock()
+        api = MarketAPI(rate_limiter=limiter)
+        response = httpx.Response(200, json={'code': '0'})
+        with patch.object(api, 'get', return_value=response):
+            api.get_ticker('BTC-USDT')
+        limiter.acquire.assert_called_once_with(c.TICKER_INFO, {'instId': 'BTC-USDT'})
+        api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
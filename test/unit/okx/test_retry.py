@@ -0,0 +1,155 @@
+"""
+Unit tests for okx.retry module
+
+Mirrors the structure: okx/retry.py -> test/unit/okx/test_retry.py
+"""
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+import httpx
+
+from okx import consts as c
+from okx.exceptions import (api_exception, OkxAPIException, OkxRateLimitException, OkxServiceUnavailableException,
+                            OkxTimeoutException)
+from okx.retry import RetryPolicy
+
+
+def response(code='0', status=200, data=None):
+    return httpx.Response(status, json={'code': code, 'msg': 'msg %s' % code, 'data': data or []})
+
+
+class TestApiException(unittest.TestCase):
+    """Unit tests for the typed exceptions of api_exception"""
+
+    def test_codes_map_to_types(self):
+        self.assertIs(type(api_exception(response('50011'))), OkxRateLimitException)
+        self.assertIs(type(api_exception(response('50061'))), OkxRateLimitException)
+        self.assertIs(type(api_exception(response('50013'))), OkxServiceUnavailableException)
+        self.assertIs(type(api_exception(response('50004'))), OkxTimeoutException)
+        self.assertIs(type(api_exception(response('51008'))), OkxAPIException)
+
+    def test_http_statuses_map_to_types(self):
+        self.assertIs(type(api_exception(httpx.Response(429, text='Too Many Requests'))), OkxRateLimitException)
+        error = api_exception(httpx.Response(502, text='<html>Bad Gateway</html>'))
+        self.assertIs(type(error), OkxServiceUnavailableException)
+        self.assertIn('Invalid JSON', error.message)
+        self.assertEqual(error.status_code, 502)
+
+    def test_decoded_result_is_used(self):
+        error = api_exception(httpx.Response(200, text='ignored'), {'code': '51008', 'msg': 'Insufficient balance'})
+        self.assertEqual((error.code, error.message), ('51008', 'Insufficient balance'))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Unit tests for RetryPolicy classification and backoff"""
+
+    def test_batch_codes_are_not_errors(self):
+        policy = RetryPolicy()
+        for code in ('0', '1', '2'):
+            policy.check(response(code), {'code': code})
+        with self.assertRaises(OkxServiceUnavailableException):
+            policy.check(response('50013'), {'code': '50013', 'msg': 'busy'})
+
+    def test_idempotent_requests(self):
+        self.assertTrue(RetryPolicy.is_idempotent(c.GET, c.TICKER_INFO, {}))
+        self.assertTrue(RetryPolicy.is_idempotent(c.POST, c.CANCEL_ORDER, {'ordId': '1'}))
+        self.assertTrue(RetryPolicy.is_idempotent(c.POST, c.PLACR_ORDER, {'clOrdId': 'a'}))
+        self.assertFalse(RetryPolicy.is_idempotent(c.POST, c.PLACR_ORDER, {'clOrdId': ''}))
+        self.assertFalse(RetryPolicy.is_idempotent(c.POST, c.BATCH_ORDERS, [{'clOrdId': 'a'}, {}]))
+        self.assertTrue(RetryPolicy.is_idempotent(c.POST, c.PLACE_ALGO_ORDER, {'algoClOrdId': 'a'}))
+        self.assertFalse(RetryPolicy.is_idempotent(c.POST, c.FUNDS_TRANSFER, {}))
+
+    def test_retryable_errors(self):
+        policy = RetryPolicy()
+        busy = api_exception(response('50013'))
+        self.assertTrue(policy.is_retryable(busy, True))
+        self.assertFalse(policy.is_retryable(busy, False))
+        self.assertTrue(policy.is_retryable(api_exception(response('50011')), False))
+        self.assertFalse(policy.is_retryable(api_exception(response('51008')), True))
+        self.assertTrue(policy.is_retryable(httpx.ConnectError('refused'), False))
+        self.assertTrue(policy.is_retryable(httpx.ReadTimeout('slow'), True))
+        self.assertFalse(policy.is_retryable(httpx.ReadTimeout('slow'), False))
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3, rate_limit_delay=1)
+        delays = [policy.backoff(5, None) for _ in range(200)]
+        self.assertTrue(all(0 <= delay <= 0.3 for delay in delays))
+        self.assertGreater(len(set(delays)), 100)
+        self.assertGreaterEqual(policy.backoff(1, api_exception(response('50011'))), 1)
+
+    @patch('okx.retry.time.sleep')
+    def test_call_retries_until_success(self, mock_sleep):
+        on_retry = MagicMock()
+        policy = RetryPolicy(max_attempts=3, on_retry=on_retry)
+        send = MagicMock(side_effect=[api_exception(response('50013')), httpx.ReadTimeout('slow'), {'code': '0'}])
+        self.assertEqual(policy.call(send, c.GET, c.TICKER_INFO, {}), {'code': '0'})
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(policy.retries, 2)
+        self.assertEqual(on_retry.call_args_list[0][0][:3], (c.GET, c.TICKER_INFO, 1))
+
+    @patch('okx.retry.time.sleep')
+    def test_call_raises_when_exhausted_or_unsafe(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=2)
+        send = MagicMock(side_effect=api_exception(response('50013')))
+        with self.assertRaises(OkxServiceUnavailableException):
+            policy.call(send, c.GET, c.TICKER_INFO, {})
+        self.assertEqual(send.call_count, 2)
+        send = MagicMock(side_effect=httpx.ReadTimeout('slow'))
+        with self.assertRaises(httpx.ReadTimeout):
+            policy.call(send, c.POST, c.PLACR_ORDER, {'instId': 'BTC-USDT'})
+        self.assertEqual(send.call_count, 1)
+
+
+class TestClientRetryPolicy(unittest.TestCase):
+    """Unit tests for the retry_policy client option"""
+
+    @patch('okx.retry.time.sleep')
+    def test_order_with_clOrdId_is_retried(self, mock_sleep):
+        from okx.Trade import TradeAPI
+        api = TradeAPI('key', 'secret', 'pass', retry_policy=True)
+        placed = response('0', data=[{'ordId': '1', 'clOrdId': 'a', 'sCode': '0'}])
+        with patch.object(api, 'post', side_effect=[response('50004'), placed]) as mock_post:
+            result = api.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', px='1', clOrdId='a')
+        self.assertEqual(result['data'][0]['ordId'], '1')
+        self.assertEqual(mock_post.call_count, 2)
+        api.close()
+
+    def test_order_failures_are_returned_and_errors_raised(self):
+        from okx.Trade import TradeAPI
+        api = TradeAPI('key', 'secret', 'pass', retry_policy=True)
+        rejected = response('1', data=[{'sCode': '51008', 'sMsg': 'Insufficient balance'}])
+        with patch.object(api, 'post', return_value=rejected):
+            self.assertEqual(api.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', px='1')['code'], '1')
+        with patch.object(api, 'post', return_value=response('50013')) as mock_post:
+            with self.assertRaises(OkxServiceUnavailableException):
+                api.place_order('BTC-USDT', 'cash', 'buy', 'limit', '1', px='1')
+        mock_post.assert_called_once()
+        api.close()
+
+    def test_without_policy_errors_are_returned(self):
+        from okx.MarketData import MarketAPI
+        api = MarketAPI()
+        with patch.object(api, 'get', return_value=response('50011', status=429)):
+            self.assertEqual(api.get_ticker('BTC-USDT')['code'], '50011')
+        api.close()
+
+    def test_async_client_retries_rate_limit(self):
+        from okx.MarketData import AsyncMarketAPI
+        api = AsyncMarketAPI(retry_policy=RetryPolicy(rate_limit_delay=0, base_delay=0))
+
+        async def run_test():
+            with patch.object(api, 'get', new_callable=AsyncMock) as mock_get:
+                mock_get.side_effect = [response('50011', status=429), response('0', data=[{'instId': 'BTC-USDT'}])]
+                result = await api.get_ticker('BTC-USDT')
+                self.assertEqual(mock_get.call_count, 2)
+            await api.aclose()
+            return result
+
+        result = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(result['data'][0]['instId'], 'BTC-USDT')
+
+
+if __name__ == '__main__':
+    unittest.main()
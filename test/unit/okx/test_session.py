@@ -0,0 +1,120 @@
+"""
+Unit tests for okx.session module
+
+Mirrors the structure: okx/session.py -> test/unit/okx/test_session.py
+"""
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+
+from okx.session import OkxSession, AsyncOkxSession
+from okx.MarketData import MarketAPI, AsyncMarketAPI
+from okx.Trade import TradeAPI
+
+
+def _ok_handler(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={'code': '0', 'msg': '', 'data': []})
+    return handler
+
+
+class TestOkxSession(unittest.TestCase):
+    """Unit tests for the sync OkxSession hub"""
+
+    def test_pool_limits_are_configurable(self):
+        """Test pool limits are built from the session parameters"""
+        session = OkxSession(max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.0)
+        self.assertEqual(session.limits.max_connections, 7)
+        self.assertEqual(session.limits.max_keepalive_connections, 3)
+        self.assertEqual(session.limits.keepalive_expiry, 12.0)
+        session.close()
+
+    def test_facades_are_cached_and_share_transport(self):
+        """Test every facade is created once and routes through the session transport"""
+        requests = []
+        session = OkxSession(flag='0')
+        session.transport = httpx.MockTransport(_ok_handler(requests))
+
+        self.assertIsInstance(session.market, MarketAPI)
+        self.assertIs(session.market, session.market)
+        self.assertIsInstance(session.trade, TradeAPI)
+
+        session.market.get_ticker('BTC-USDT')
+        session.public.get_system_time()
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0].url.path, '/api/v5/market/ticker')
+        self.assertEqual(requests[0].headers['x-simulated-trading'], '0')
+
+    def test_concurrent_threads_get_one_facade(self):
+        """Test threads asking for the same facade at once get the same instance"""
+        import threading
+        import time
+        from unittest.mock import patch
+        session = OkxSession()
+        barrier = threading.Barrier(4, timeout=2)
+        facades = []
+        created = []
+        init = MarketAPI.__init__
+
+        def slow_init(api, *args, **kwargs):
+            created.append(api)
+            time.sleep(0.02)
+            init(api, *args, **kwargs)
+
+        def get():
+            barrier.wait()
+            facades.append(session.market)
+
+        with patch.object(MarketAPI, '__init__', slow_init):
+            threads = [threading.Thread(target=get) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(facade is facades[0] for facade in facades))
+        session.close()
+
+    def test_proxy_url_is_accepted(self):
+        """Test a proxy URL string is passed to the transport as an httpx.Proxy"""
+        session = OkxSession(proxy='http://127.0.0.1:7890')
+        self.assertEqual(type(session.transport._pool).__name__, 'HTTPProxy')
+        session.close()
+
+    def test_closing_facade_keeps_shared_transport_open(self):
+        """Test closing a single facade does not close the shared pool, closing the session does"""
+        session = OkxSession()
+        session.transport = MagicMock()
+        session.market.close()
+        session.transport.close.assert_not_called()
+        session.close()
+        session.transport.close.assert_called_once()
+
+
+class TestAsyncOkxSession(unittest.TestCase):
+    """Unit tests for the asyncio AsyncOkxSession hub"""
+
+    def test_async_facades_share_transport(self):
+        """Test async facades route through the session transport"""
+        requests = []
+
+        async def handler(request):
+            return _ok_handler(requests)(request)
+
+        async def run_test():
+            async with AsyncOkxSession() as session:
+                session.transport = httpx.MockTransport(handler)
+                self.assertIsInstance(session.market, AsyncMarketAPI)
+                result = await session.market.get_ticker('BTC-USDT')
+                await session.trade.get_order_list()
+                self.assertEqual(result['code'], '0')
+                self.assertEqual(len(requests), 2)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for okx.singleflight module
+
+Mirrors the structure: okx/singleflight.py -> test/unit/okx/test_singleflight.py
+"""
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from okx.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Unit tests for thread based coalescing"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return {'code': '0'}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', fetch))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.coalesced < 4:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        calls = []
+        flight.do('key', calls.append, 1)
+        flight.do('key', calls.append, 2)
+        self.assertEqual(calls, [1, 2])
+
+    def test_error_is_raised_and_key_released(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise httpx.ConnectError('down')
+
+        with self.assertRaises(httpx.ConnectError):
+            flight.do('key', fail)
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+    def test_async_calls_share_one_task(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {'value': value}
+
+        async def run_test():
+            return await asyncio.gather(*(flight.do_async('key', fetch, 1) for _ in range(3)))
+
+        results = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(calls, [1])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.in_flight(), 0)
+
+
+class TestClientSingleFlight(unittest.TestCase):
+    """Unit tests for the single_flight client option"""
+
+    def test_only_get_requests_are_coalesced(self):
+        from okx.MarketData import MarketAPI
+        from okx import consts as c
+        api = MarketAPI(single_flight=True)
+        with patch.object(api.single_flight, 'do', return_value={'code': '0'}) as mock_do, \
+             patch.object(api, 'post', return_value=httpx.Response(200, json={'code': '0'})):
+            api.get_ticker('BTC-USDT')
+            api._request(c.POST, c.PLACR_ORDER, {'instId': 'BTC-USDT'})
+        mock_do.assert_called_once()
+        key = mock_do.call_args[0][0]
+        self.assertEqual(key[:3], (c.GET, c.TICKER_INFO, (('instId', 'BTC-USDT'),)))
+        api.close()
+
+    def test_disabled_by_default(self):
+        from okx.MarketData import MarketAPI
+        api = MarketAPI()
+        self.assertIsNone(api.single_flight)
+        api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Unit tests for okx.utils module
+
+Mirrors the structure: okx/utils.py -> test/unit/okx/test_utils.py
+"""
+import unittest
+from unittest.mock import patch
+
+from okx import utils
+from okx import consts as c
+
+
+class TestParseParamsToStr(unittest.TestCase):
+    """Unit tests for query string building"""
+
+    def test_skips_empty_and_none_values(self):
+        params = {'instId': 'BTC-USDT', 'after': '', 'before': None, 'limit': 100}
+        self.assertEqual(utils.parse_params_to_str(params), '?instId=BTC-USDT&limit=100')
+
+    def test_empty_params_give_empty_string(self):
+        self.assertEqual(utils.parse_params_to_str({}), '')
+        self.assertEqual(utils.parse_params_to_str({'instId': ''}), '')
+
+
+class TestGetTimestamp(unittest.TestCase):
+    """Unit tests for the request timestamp"""
+
+    def test_iso_format_with_milliseconds(self):
+        self.assertRegex(utils.get_timestamp(), r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$')
+
+    def test_matches_utc_time(self):
+        with patch.object(utils.time, 'time', return_value=1700000000.123):
+            self.assertEqual(utils.get_timestamp(), '2023-11-14T22:13:20.123Z')
+        with patch.object(utils.time, 'time', return_value=1700000001.5):
+            self.assertEqual(utils.get_timestamp(), '2023-11-14T22:13:21.500Z')
+
+
+class TestRequestSigner(unittest.TestCase):
+    """Unit tests for RequestSigner"""
+
+    def test_signature_matches_sign_and_pre_hash(self):
+        signer = utils.RequestSigner('key', 'secret', 'pass', '1')
+        timestamp = '2023-11-14T22:13:20.123Z'
+        body = '{"instId": "BTC-USDT"}'
+        expected = utils.sign(utils.pre_hash(timestamp, c.POST, c.PLACR_ORDER, body, False), 'secret')
+        self.assertEqual(signer.sign(timestamp + c.POST + c.PLACR_ORDER + body), expected)
+        # The keyed HMAC is reused, a second request must not carry state from the first
+        self.assertEqual(signer.sign(timestamp + c.POST + c.PLACR_ORDER + body), expected)
+
+    def test_long_secret_key_matches_hmac(self):
+        secret = 'k' * 100
+        signer = utils.RequestSigner('key', secret, 'pass', '1')
+        self.assertEqual(signer.sign('message'), utils.sign('message', secret))
+
+    def test_header_matches_get_header(self):
+        signer = utils.RequestSigner('key', 'secret', 'pass', '0')
+        timestamp = '2023-11-14T22:13:20.123Z'
+        sign = utils.sign(utils.pre_hash(timestamp, c.GET, c.TICKER_INFO, '', False), 'secret')
+        expected = utils.get_header('key', sign, timestamp, 'pass', '0', False)
+        self.assertEqual(signer.get_header(timestamp, c.GET, c.TICKER_INFO, ''), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+"""
+Unit tests for okx.validation module
+
+Mirrors the structure: okx/validation.py -> test/unit/okx/test_validation.py
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+import httpx
+
+from okx import consts as c
+from okx.exceptions import OkxParamsException
+from okx.validation import OrderValidator, inst_type_of, MODE_REJECT
+
+SWAP = {'instId': 'BTC-USDT-SWAP', 'instType': 'SWAP', 'tickSz': '0.1', 'lotSz': '0.01', 'minSz': '0.01',
+        'maxLmtSz': '100', 'maxMktSz': '50'}
+SPOT = {'instId': 'BTC-USDT', 'instType': 'SPOT', 'tickSz': '0.1', 'lotSz': '0.00000001', 'minSz': '0.00001',
+        'maxLmtSz': '9999', 'maxMktSz': '1000000'}
+
+
+def public_api(instruments=(SWAP, SPOT), buyLmt='70000', sellLmt='60000'):
+    api = MagicMock()
+    api.get_instruments.side_effect = lambda instType, **params: {
+        'code': '0', 'data': [i for i in instruments if i['instType'] == instType]}
+    api.get_price_limit.return_value = {'code': '0', 'data': [{'instId': 'BTC-USDT-SWAP', 'buyLmt': buyLmt,
+                                                               'sellLmt': sellLmt, 'enabled': True}]}
+    return api
+
+
+def limit_order(side='buy', px='65000.17', sz='1.234', instId='BTC-USDT-SWAP'):
+    return {'instId': instId, 'tdMode': 'cross', 'side': side, 'ordType': 'limit', 'px': px, 'sz': sz}
+
+
+class TestOrderValidator(unittest.TestCase):
+    """Unit tests for OrderValidator"""
+
+    def test_inst_type_of(self):
+        self.assertEqual(inst_type_of('BTC-USDT-SWAP'), 'SWAP')
+        self.assertEqual(inst_type_of('BTC-USD-250328'), 'FUTURES')
+        self.assertEqual(inst_type_of('BTC-USD-250328-60000-C'), 'OPTION')
+        self.assertEqual(inst_type_of('BTC-USDT'), 'SPOT')
+
+    def test_round_mode_rounds_passively(self):
+        validator = OrderValidator(public_api())
+        buy = validator.validate_order(limit_order('buy'))
+        sell = validator.validate_order(limit_order('sell'))
+        self.assertEqual((buy['px'], buy['sz']), ('65000.1', '1.23'))
+        self.assertEqual((sell['px'], sell['sz']), ('65000.2', '1.23'))
+
+    def test_original_order_is_not_modified(self):
+        order = limit_order()
+        OrderValidator(public_api()).validate_order(order)
+        self.assertEqual(order['px'], '65000.17')
+
+    def test_reject_mode_rejects_values_off_grid(self):
+        validator = OrderValidator(public_api(), mode=MODE_REJECT)
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order(px='65000.17', sz='1'))
+        self.assertEqual(validator.validate_order(limit_order(px='65000.1', sz='1'))['px'], '65000.1')
+
+    def test_size_bounds(self):
+        validator = OrderValidator(public_api())
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order(sz='0.005'))
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order(sz='101'))
+
+    def test_price_band(self):
+        validator = OrderValidator(public_api())
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order('buy', px='70000.1'))
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order('sell', px='59999.9'))
+        self.assertEqual(validator.validate_order(limit_order('sell', px='70000.1'))['px'], '70000.1')
+
+    def test_specs_and_limits_are_cached(self):
+        api = public_api()
+        validator = OrderValidator(api)
+        for _ in range(3):
+            validator.validate_order(limit_order())
+        api.get_instruments.assert_called_once_with('SWAP', instId='BTC-USDT-SWAP')
+        api.get_price_limit.assert_called_once_with('BTC-USDT-SWAP')
+
+    def test_spot_market_size_is_not_rounded(self):
+        validator = OrderValidator(public_api())
+        order = {'instId': 'BTC-USDT', 'side': 'buy', 'ordType': 'market', 'sz': '100.123456789'}
+        self.assertEqual(validator.validate_order(order)['sz'], '100.123456789')
+
+    def test_amend_and_algo_round_to_nearest(self):
+        validator = OrderValidator(public_api())
+        amend = validator.validate_amend({'instId': 'BTC-USDT-SWAP', 'ordId': '1', 'newPx': '65000.16',
+                                          'newSz': '2.019'})
+        self.assertEqual((amend['newPx'], amend['newSz']), ('65000.2', '2.01'))
+        algo = validator.validate_algo_order({'instId': 'BTC-USDT-SWAP', 'side': 'sell', 'ordType': 'conditional',
+                                              'sz': '1', 'tpTriggerPx': '66000.04', 'tpOrdPx': '-1'})
+        self.assertEqual((algo['tpTriggerPx'], algo['tpOrdPx']), ('66000.0', '-1'))
+
+    def test_unknown_instrument_passes_through(self):
+        validator = OrderValidator()
+        order = limit_order()
+        self.assertIs(validator.validate_order(order), order)
+
+    def test_aload_preloads_specs(self):
+        validator = OrderValidator()
+        async_public = MagicMock()
+        async_public.get_instruments = AsyncMock(return_value={'code': '0', 'data': [SWAP]})
+        async_public.get_price_limit = AsyncMock(return_value=public_api().get_price_limit('BTC-USDT-SWAP'))
+
+        async def run_test():
+            await validator.aload(async_public, 'SWAP')
+            await validator.aload_price_limit(async_public, 'BTC-USDT-SWAP')
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(validator.validate_order(limit_order())['px'], '65000.1')
+        with self.assertRaises(OkxParamsException):
+            validator.validate_order(limit_order(px='71000'))
+
+    def test_validate_request_dispatches_on_path(self):
+        validator = OrderValidator(public_api())
+        batch = validator.validate_request(c.POST, c.BATCH_ORDERS, [limit_order(), limit_order('sell')])
+        self.assertEqual([order['px'] for order in batch], ['65000.1', '65000.2'])
+        params = {'instId': 'BTC-USDT-SWAP', 'px': '1.11'}
+        self.assertIs(validator.validate_request(c.GET, c.ORDER_INFO, params), params)
+        self.assertIs(validator.validate_request(c.POST, c.CANCEL_ORDER, params), params)
+
+    def test_validate_batch_checks_items_one_by_one(self):
+        validator = OrderValidator(public_api())
+        orders = [limit_order(), limit_order(sz='0.001'), limit_order('sell')]
+        items, rejected = validator.validate_batch(c.POST, c.BATCH_ORDERS, orders)
+        self.assertEqual([order['px'] for order in items], ['65000.1', '65000.17', '65000.2'])
+        self.assertIs(items[1], orders[1])
+        self.assertEqual(list(rejected), [1])
+        self.assertIsInstance(rejected[1], OkxParamsException)
+        self.assertIsNone(validator.validate_batch(c.POST, c.PLACR_ORDER, orders[0]))
+
+
+def async_public_api(instruments=(SWAP, SPOT)):
+    from okx.PublicData import AsyncPublicAPI
+    api = MagicMock(spec=AsyncPublicAPI)
+    sync = public_api(instruments)
+    api.get_instruments = AsyncMock(side_effect=sync.get_instruments.side_effect)
+    api.get_price_limit = AsyncMock(return_value=sync.get_price_limit.return_value)
+    return api
+
+
+class TestAsyncValidation(unittest.TestCase):
+    """Unit tests for avalidate_request"""
+
+    def test_async_public_api_fetches_are_awaited(self):
+        api = async_public_api()
+        validator = OrderValidator(api)
+
+        async def run_test():
+            order = await validator.avalidate_request(c.POST, c.PLACR_ORDER, limit_order())
+            with self.assertRaises(OkxParamsException):
+                await validator.avalidate_request(c.POST, c.PLACR_ORDER, limit_order(px='71000'))
+            return order
+
+        order = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual((order['px'], order['sz']), ('65000.1', '1.23'))
+        api.get_instruments.assert_awaited_once_with('SWAP', instId='BTC-USDT-SWAP')
+        api.get_price_limit.assert_awaited_once_with('BTC-USDT-SWAP')
+
+    def test_sync_public_api_runs_off_the_event_loop(self):
+        import threading
+        api = public_api()
+        threads = []
+        api.get_instruments.side_effect = lambda instType, **params: (
+            threads.append(threading.current_thread()) or {'code': '0', 'data': [SWAP]})
+        validator = OrderValidator(api, check_price_limit=False)
+        order = asyncio.get_event_loop().run_until_complete(validator.avalidate_order(limit_order()))
+        self.assertEqual(order['px'], '65000.1')
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+
+
+class TestClientOrderValidation(unittest.TestCase):
+    """Unit tests for the order_validator client option"""
+
+    def test_invalid_order_is_not_sent(self):
+        from okx.Trade import TradeAPI
+        trade = TradeAPI(order_validator=OrderValidator(public_api()))
+        with patch.object(trade, 'post', return_value=httpx.Response(200, json={'code': '0'})) as mock_post:
+            with self.assertRaises(OkxParamsException):
+                trade.place_order('BTC-USDT-SWAP', 'cross', 'buy', 'limit', '0.001', px='65000')
+            mock_post.assert_not_called()
+            trade.place_order('BTC-USDT-SWAP', 'cross', 'buy', 'limit', '1.234', px='65000.17')
+        body = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual((body['px'], body['sz']), ('65000.1', '1.23'))
+        trade.close()
+
+    def test_rejected_batch_items_fail_alone(self):
+        from okx.Trade import TradeAPI
+        trade = TradeAPI(order_validator=OrderValidator(public_api()))
+        orders = [dict(limit_order(), clOrdId='a'), dict(limit_order(sz='0.001'), clOrdId='b'),
+                  dict(limit_order('sell'), clOrdId='c')]
+        response = {'code': '0', 'msg': '', 'data': [
+            {'clOrdId': 'a', 'ordId': '1', 'sCode': '0', 'sMsg': ''},
+            {'clOrdId': 'c', 'ordId': '2', 'sCode': '0', 'sMsg': ''}]}
+        with patch.object(trade, 'post', return_value=httpx.Response(200, json=response)) as mock_post:
+            result = trade.place_multiple_orders(orders)
+        body = json.loads(mock_post.call_args.kwargs['data'])
+        self.assertEqual([(order['clOrdId'], order['px']) for order in body], [('a', '65000.1'), ('c', '65000.2')])
+        self.assertEqual(result['code'], '2')
+        self.assertEqual([item['clOrdId'] for item in result['data']], ['a', 'b', 'c'])
+        self.assertEqual(result['data'][1]['sCode'], '-1')
+        self.assertIn('below the minimum size', result['data'][1]['sMsg'])
+        trade.close()
+
+    def test_fully_rejected_batch_is_not_sent(self):
+        from okx.Trade import TradeAPI
+        trade = TradeAPI(order_validator=OrderValidator(public_api()))
+        amends = [{'instId': 'BTC-USDT-SWAP', 'ordId': '1', 'newSz': '0.001'}]
+        with patch.object(trade, 'post') as mock_post:
+            result = trade.amend_multiple_orders(amends)
+        mock_post.assert_not_called()
+        self.assertEqual((result['code'], result['data'][0]['ordId'], result['data'][0]['sCode']), ('1', '1', '-1'))
+        trade.close()
+
+    def test_async_client_awaits_validation(self):
+        from okx.Trade import AsyncTradeAPI
+        trade = AsyncTradeAPI(order_validator=OrderValidator(async_public_api()))
+        orders = [dict(limit_order(), clOrdId='a'), dict(limit_order(px='71000'), clOrdId='b')]
+        response = {'code': '0', 'msg': '', 'data': [{'clOrdId': 'a', 'ordId': '1', 'sCode': '0', 'sMsg': ''}]}
+
+        async def run_test():
+            with patch.object(trade, 'post', AsyncMock(return_value=httpx.Response(200, json=response))) as mock_post:
+                result = await trade.place_multiple_orders(orders)
+            await trade.aclose()
+            return result, mock_post
+
+        result, mock_post = asyncio.get_event_loop().run_until_complete(run_test())
+        body = json.loads(mock_post.call_args.kwargs['content'])
+        self.assertEqual([order['clOrdId'] for order in body], ['a'])
+        self.assertEqual([item['sCode'] for item in result['data']], ['0', '-1'])
+        self.assertIn('above the buy limit', result['data'][1]['sMsg'])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
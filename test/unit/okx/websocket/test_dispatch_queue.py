@@ -0,0 +1,177 @@
+"""
+Unit tests for okx.websocket.DispatchQueue module
+
+Mirrors the structure: okx/websocket/DispatchQueue.py -> test/unit/okx/websocket/test_dispatch_queue.py
+"""
+import asyncio
+import unittest
+
+from okx.websocket.DispatchQueue import DispatchQueue
+from okx.websocket.WsPrivateAsync import WsPrivateAsync
+from okx.websocket.WsPublicAsync import WsPublicAsync
+from test.unit.okx.websocket.test_ws_base_async import FakeConnection, createWs, waitFor
+
+BTC = ('channel', 'tickers'), ('instId', 'BTC-USDT')
+ETH = ('channel', 'tickers'), ('instId', 'ETH-USDT')
+
+
+def ticker(instId, last):
+    return '{"arg":{"channel":"tickers","instId":"%s"},"data":[{"last":"%s"}]}' % (instId, last)
+
+
+def book(action, seqId):
+    return '{"arg":{"channel":"books","instId":"BTC-USDT"},"action":"%s","data":[{"seqId":%d}]}' % (action, seqId)
+
+
+def drain(queue):
+    async def run_test():
+        return [(await queue.get())[0] for _ in range(len(queue))]
+
+    return asyncio.get_event_loop().run_until_complete(run_test())
+
+
+class TestDispatchQueue(unittest.TestCase):
+    """Unit tests for the overflow policies"""
+
+    def test_block_waits_for_space(self):
+        queue = DispatchQueue(2)
+        queue.put('a')
+        self.assertFalse(queue.mustWait())
+        queue.put('b')
+        self.assertTrue(queue.mustWait())
+
+        async def run_test():
+            waiter = asyncio.ensure_future(queue.waitForSpace())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            self.assertEqual(await queue.get(), ('a', None))
+            await asyncio.wait_for(waiter, 1)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(queue.stats()["depth"], 1)
+
+    def test_drop_oldest(self):
+        queue = DispatchQueue(2, 'drop_oldest')
+        for message in 'abc':
+            queue.put(message)
+        self.assertEqual(drain(queue), ['b', 'c'])
+        self.assertEqual((queue.dropped, queue.highWater), (1, 2))
+
+    def test_conflate_keeps_latest_push_per_subscription(self):
+        queue = DispatchQueue(10, 'conflate')
+        queue.put('btc 1', key=BTC, conflate=True)
+        queue.put('eth 1', key=ETH, conflate=True)
+        queue.put('btc 2', key=BTC, conflate=True)
+        queue.put('event')
+        self.assertEqual(drain(queue), ['btc 2', 'eth 1', 'event'])
+        self.assertEqual(queue.conflated, 1)
+
+    def test_updates_are_not_conflated_or_overtaken(self):
+        queue = DispatchQueue(10, 'conflate')
+        queue.put('snapshot 1', key=BTC, conflate=True)
+        queue.put('update 2', key=BTC)
+        queue.put('snapshot 3', key=BTC, conflate=True)
+        self.assertEqual(drain(queue), ['snapshot 1', 'update 2', 'snapshot 3'])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            DispatchQueue(0)
+        with self.assertRaises(ValueError):
+            DispatchQueue(1, 'drop_newest')
+
+
+class TestQueuedDispatch(unittest.TestCase):
+    """Unit tests for WebSocket clients dispatching through workers"""
+
+    def test_slow_callback_does_not_stall_reader(self):
+        messages = [ticker('BTC-USDT', last) for last in range(5)] + [ticker('ETH-USDT', 1)]
+        connection = FakeConnection(messages)
+        ws = createWs(WsPublicAsync, [connection], queueSize=2, overflow='conflate')
+        received = []
+
+        async def callback(message):
+            await asyncio.sleep(0.01)
+            received.append(message)
+
+        async def run_test():
+            ws.callback = callback
+            await ws.start()
+            await waitFor(lambda: connection.queue.empty())
+            await waitFor(lambda: len(ws.dispatchQueue) == 0 and len(received) >= 2)
+            await asyncio.sleep(0.02)
+            await ws.stop()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        # The reader went on while the callback was busy, queued tickers were replaced by the latest
+        self.assertEqual(received[-2:], [messages[4], messages[5]])
+        stats = ws.queueStats()
+        self.assertEqual(stats["conflated"], len(messages) - len(received))
+        self.assertGreaterEqual(stats["conflated"], 3)
+        self.assertGreater(stats["maxLag"], 0)
+
+    def test_books_updates_keep_their_order(self):
+        connection = FakeConnection()
+        ws = createWs(WsPublicAsync, [connection], queueSize=10, overflow='conflate')
+        frames = [book('snapshot', 1), book('update', 2), book('update', 3)]
+        for frame in frames:
+            ws._deliver(frame)
+        self.assertEqual(drain(ws.dispatchQueue), frames)
+
+    def test_trades_and_orders_are_never_conflated(self):
+        ws = createWs(WsPublicAsync, [FakeConnection()], queueSize=10, overflow='conflate')
+        frames = ['{"arg":{"channel":"trades","instId":"BTC-USDT"},"data":[{"tradeId":"%d"}]}' % i for i in range(3)]
+        frames += ['{"arg":{"channel":"orders","instType":"ANY","uid":"1"},"data":[{"state":"%s"}]}' % state
+                   for state in ('live', 'partially_filled', 'filled')]
+        frames += [ticker('BTC-USDT', 1), ticker('BTC-USDT', 2)]
+        for frame in frames:
+            ws._deliver(frame)
+        self.assertEqual(drain(ws.dispatchQueue), frames[:6] + frames[7:])
+        self.assertEqual(ws.queueStats()["conflated"], 1)
+
+    def test_conflated_channels_are_configurable(self):
+        ws = createWs(WsPublicAsync, [FakeConnection()], queueSize=10, overflow='conflate',
+                      conflateChannels=['candle1m'])
+        candles = ['{"arg":{"channel":"candle1m","instId":"BTC-USDT"},"data":[["%d"]]}' % i for i in range(2)]
+        for frame in candles + [ticker('BTC-USDT', 1), ticker('BTC-USDT', 2)]:
+            ws._deliver(frame)
+        self.assertEqual(drain(ws.dispatchQueue), candles[1:] + [ticker('BTC-USDT', 1), ticker('BTC-USDT', 2)])
+
+    def test_workers_run_callbacks_concurrently(self):
+        connection = FakeConnection([ticker('BTC-USDT', 1), ticker('ETH-USDT', 1)])
+        ws = createWs(WsPublicAsync, [connection], queueSize=10, workers=2)
+        running = []
+
+        async def callback(message):
+            running.append(message)
+            await waitFor(lambda: len(running) == 2)
+
+        async def run_test():
+            ws.callback = callback
+            await ws.start()
+            await waitFor(lambda: len(running) == 2)
+            await ws.stop()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(ws._workerTasks, [])
+
+    def test_private_requests_resolve_while_callbacks_are_queued(self):
+        connection = FakeConnection(loginAck=True)
+        ws = createWs(WsPrivateAsync, [connection], queueSize=1, overflow='drop_oldest')
+
+        async def run_test():
+            await ws.start()
+            await ws.login()
+            order = asyncio.ensure_future(ws.place_order([{"instId": "BTC-USDT"}]))
+            await waitFor(lambda: connection.sent[-1].get("op") == "order")
+            connection.queue.put_nowait('{"id":"%s","op":"order","code":"0","msg":"","data":[]}'
+                                        % connection.sent[-1]["id"])
+            response = await asyncio.wait_for(order, 1)
+            await ws.stop()
+            return response
+
+        response = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(response["code"], "0")
+
+
+if __name__ == '__main__':
+    unittest.main()
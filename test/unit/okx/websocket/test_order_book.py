@@ -0,0 +1,147 @@
+"""
+Unit tests for okx.websocket.OrderBook module
+
+Mirrors the structure: okx/websocket/OrderBook.py -> test/unit/okx/websocket/test_order_book.py
+"""
+import asyncio
+import json
+import unittest
+import zlib
+from unittest.mock import MagicMock, AsyncMock
+
+from okx import codec
+from okx.exceptions import OkxOrderBookException
+from okx.websocket.OrderBook import OrderBook, OrderBooks, checksum
+
+SNAPSHOT = {
+    "asks": [["8476.98", "415", "0", "13"], ["8477", "7", "0", "2"], ["8477.34", "85", "0", "1"]],
+    "bids": [["8476.97", "256", "0", "12"], ["8475.55", "101", "0", "1"]],
+    "ts": "1597026383085", "seqId": 10, "prevSeqId": -1,
+}
+
+
+def withChecksum(item, book=None):
+    """Copy of a push item carrying the checksum of the book it produces"""
+    reference = OrderBook('BTC-USDT', verifyChecksum=False)
+    if book is not None:
+        reference.apply(dict(book), 'snapshot')
+    item = dict(item)
+    reference.apply(item, 'snapshot' if book is None else 'update')
+    item['checksum'] = reference.checksum()
+    return item
+
+
+class TestChecksum(unittest.TestCase):
+    """Unit tests for the OKX book checksum"""
+
+    def test_levels_are_interleaved_on_original_strings(self):
+        bids = [("3366.1", "7"), ("3366", "6")]
+        asks = [("3366.8", "9"), ("3368", "8"), ("3372", "8")]
+        expected = zlib.crc32(b"3366.1:7:3366.8:9:3366:6:3368:8:3372:8")
+        self.assertEqual(checksum(bids, asks) & 0xffffffff, expected)
+
+    def test_checksum_is_signed_32_bit(self):
+        values = [checksum([(str(px), "1")], [(str(px + 1), "2")]) for px in range(200)]
+        self.assertTrue(all(-2 ** 31 <= value < 2 ** 31 for value in values))
+        self.assertTrue(any(value < 0 for value in values))
+
+
+class TestOrderBook(unittest.TestCase):
+    """Unit tests for snapshot and update merging"""
+
+    def _book(self):
+        book = OrderBook('BTC-USDT')
+        book.apply(withChecksum(SNAPSHOT), 'snapshot')
+        return book
+
+    def test_snapshot_queries(self):
+        book = self._book()
+        self.assertTrue(book.ready)
+        self.assertEqual(book.bestBid(), (8476.97, 256.0))
+        self.assertEqual(book.bestAsk(), (8476.98, 415.0))
+        self.assertAlmostEqual(book.spread(), 0.01)
+        self.assertEqual(book.depth('asks', 2), [(8476.98, 415.0), (8477.0, 7.0)])
+        self.assertEqual(book.sizeAt('bids', '8475.55'), 101.0)
+        self.assertEqual(book.sizeAt('bids', '8000'), 0.0)
+        self.assertAlmostEqual(book.vwap('buy', 420), (415 * 8476.98 + 5 * 8477) / 420)
+        self.assertIsNone(book.vwap('sell', 1000))
+
+    def test_update_inserts_changes_and_removes_levels(self):
+        book = self._book()
+        update = {"asks": [["8476.98", "0", "0", "0"], ["8476.99", "3", "0", "1"]],
+                  "bids": [["8476.97", "200", "0", "10"], ["8476", "5", "0", "1"]],
+                  "seqId": 11, "prevSeqId": 10}
+        book.apply(withChecksum(update, SNAPSHOT), 'update')
+        self.assertEqual(book.bestAsk(), (8476.99, 3.0))
+        self.assertEqual(book.depth('bids'), [(8476.97, 200.0), (8476.0, 5.0), (8475.55, 101.0)])
+        self.assertEqual(book.seqId, 11)
+
+    def test_sequence_gap_raises(self):
+        book = self._book()
+        with self.assertRaises(OkxOrderBookException):
+            book.apply({"asks": [], "bids": [], "seqId": 13, "prevSeqId": 12}, 'update')
+        self.assertFalse(book.ready)
+
+    def test_checksum_mismatch_raises(self):
+        book = self._book()
+        update = {"asks": [["8477", "8", "0", "2"]], "bids": [], "seqId": 11, "prevSeqId": 10, "checksum": 123}
+        with self.assertRaises(OkxOrderBookException):
+            book.apply(update, 'update')
+        self.assertFalse(book.ready)
+
+    def test_update_without_snapshot_raises(self):
+        with self.assertRaises(OkxOrderBookException):
+            OrderBook('BTC-USDT').apply({"asks": [], "bids": [], "seqId": 1, "prevSeqId": 0}, 'update')
+
+
+class TestOrderBooks(unittest.TestCase):
+    """Unit tests for feeding and resynchronising books through a WebSocket client"""
+
+    def _books(self):
+        ws = MagicMock()
+        ws.callback = None
+        ws.jsonCodec = codec.get_codec('json')
+        ws.subscribe = AsyncMock()
+        ws.unsubscribe = AsyncMock()
+        books = OrderBooks(ws)
+        asyncio.get_event_loop().run_until_complete(books.subscribe(['BTC-USDT']))
+        return ws, books
+
+    @staticmethod
+    def _push(action, item):
+        return json.dumps({"arg": {"channel": "books", "instId": "BTC-USDT"}, "action": action, "data": [item]})
+
+    def test_subscribe_routes_channel_to_books(self):
+        ws, books = self._books()
+        ws.subscribe.assert_awaited_once_with([{"channel": "books", "instId": "BTC-USDT"}], books.handleMessage)
+        books.handleMessage(self._push('snapshot', withChecksum(SNAPSHOT)))
+        self.assertEqual(books.book('BTC-USDT').bestBid(), (8476.97, 256.0))
+
+    def test_bad_update_resubscribes(self):
+        ws, books = self._books()
+
+        async def run_test():
+            books.handleMessage(self._push('snapshot', withChecksum(SNAPSHOT)))
+            books.handleMessage(self._push('update', {"asks": [], "bids": [], "seqId": 13, "prevSeqId": 12}))
+            # Updates are ignored until the snapshot of the resubscription
+            books.handleMessage(self._push('update', {"asks": [], "bids": [], "seqId": 14, "prevSeqId": 13}))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(books.resyncs, 1)
+        ws.unsubscribe.assert_awaited_once()
+        self.assertEqual(ws.subscribe.await_count, 2)
+        books.handleMessage(self._push('snapshot', withChecksum(SNAPSHOT)))
+        self.assertTrue(books.book('BTC-USDT').ready)
+
+    def test_gap_event_resets_book(self):
+        ws, books = self._books()
+        books.handleMessage(self._push('snapshot', withChecksum(SNAPSHOT)))
+        books.handleMessage({"event": "gap", "arg": {"channel": "books", "instId": "BTC-USDT"}, "ts": "1"})
+        self.assertFalse(books.book('BTC-USDT').ready)
+        self.assertIsNone(books.book('BTC-USDT').bestBid())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,248 @@
+"""
+Unit tests for okx.websocket.WsBaseAsync module
+
+Mirrors the structure: okx/websocket/WsBaseAsync.py -> test/unit/okx/websocket/test_ws_base_async.py
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from okx.websocket.WsBaseAsync import ANY, peekRoute
+from okx.websocket.WsPrivateAsync import WsPrivateAsync
+from okx.websocket.WsPublicAsync import WsPublicAsync
+
+TEST_WS_URL = 'wss://test.example.com'
+TICKERS = {"channel": "tickers", "instId": "BTC-USDT"}
+ORDERS = {"channel": "orders", "instType": "ANY"}
+LOGIN_ACK = json.dumps({"event": "login", "code": "0", "msg": "", "connId": "a4d3ae55"})
+
+
+class FakeConnection:
+    """Websocket yielding queued frames until closed, answering login frames when loginAck is set"""
+
+    def __init__(self, messages=(), keepOpen=True, loginAck=False):
+        self.queue = asyncio.Queue()
+        for message in messages:
+            self.queue.put_nowait(message)
+        if not keepOpen:
+            self.queue.put_nowait(None)
+        self.loginAck = loginAck
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(json.loads(payload))
+        if self.loginAck and self.sent[-1]["op"] == "login":
+            self.queue.put_nowait(LOGIN_ACK)
+
+    async def close(self):
+        self.queue.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.queue.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+async def waitFor(condition, timeout=1.0):
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not condition():
+        if asyncio.get_event_loop().time() > deadline:
+            raise AssertionError("condition not met within %ss" % timeout)
+        await asyncio.sleep(0.001)
+
+
+def createWs(wsClass, connections, **kwargs):
+    with patch('okx.websocket.%s.WebSocketFactory' % wsClass.__name__):
+        if wsClass is WsPrivateAsync:
+            ws = WsPrivateAsync("key", "passphrase", "secret", TEST_WS_URL, reconnectDelay=0, **kwargs)
+        else:
+            ws = WsPublicAsync(TEST_WS_URL, reconnectDelay=0, **kwargs)
+    ws.factory.connect = AsyncMock(side_effect=connections)
+    ws.factory.close = AsyncMock()
+    return ws
+
+
+class TestSubscriptionTracking(unittest.TestCase):
+    """Unit tests for the subscriptions registry"""
+
+    def test_subscribe_and_unsubscribe_update_subscriptions(self):
+        ws = createWs(WsPublicAsync, [])
+        ws.websocket = FakeConnection()
+        other = {"channel": "books", "instId": "ETH-USDT"}
+
+        async def run_test():
+            await ws.subscribe([TICKERS, other], MagicMock())
+            await ws.subscribe([dict(TICKERS)], MagicMock())
+            self.assertEqual(list(ws.subscriptions.values()), [TICKERS, other])
+            await ws.unsubscribe([other], MagicMock())
+            self.assertEqual(list(ws.subscriptions.values()), [TICKERS])
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+class TestReconnect(unittest.TestCase):
+    """Unit tests for supervised reconnects"""
+
+    def test_public_reconnect_emits_gap_and_replays_subscriptions(self):
+        first = FakeConnection(['{"arg":{"channel":"tickers","instId":"BTC-USDT"},"data":[]}'], keepOpen=False)
+        second = FakeConnection()
+        # The first reconnect attempt fails, the gap is still reported once
+        ws = createWs(WsPublicAsync, [first, None, second], decodeMessages=True)
+        received = []
+
+        async def run_test():
+            await ws.start()
+            await ws.subscribe([TICKERS], received.append)
+            await waitFor(lambda: second.sent)
+            await ws.stop()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(received[0]["data"], [])
+        self.assertEqual([event["event"] for event in received[1:]], ["gap"])
+        self.assertEqual(received[1]["arg"], TICKERS)
+        self.assertEqual(second.sent, [{"op": "subscribe", "args": [TICKERS]}])
+        self.assertEqual(ws.reconnects, 1)
+        self.assertIs(ws.websocket, second)
+
+    def test_private_reconnect_logs_in_again_and_fails_pending_requests(self):
+        first = FakeConnection(loginAck=True)
+        second = FakeConnection(loginAck=True)
+        ws = createWs(WsPrivateAsync, [first, second])
+        callback = MagicMock()
+
+        async def run_test():
+            await ws.start()
+            await ws.subscribe([ORDERS], callback)
+            order = asyncio.ensure_future(ws.place_order([{"instId": "BTC-USDT"}]))
+            await waitFor(lambda: ws.pendingRequests)
+            await first.close()
+            with self.assertRaises(ConnectionError):
+                await order
+            await waitFor(lambda: len(second.sent) == 2)
+            await ws.stop()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual([frame["op"] for frame in second.sent], ["login", "subscribe"])
+        self.assertEqual(second.sent[1]["args"], [ORDERS])
+        self.assertTrue(ws.isLoggedIn)
+        self.assertEqual(ws.pendingRequests, {})
+
+    def test_auto_reconnect_disabled(self):
+        first = FakeConnection(keepOpen=False)
+        ws = createWs(WsPublicAsync, [first], autoReconnect=False)
+
+        async def run_test():
+            await ws.start()
+            await ws.subscribe([TICKERS], MagicMock())
+            await asyncio.sleep(0.01)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(ws.factory.connect.call_count, 1)
+        self.assertEqual(ws.reconnects, 0)
+
+    def test_callback_errors_do_not_stop_consuming(self):
+        ws = createWs(WsPublicAsync, [])
+        ws.websocket = FakeConnection(['{"data":[1]}', '{"data":[2]}'], keepOpen=False)
+        ws.callback = MagicMock(side_effect=[ValueError("bad handler"), None])
+
+        asyncio.get_event_loop().run_until_complete(ws._consumeUntilClosed())
+        self.assertEqual(ws.callback.call_count, 2)
+
+
+class TestRouting(unittest.TestCase):
+    """Unit tests for per-channel and per-instrument message routing"""
+
+    def _subscribed(self, wsClass=WsPublicAsync, **kwargs):
+        ws = createWs(wsClass, [], **kwargs)
+        ws.websocket = FakeConnection(loginAck=True)
+        return ws
+
+    def test_peek_route(self):
+        loads = json.loads
+        self.assertEqual(peekRoute('{"arg":{"channel":"books","instId":"BTC-USDT"},"action":"update","data":[]}',
+                                   loads), ({"channel": "books", "instId": "BTC-USDT"}, None, None))
+        self.assertEqual(peekRoute('{"id":"1","op":"order","code":"0","data":[]}', loads), (None, "order", None))
+        self.assertEqual(peekRoute('{"event":"error","code":"60012","msg":"Invalid request"}', loads),
+                         (None, None, "error"))
+        self.assertEqual(peekRoute('pong', loads), (None, None, None))
+
+    def test_channels_keep_their_callbacks(self):
+        ws = self._subscribed()
+        tickers, books = MagicMock(), MagicMock()
+        bookArg = {"channel": "books", "instId": "BTC-USDT"}
+        ticker = '{"arg":{"channel":"tickers","instId":"BTC-USDT"},"data":[]}'
+        book = '{"arg":{"channel":"books","instId":"BTC-USDT"},"action":"snapshot","data":[]}'
+        error = '{"event":"error","code":"60012","msg":"Invalid request"}'
+
+        async def run_test():
+            await ws.subscribe([TICKERS], tickers)
+            await ws.subscribe([bookArg], books)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+        for message in (ticker, book, error):
+            ws.dispatch(message)
+        tickers.assert_called_once_with(ticker)
+        # Messages without a route go to the last callback
+        self.assertEqual(books.call_args_list, [((book,),), ((error,),)])
+
+    def test_instrument_wildcard_and_specific_routes(self):
+        ws = self._subscribed(decodeMessages=True)
+        anyInstrument, btc = MagicMock(), MagicMock()
+        ws.addRoute(anyInstrument, channel="trades")
+        ws.addRoute(btc, channel="trades", instId="BTC-USDT")
+        ws.dispatch('{"arg":{"channel":"trades","instId":"BTC-USDT"},"data":[]}')
+        ws.dispatch('{"arg":{"channel":"trades","instId":"ETH-USDT"},"data":[]}')
+        btc.assert_called_once_with({"arg": {"channel": "trades", "instId": "BTC-USDT"}, "data": []})
+        self.assertEqual(anyInstrument.call_args[0][0]["arg"]["instId"], "ETH-USDT")
+        ws.removeRoute(channel="trades", instId="BTC-USDT")
+        ws.dispatch('{"arg":{"channel":"trades","instId":"BTC-USDT"},"data":[]}')
+        self.assertEqual(anyInstrument.call_count, 2)
+
+    def test_op_and_event_routes(self):
+        ws = self._subscribed(WsPrivateAsync)
+        orders, notices, fallback = MagicMock(), MagicMock(), MagicMock()
+        ws.callback = fallback
+        ws.addRoute(orders, op="order")
+        ws.addRoute(notices, event="notice")
+        ws.handleMessage('{"id":"1","op":"order","code":"0","msg":"","data":[]}')
+        ws.handleMessage('{"event":"notice","code":"64008","msg":"reconnect"}')
+        ws.handleMessage('{"id":"2","op":"amend-order","code":"0","msg":"","data":[]}')
+        orders.assert_called_once()
+        notices.assert_called_once()
+        fallback.assert_called_once()
+        with self.assertRaises(ValueError):
+            ws.addRoute(orders)
+
+    def test_frames_are_decoded_once(self):
+        ws = self._subscribed(decodeMessages=True)
+        ws.jsonCodec = MagicMock(wraps=ws.jsonCodec)
+        tickers = MagicMock()
+        asyncio.get_event_loop().run_until_complete(ws.subscribe([TICKERS], tickers))
+        ws.dispatch('{"arg":{"channel":"tickers","instId":"BTC-USDT"},"data":[]}')
+        self.assertEqual(ws.jsonCodec.loads.call_count, 1)
+        tickers.assert_called_once()
+
+    def test_unsubscribe_keeps_shared_route(self):
+        ws = self._subscribed(WsPrivateAsync)
+        ws.isLoggedIn = True
+        callback = MagicMock()
+        spot = {"channel": "orders", "instType": "SPOT"}
+        swap = {"channel": "orders", "instType": "SWAP"}
+
+        async def run_test():
+            await ws.subscribe([spot, swap], callback)
+            await ws.unsubscribe([spot], MagicMock())
+            self.assertIn(('arg', 'orders', ANY), ws.routes)
+            await ws.unsubscribe([swap], MagicMock())
+            self.assertEqual(ws.routes, {})
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Unit tests for okx.websocket.WsPoolAsync module
+
+Mirrors the structure: okx/websocket/WsPoolAsync.py -> test/unit/okx/websocket/test_ws_pool_async.py
+"""
+import asyncio
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from okx.websocket.WsPoolAsync import WsPoolAsync
+from test.unit.okx.websocket.test_ws_base_async import FakeConnection
+
+TEST_WS_URL = 'wss://test.example.com'
+INSTRUMENTS = ['BTC-USDT', 'ETH-USDT', 'SOL-USDT', 'XRP-USDT', 'DOGE-USDT', 'LTC-USDT', 'ADA-USDT', 'OKB-USDT']
+
+
+def tickers(instIds):
+    return [{"channel": "tickers", "instId": instId} for instId in instIds]
+
+
+def push(instId):
+    return json.dumps({"arg": {"channel": "tickers", "instId": instId}, "data": []}, separators=(",", ":"))
+
+
+def createPool(**kwargs):
+    with patch('okx.websocket.WsPublicAsync.WebSocketFactory'):
+        pool = WsPoolAsync(TEST_WS_URL, **kwargs)
+    for ws in pool.connections:
+        ws.websocket = FakeConnection()
+    return pool
+
+
+class TestPlacement(unittest.TestCase):
+    """Unit tests for spreading subscriptions over connections and shards"""
+
+    def test_subscriptions_are_batched_per_connection(self):
+        pool = createPool(size=3)
+        callback = MagicMock()
+        asyncio.get_event_loop().run_until_complete(pool.subscribe(tickers(INSTRUMENTS), callback))
+        sent = [arg["instId"] for ws in pool.connections for frame in ws.websocket.sent for arg in frame["args"]]
+        self.assertEqual(sorted(sent), sorted(INSTRUMENTS))
+        self.assertTrue(all(len(ws.websocket.sent) <= 1 for ws in pool.connections))
+        self.assertGreater(sum(1 for ws in pool.connections if ws.websocket.sent), 1)
+        # The channels of an instrument share its connection
+        books = {"channel": "books", "instId": "BTC-USDT"}
+        asyncio.get_event_loop().run_until_complete(pool.subscribe([books], callback))
+        self.assertIs(pool.connectionOf(books), pool.connectionOf(tickers(['BTC-USDT'])[0]))
+
+    def test_shards_partition_subscriptions(self):
+        args = tickers(INSTRUMENTS)
+        subscribed = []
+        for shardIndex in range(3):
+            pool = createPool(size=2, shardIndex=shardIndex, shardCount=3)
+            subscribed.append(asyncio.get_event_loop().run_until_complete(pool.subscribe(args, MagicMock())))
+        self.assertEqual(sorted(arg["instId"] for shard in subscribed for arg in shard), sorted(INSTRUMENTS))
+        with self.assertRaises(ValueError):
+            createPool(shardIndex=3, shardCount=3)
+
+    def test_unified_callback_and_counts(self):
+        pool = createPool(size=2, decodeMessages=True)
+        callback, errors = MagicMock(), MagicMock()
+        asyncio.get_event_loop().run_until_complete(pool.subscribe(tickers(INSTRUMENTS), callback))
+        pool.callback = errors
+        for instId in INSTRUMENTS:
+            pool.connectionOf(tickers([instId])[0]).dispatch(push(instId))
+        pool.connections[0].dispatch('{"event":"error","code":"60012","msg":"Invalid request"}')
+        self.assertEqual(callback.call_count, len(INSTRUMENTS))
+        errors.assert_called_once()
+        self.assertEqual(sum(pool.counts.values()), len(INSTRUMENTS))
+
+    def test_unsubscribe_forgets_placement(self):
+        pool = createPool(size=2)
+        args = tickers(['BTC-USDT'])
+
+        async def run_test():
+            await pool.subscribe(args, MagicMock())
+            ws = pool.connectionOf(args[0])
+            await pool.unsubscribe(args)
+            return ws
+
+        ws = asyncio.get_event_loop().run_until_complete(run_test())
+        self.assertEqual(ws.websocket.sent[-1], {"op": "unsubscribe", "args": args})
+        self.assertEqual((pool.placement, ws.subscriptions, ws.routes), ({}, {}, {}))
+
+
+class TestRebalance(unittest.TestCase):
+    """Unit tests for moving hot instruments between connections"""
+
+    def test_hot_instruments_move_to_idle_connection(self):
+        pool = createPool(size=2)
+        callback = MagicMock()
+        # Two busy instruments and a quiet one placed on the same connection
+        first = [instId for instId in INSTRUMENTS + ['%s-USDT' % i for i in range(20)] if pool._initialPlacement(('arg', 'tickers', instId)) == 0]
+        hot = tickers(first[:2])
+        cold = tickers(first[2:3])
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(pool.subscribe(hot + cold, callback))
+        ws = pool.connections[0]
+        for _ in range(100):
+            ws.dispatch(push(first[0]))
+        for _ in range(80):
+            ws.dispatch(push(first[1]))
+        ws.dispatch(push(first[2]))
+        callback.reset_mock()
+
+        moves = loop.run_until_complete(pool.rebalance())
+        self.assertEqual(moves, [(('arg', 'tickers', first[0]), 0, 1)])
+        self.assertIs(pool.connectionOf(hot[0]), pool.connections[1])
+        self.assertEqual(pool.connections[0].websocket.sent[-1], {"op": "unsubscribe", "args": hot[:1]})
+        self.assertEqual(pool.connections[1].websocket.sent[-1], {"op": "subscribe", "args": hot[:1]})
+        gap = json.loads(callback.call_args[0][0])
+        self.assertEqual((gap["event"], gap["arg"]), ("gap", hot[0]))
+        self.assertEqual(pool.counts, {})
+        # Balanced load is left alone
+        self.assertEqual(loop.run_until_complete(pool.rebalance()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
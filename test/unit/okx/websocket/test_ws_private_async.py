@@ -11,11 +11,22 @@ from unittest.mock import patch, MagicMock, AsyncMock
 
 # Import the module first so patch can resolve the path
 import okx.websocket.WsPrivateAsync as ws_private_module
+from okx.exceptions import OkxRequestException
 from okx.websocket.WsPrivateAsync import WsPrivateAsync
+from test.unit.okx.websocket.test_ws_base_async import waitFor
 
 # Test constants
 TEST_WS_URL = 'wss://test.example.com'
 MOCK_WS_FACTORY = 'okx.websocket.WsPrivateAsync.WebSocketFactory'
+LOGIN_ACK = json.dumps({"event": "login", "code": "0", "msg": "", "connId": "a4d3ae55"})
+
+
+def ack_login(ws, event=LOGIN_ACK):
+    """websocket.send side effect answering the login frame like the server does"""
+    async def send(payload):
+        if '"login"' in payload:
+            ws.handleMessage(event)
+    return send
 
 
 class TestWsPrivateAsyncInit(unittest.TestCase):
@@ -97,8 +108,7 @@ class TestWsPrivateAsyncSubscribe(unittest.TestCase):
     def test_subscribe_sends_correct_payload(self):
         """Test subscribe sends correct payload after login"""
         with patch.object(ws_private_module, 'WebSocketFactory'), \
-             patch.object(ws_private_module, 'WsUtils') as mock_ws_utils, \
-             patch.object(ws_private_module.asyncio, 'sleep', new_callable=AsyncMock):
+             patch.object(ws_private_module, 'WsUtils') as mock_ws_utils:
             
             mock_ws_utils.initLoginParams.return_value = '{"op":"login"}'
 
@@ -110,6 +120,7 @@ class TestWsPrivateAsyncSubscribe(unittest.TestCase):
             )
             mock_websocket = AsyncMock()
             ws.websocket = mock_websocket
+            mock_websocket.send.side_effect = ack_login(ws)
             callback = MagicMock()
             params = [{"channel": "account", "ccy": "BTC"}]
 
@@ -128,8 +139,7 @@ class TestWsPrivateAsyncSubscribe(unittest.TestCase):
     def test_subscribe_with_id(self):
         """Test subscribe with id parameter"""
         with patch.object(ws_private_module, 'WebSocketFactory'), \
-             patch.object(ws_private_module, 'WsUtils') as mock_ws_utils, \
-             patch.object(ws_private_module.asyncio, 'sleep', new_callable=AsyncMock):
+             patch.object(ws_private_module, 'WsUtils') as mock_ws_utils:
 
             mock_ws_utils.initLoginParams.return_value = '{"op":"login"}'
 
@@ -141,6 +151,7 @@ class TestWsPrivateAsyncSubscribe(unittest.TestCase):
             )
             mock_websocket = AsyncMock()
             ws.websocket = mock_websocket
+            mock_websocket.send.side_effect = ack_login(ws)
             callback = MagicMock()
             params = [{"channel": "account", "ccy": "BTC"}]
 
@@ -263,7 +274,7 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
     """Unit tests for WsPrivateAsync order-related methods"""
 
     def _create_ws_instance(self):
-        """Helper to create WsPrivateAsync instance with mocked websocket"""
+        """Helper to create WsPrivateAsync instance with mocked websocket answering every operation"""
         with patch(MOCK_WS_FACTORY):
             from okx.websocket.WsPrivateAsync import WsPrivateAsync
             ws = WsPrivateAsync(
@@ -273,6 +284,13 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
                 url=TEST_WS_URL
             )
             mock_websocket = AsyncMock()
+
+            async def answer(frame):
+                payload = json.loads(frame)
+                ws.handleMessage(json.dumps({"id": payload["id"], "op": payload["op"], "code": "0", "msg": "",
+                                             "data": []}))
+
+            mock_websocket.send.side_effect = answer
             ws.websocket = mock_websocket
             return ws, mock_websocket
 
@@ -301,18 +319,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_place_order_without_id(self):
-        """Test place_order without id parameter"""
+    def test_place_order_assigns_request_id(self):
+        """Test place_order assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             order_args = [{"instId": "BTC-USDT"}]
 
             async def run_test():
-                await ws.place_order(order_args)
+                response = await ws.place_order(order_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "order")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "order"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -336,18 +356,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_batch_orders_without_id(self):
-        """Test batch_orders without id parameter"""
+    def test_batch_orders_assigns_request_id(self):
+        """Test batch_orders assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             order_args = [{"instId": "BTC-USDT"}, {"instId": "ETH-USDT"}]
 
             async def run_test():
-                await ws.batch_orders(order_args)
+                response = await ws.batch_orders(order_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "batch-orders")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "batch-orders"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -368,18 +390,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_cancel_order_without_id(self):
-        """Test cancel_order without id parameter"""
+    def test_cancel_order_assigns_request_id(self):
+        """Test cancel_order assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             cancel_args = [{"instId": "BTC-USDT", "ordId": "12345"}]
 
             async def run_test():
-                await ws.cancel_order(cancel_args)
+                response = await ws.cancel_order(cancel_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "cancel-order")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "cancel-order"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -403,18 +427,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_batch_cancel_orders_without_id(self):
-        """Test batch_cancel_orders without id parameter"""
+    def test_batch_cancel_orders_assigns_request_id(self):
+        """Test batch_cancel_orders assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             cancel_args = [{"instId": "BTC-USDT", "ordId": "12345"}]
 
             async def run_test():
-                await ws.batch_cancel_orders(cancel_args)
+                response = await ws.batch_cancel_orders(cancel_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "batch-cancel-orders")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "batch-cancel-orders"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -440,18 +466,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_amend_order_without_id(self):
-        """Test amend_order without id parameter"""
+    def test_amend_order_assigns_request_id(self):
+        """Test amend_order assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             amend_args = [{"instId": "BTC-USDT", "ordId": "12345", "newSz": "0.002"}]
 
             async def run_test():
-                await ws.amend_order(amend_args)
+                response = await ws.amend_order(amend_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "amend-order")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "amend-order"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -475,18 +503,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_batch_amend_orders_without_id(self):
-        """Test batch_amend_orders without id parameter"""
+    def test_batch_amend_orders_assigns_request_id(self):
+        """Test batch_amend_orders assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             amend_args = [{"instId": "BTC-USDT", "ordId": "12345", "newSz": "0.002"}]
 
             async def run_test():
-                await ws.batch_amend_orders(amend_args)
+                response = await ws.batch_amend_orders(amend_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "batch-amend-orders")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "batch-amend-orders"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -510,18 +540,20 @@ class TestWsPrivateAsyncOrderMethods(unittest.TestCase):
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
-    def test_mass_cancel_without_id(self):
-        """Test mass_cancel without id parameter"""
+    def test_mass_cancel_assigns_request_id(self):
+        """Test mass_cancel assigns a request id when none is given"""
         with patch(MOCK_WS_FACTORY):
             ws, mock_websocket = self._create_ws_instance()
             mass_cancel_args = [{"instType": "SPOT", "instFamily": "BTC-USDT"}]
 
             async def run_test():
-                await ws.mass_cancel(mass_cancel_args)
+                response = await ws.mass_cancel(mass_cancel_args)
                 call_args = mock_websocket.send.call_args[0][0]
                 payload = json.loads(call_args)
                 self.assertEqual(payload["op"], "mass-cancel")
-                self.assertNotIn("id", payload)
+                self.assertEqual(payload["id"], "1")
+                self.assertEqual((response["id"], response["op"]), ("1", "mass-cancel"))
+                self.assertEqual(ws.pendingRequests, {})
 
             asyncio.get_event_loop().run_until_complete(run_test())
 
@@ -544,6 +576,7 @@ class TestWsPrivateAsyncLogin(unittest.TestCase):
             )
             mock_websocket = AsyncMock()
             ws.websocket = mock_websocket
+            mock_websocket.send.side_effect = ack_login(ws)
 
             async def run_test():
                 result = await ws.login()
@@ -582,5 +615,152 @@ class TestWsPrivateAsyncStartStop(unittest.TestCase):
             asyncio.get_event_loop().run_until_complete(run_test())
 
 
+class FakeWebSocket:
+    """Async iterable websocket yielding the given frames"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.send = AsyncMock()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+
+class TestWsPrivateAsyncRequestCorrelation(unittest.TestCase):
+    """Unit tests for correlating order operations with their responses"""
+
+    def _create_ws_instance(self, messages=(), **kwargs):
+        with patch(MOCK_WS_FACTORY):
+            ws = WsPrivateAsync(apiKey="test_api_key", passphrase="test_passphrase", secretKey="test_secret_key",
+                                url=TEST_WS_URL, **kwargs)
+        ws.websocket = FakeWebSocket(messages)
+        return ws
+
+    def test_response_resolves_matching_future(self):
+        """Test consume resolves the request with the same id"""
+        response = {"id": "1", "op": "order", "code": "0", "msg": "",
+                    "data": [{"ordId": "123", "clOrdId": "", "sCode": "0", "sMsg": ""}]}
+        other = {"id": "99", "op": "order", "code": "0", "msg": "", "data": []}
+        ws = self._create_ws_instance([json.dumps(other), json.dumps(response)])
+        callback = MagicMock()
+
+        async def run_test():
+            first = asyncio.ensure_future(ws.place_order([{"instId": "BTC-USDT"}], callback=callback))
+            second = asyncio.ensure_future(ws.cancel_order([{"instId": "BTC-USDT", "ordId": "1"}]))
+            await waitFor(lambda: len(ws.pendingRequests) == 2)
+            await ws.consume()
+            self.assertEqual(await first, response)
+            self.assertFalse(second.done())
+            self.assertEqual(list(ws.pendingRequests), ["2"])
+            self.assertEqual(callback.call_count, 2)
+            second.cancel()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_request_times_out(self):
+        """Test an operation raises TimeoutError when no response arrives"""
+        ws = self._create_ws_instance(requestTimeout=0.01)
+
+        async def run_test():
+            with self.assertRaises(asyncio.TimeoutError):
+                await ws.amend_order([{"instId": "BTC-USDT", "ordId": "1", "newSz": "2"}])
+            self.assertEqual(ws.pendingRequests, {})
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_stop_cancels_pending_requests(self):
+        """Test stop cancels the operations still waiting for a response"""
+        ws = self._create_ws_instance()
+        ws.factory.close = AsyncMock()
+
+        async def run_test():
+            order = asyncio.ensure_future(ws.batch_orders([{"instId": "BTC-USDT"}]))
+            await waitFor(lambda: ws.pendingRequests)
+            await ws.stop()
+            with self.assertRaises(asyncio.CancelledError):
+                await order
+            self.assertEqual(ws.pendingRequests, {})
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+class TestWsPrivateAsyncEventDrivenLogin(unittest.TestCase):
+    """Unit tests for waiting on the server's login event"""
+
+    def _create_ws_instance(self, **kwargs):
+        with patch(MOCK_WS_FACTORY):
+            ws = WsPrivateAsync(apiKey="test_api_key", passphrase="test_passphrase", secretKey="test_secret_key",
+                                url=TEST_WS_URL, **kwargs)
+        ws.websocket = AsyncMock()
+        return ws
+
+    def test_login_error_event_raises(self):
+        """Test an error event answering the login frame is raised"""
+        ws = self._create_ws_instance()
+        error = json.dumps({"event": "error", "code": "60009", "msg": "Login failed."})
+        ws.websocket.send.side_effect = ack_login(ws, error)
+
+        async def run_test():
+            with self.assertRaises(OkxRequestException) as context:
+                await ws.login()
+            self.assertIn("60009", str(context.exception))
+            self.assertFalse(ws.isLoggedIn)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_login_times_out(self):
+        """Test login fails when the server does not answer"""
+        ws = self._create_ws_instance(loginTimeout=0.01)
+
+        async def run_test():
+            with self.assertRaises(asyncio.TimeoutError):
+                await ws.login()
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+    def test_subscribe_logs_in_once_per_connection(self):
+        """Test subscriptions after the first one are sent without logging in again"""
+        ws = self._create_ws_instance()
+        ws.websocket.send.side_effect = ack_login(ws)
+        params = [{"channel": "orders", "instType": "ANY"}]
+
+        async def run_test():
+            await ws.subscribe(params, MagicMock())
+            await ws.subscribe(params, MagicMock())
+            ops = [json.loads(call[0][0])["op"] for call in ws.websocket.send.call_args_list]
+            self.assertEqual(ops, ["login", "subscribe", "subscribe"])
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
+
+    def test_concurrent_subscribes_share_one_login(self):
+        """Test subscribe calls made together while logged out wait for a single login"""
+        ws = self._create_ws_instance()
+        sent = []
+
+        async def send(payload):
+            sent.append(json.loads(payload)["op"])
+
+        ws.websocket.send.side_effect = send
+        params = [{"channel": "orders", "instType": "ANY"}]
+
+        async def run_test():
+            subscribes = asyncio.gather(*(ws.subscribe(params, MagicMock()) for _ in range(3)))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(sent, ["login"])
+            ws.handleMessage(LOGIN_ACK)
+            await asyncio.wait_for(subscribes, 1)
+            self.assertEqual(sent, ["login", "subscribe", "subscribe", "subscribe"])
+            self.assertIsNone(ws._loginTask)
+            self.assertIsNone(ws._loginFuture)
+
+        asyncio.get_event_loop().run_until_complete(run_test())
+
 if __name__ == '__main__':
     unittest.main()
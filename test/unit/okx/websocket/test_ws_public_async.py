@@ -302,6 +302,47 @@ class TestWsPublicAsyncSend(unittest.TestCase):
             asyncio.get_event_loop().run_until_complete(run_test())
 
 
+class FakeWebSocket:
+    """Async iterable websocket yielding the given frames"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.send = AsyncMock()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.messages:
+            raise StopAsyncIteration
+        return self.messages.pop(0)
+
+
+class TestWsPublicAsyncConsume(unittest.TestCase):
+    """Unit tests for WsPublicAsync consume and JSON codec handling"""
+
+    def test_consume_passes_raw_message_by_default(self):
+        """Test callbacks receive the raw frame unless decodeMessages is set"""
+        with patch(MOCK_WS_FACTORY):
+            ws = WsPublicAsync(url=TEST_WS_URL)
+            ws.websocket = FakeWebSocket(['{"arg":{"channel":"tickers"},"data":[]}'])
+            ws.callback = MagicMock()
+
+            asyncio.get_event_loop().run_until_complete(ws.consume())
+            ws.callback.assert_called_once_with('{"arg":{"channel":"tickers"},"data":[]}')
+
+    def test_consume_decodes_with_codec(self):
+        """Test decodeMessages hands decoded dicts to callbacks"""
+        with patch(MOCK_WS_FACTORY):
+            ws = WsPublicAsync(url=TEST_WS_URL, jsonCodec='json', decodeMessages=True)
+            ws.websocket = FakeWebSocket(['{"arg":{"channel":"tickers"},"data":[]}'])
+            ws.callback = MagicMock()
+
+            asyncio.get_event_loop().run_until_complete(ws.consume())
+            ws.callback.assert_called_once_with({'arg': {'channel': 'tickers'}, 'data': []})
+            self.assertEqual(ws.jsonCodec.name, 'json')
+
+
 class TestWsPublicAsyncStartStop(unittest.TestCase):
     """Unit tests for WsPublicAsync start and stop methods"""
 